@@ -4,4 +4,10 @@ import react from '@vitejs/plugin-react'
 // https://vite.dev/config/
 export default defineConfig({
   plugins: [react()],
+  server: {
+    // The Flask JSON API; proxied so its session cookie is same-origin
+    proxy: {
+      '/api/v1': process.env.FLASK_API_URL || 'http://127.0.0.1:5000',
+    },
+  },
 })
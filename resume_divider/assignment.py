@@ -0,0 +1,184 @@
+"""Assign resume files to reviewers.
+
+Each resume goes to `per_resume` different reviewers. Nobody is given a
+resume they have a conflict of interest with, or more resumes than their
+capacity. Reviewers are kept in a min-heap keyed on their current load,
+so every resume goes to the least-loaded eligible reviewers. Resumes with
+the most conflicts are placed first, while every reviewer still has room.
+Without capacities or conflicts, loads differ by at most one.
+
+Headless use:
+    python assignment.py RESUME_DIR --reviewers alice,bob,carol [--per-resume 2]
+        [--capacity alice=40] [--conflicts conflicts.csv]
+        [--output assignment.csv] [--distribute OUT_DIR]
+"""
+
+import argparse
+import csv
+import heapq
+import os
+import shutil
+import sys
+from collections import defaultdict
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt', '.rtf', '.odt')
+
+
+class AssignmentResult:
+    """Resumes per reviewer, plus resumes that couldn't get enough reviewers."""
+
+    def __init__(self, reviewers):
+        self.by_reviewer = {reviewer: [] for reviewer in reviewers}
+        self.short = {}  # resume -> number of reviewers still missing
+
+    def loads(self):
+        return {reviewer: len(resumes) for reviewer, resumes in self.by_reviewer.items()}
+
+    def rows(self):
+        """(reviewer, resume) pairs, grouped by reviewer."""
+        for reviewer, resumes in self.by_reviewer.items():
+            for resume in resumes:
+                yield reviewer, resume
+
+    def summary(self):
+        loads = self.loads()
+        lines = [f"{reviewer}: {count} resumes" for reviewer, count in loads.items()]
+        if self.short:
+            lines.append(f"{len(self.short)} resume(s) could not get enough reviewers.")
+        return "\n".join(lines)
+
+
+def list_resumes(directory, extensions=RESUME_EXTENSIONS):
+    """Sorted file names of the resumes in directory."""
+    return sorted(
+        name for name in os.listdir(directory)
+        if name.lower().endswith(extensions) and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def assign(resumes, reviewers, per_resume=1, capacity=None, conflicts=None):
+    """Assign every resume to per_resume distinct reviewers.
+
+    capacity maps reviewer -> maximum resumes (missing means unlimited);
+    conflicts maps resume -> reviewers who must not see it.
+    """
+    if per_resume < 1:
+        raise ValueError("Each resume needs at least one reviewer.")
+    if not reviewers:
+        raise ValueError("Number of people reviewing cannot be zero!")
+    if len(set(reviewers)) != len(reviewers):
+        raise ValueError("Reviewer names must be unique.")
+    capacity = capacity or {}
+    conflicts = conflicts or {}
+    result = AssignmentResult(reviewers)
+    remaining = [capacity.get(reviewer, len(resumes)) for reviewer in reviewers]
+    index_of = {reviewer: i for i, reviewer in enumerate(reviewers)}
+
+    # (load, reviewer index); the index breaks ties in list order
+    heap = [(0, i) for i in range(len(reviewers)) if remaining[i] > 0]
+    heapq.heapify(heap)
+
+    order = sorted(range(len(resumes)), key=lambda n: -len(conflicts.get(resumes[n], ())))
+    for n in order:
+        resume = resumes[n]
+        excluded = {index_of[r] for r in conflicts.get(resume, ()) if r in index_of}
+        chosen, skipped = [], []
+        while heap and len(chosen) < per_resume:
+            load, i = heapq.heappop(heap)
+            if i in excluded:
+                skipped.append((load, i))
+            else:
+                chosen.append((load, i))
+        for load, i in chosen:
+            result.by_reviewer[reviewers[i]].append(resume)
+            remaining[i] -= 1
+            if remaining[i] > 0:
+                heapq.heappush(heap, (load + 1, i))
+        for item in skipped:
+            heapq.heappush(heap, item)
+        if len(chosen) < per_resume:
+            result.short[resume] = per_resume - len(chosen)
+
+    for assigned in result.by_reviewer.values():
+        assigned.sort()
+    return result
+
+
+def read_conflicts(path):
+    """Read reviewer,resume rows into a resume -> reviewers mapping."""
+    conflicts = defaultdict(set)
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if len(row) >= 2 and row[0].strip() and not row[0].startswith('#'):
+                conflicts[row[1].strip()].add(row[0].strip())
+    return dict(conflicts)
+
+
+def parse_capacity(values):
+    """Turn ['alice=40', 'bob=10'] into {'alice': 40, 'bob': 10}."""
+    capacity = {}
+    for value in values:
+        reviewer, _, limit = value.partition('=')
+        capacity[reviewer.strip()] = int(limit)
+    return capacity
+
+
+def write_csv(result, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['reviewer', 'resume'])
+        writer.writerows(result.rows())
+
+
+def distribute(result, source_dir, target_dir, progress=None):
+    """Copy each reviewer's resumes into target_dir/<reviewer>/.
+
+    progress, if given, is called with (files copied, total) after each reviewer.
+    """
+    total = sum(len(resumes) for resumes in result.by_reviewer.values())
+    copied = 0
+    for reviewer, resumes in result.by_reviewer.items():
+        folder = os.path.join(target_dir, reviewer)
+        os.makedirs(folder, exist_ok=True)
+        for resume in resumes:
+            shutil.copy2(os.path.join(source_dir, resume), os.path.join(folder, resume))
+        copied += len(resumes)
+        if progress:
+            progress(copied, total)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Assign resume files to reviewers.")
+    parser.add_argument('resume_dir')
+    parser.add_argument('--reviewers', required=True, help="Comma-separated reviewer names.")
+    parser.add_argument('--per-resume', type=int, default=1, help="Reviewers per resume.")
+    parser.add_argument('--capacity', action='append', default=[], metavar='NAME=N',
+                        help="Maximum resumes for a reviewer (repeatable).")
+    parser.add_argument('--conflicts', help="CSV of reviewer,resume pairs to avoid.")
+    parser.add_argument('--output', help="Write reviewer,resume rows to this CSV (default: stdout).")
+    parser.add_argument('--distribute', metavar='OUT_DIR',
+                        help="Copy each reviewer's resumes into OUT_DIR/<reviewer>/.")
+    args = parser.parse_args(argv)
+
+    reviewers = [name.strip() for name in args.reviewers.split(',') if name.strip()]
+    resumes = list_resumes(args.resume_dir)
+    conflicts = read_conflicts(args.conflicts) if args.conflicts else None
+    try:
+        result = assign(resumes, reviewers, args.per_resume, parse_capacity(args.capacity), conflicts)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output:
+        write_csv(result, args.output)
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(['reviewer', 'resume'])
+        writer.writerows(result.rows())
+    if args.distribute:
+        distribute(result, args.resume_dir, args.distribute)
+    print(result.summary(), file=sys.stderr)
+    return 1 if result.short else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
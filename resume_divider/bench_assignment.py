@@ -0,0 +1,65 @@
+"""Time the assignment engine on synthetic inputs and check its constraints.
+
+Usage: python bench_assignment.py [--resumes N] [--reviewers N] [--per-resume K]
+"""
+
+import argparse
+import random
+import time
+
+from assignment import assign
+
+
+def check(result, resumes, reviewers, per_resume, capacity, conflicts):
+    seen = {}
+    for reviewer, assigned in result.by_reviewer.items():
+        assert len(assigned) <= capacity.get(reviewer, len(resumes)), f"{reviewer} over capacity"
+        for resume in assigned:
+            assert reviewer not in conflicts.get(resume, ()), f"{reviewer} has a conflict with {resume}"
+            seen.setdefault(resume, set()).add(reviewer)
+    for resume in resumes:
+        got = len(seen.get(resume, ()))
+        assert got == per_resume - result.short.get(resume, 0), f"{resume} has {got} reviewers"
+
+
+def bench(label, resumes, reviewers, per_resume, capacity=None, conflicts=None):
+    capacity = capacity or {}
+    conflicts = conflicts or {}
+    start = time.perf_counter()
+    result = assign(resumes, reviewers, per_resume, capacity, conflicts)
+    elapsed = time.perf_counter() - start
+    check(result, resumes, reviewers, per_resume, capacity, conflicts)
+    loads = [load for reviewer, load in result.loads().items() if reviewer not in capacity]
+    print(f"{label:28s} {elapsed * 1000:8.1f} ms  "
+          f"load {min(loads)}-{max(loads)} (uncapped reviewers)  short {len(result.short)}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--resumes', type=int, default=10000)
+    parser.add_argument('--reviewers', type=int, default=100)
+    parser.add_argument('--per-resume', type=int, default=2)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    resumes = [f"resume_{n:05d}.pdf" for n in range(args.resumes)]
+    reviewers = [f"reviewer_{n:03d}" for n in range(args.reviewers)]
+    # Roughly one resume in five has one to three conflicted reviewers
+    conflicts = {
+        resume: set(rng.sample(reviewers, rng.randint(1, 3)))
+        for resume in resumes if rng.random() < 0.2
+    }
+    # A tenth of the reviewers can only take a small share
+    share = args.resumes * args.per_resume // args.reviewers
+    capacity = {reviewer: share // 4 for reviewer in reviewers[:args.reviewers // 10]}
+
+    print(f"{args.resumes} resumes x {args.reviewers} reviewers, {args.per_resume} reviewers per resume")
+    bench("balanced", resumes, reviewers, args.per_resume)
+    bench("with conflicts", resumes, reviewers, args.per_resume, conflicts=conflicts)
+    elapsed = bench("with conflicts + capacity", resumes, reviewers, args.per_resume, capacity, conflicts)
+    assert elapsed < 1.0, "assignment took over a second"
+
+
+if __name__ == '__main__':
+    main()
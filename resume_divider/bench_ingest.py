@@ -0,0 +1,98 @@
+"""Ingestion throughput and search latency on a synthetic resume folder.
+
+Writes DOCX and TXT resumes, then times a cold run, a rerun with nothing
+changed, a rerun after touching a tenth of the files (content unchanged,
+so their text is reused) and a few searches.
+
+Usage: python bench_ingest.py [--files N] [--workers N]
+"""
+
+import argparse
+import os
+import random
+import resource
+import shutil
+import tempfile
+import time
+import zipfile
+
+from assignment import list_resumes
+from ingest import ResumeIndex
+
+SKILLS = ['python', 'java', 'c++', 'sql', 'react', 'figma', 'excel', 'matlab', 'rust', 'go',
+          'tableau', 'pytorch', 'marketing', 'finance', 'design', 'leadership', 'research']
+MAJORS = ['computer science', 'economics', 'data science', 'business', 'mechanical engineering',
+          'cognitive science', 'statistics', 'political science']
+FILLER = ('led a team of students to deliver projects on time while coordinating with partners '
+          'and presenting results to stakeholders across the organization').split()
+
+DOCX_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    '{}</w:body></w:document>'
+)
+
+
+def resume_text(rng, n):
+    lines = [f'Candidate {n}', f'Major: {rng.choice(MAJORS)}', f'Class of {rng.randint(2025, 2029)}',
+             'Skills: ' + ', '.join(rng.sample(SKILLS, 5))]
+    lines += [' '.join(rng.choices(FILLER, k=40)) for _ in range(30)]
+    return lines
+
+
+def write_docx(path, lines):
+    body = ''.join(f'<w:p><w:r><w:t>{line}</w:t></w:r></w:p>' for line in lines)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', DOCX_TEMPLATE.format(body))
+
+
+def make_folder(directory, count):
+    rng = random.Random(7)
+    for n in range(count):
+        lines = resume_text(rng, n)
+        if n % 2:
+            write_docx(os.path.join(directory, f'resume_{n:05d}.docx'), lines)
+        else:
+            with open(os.path.join(directory, f'resume_{n:05d}.txt'), 'w') as f:
+                f.write('\n'.join(lines))
+
+
+def run(label, index, workers):
+    report = index.ingest(workers=workers)
+    assert not report.failed, report.failed
+    print(f'{label:24s} {report.summary()}')
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=3000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench-resumes-')
+    try:
+        make_folder(directory, args.files)
+        index = ResumeIndex(directory)
+        run('cold', index, args.workers)
+        run('rerun, unchanged', index, args.workers)
+        names = list_resumes(directory)
+        for name in names[:args.files // 10]:
+            os.utime(os.path.join(directory, name))
+        report = run('rerun, 10% touched', index, args.workers)
+        assert report.reused == args.files // 10
+
+        for query in ('python', 'python sql', 'data science 2027', 'pyth*', 'c++ rust leadership'):
+            start = time.perf_counter()
+            results = index.search(query)
+            elapsed = time.perf_counter() - start
+            print(f'search {query!r:24s} {len(results):3d} results  {elapsed * 1000:6.2f} ms')
+        index.close()
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f'peak RSS of the ingesting process: {peak:.0f} MiB')
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""Drive the divider headlessly and check the Tk main loop never stalls.
+
+A heartbeat is scheduled on the event loop every few milliseconds while
+the app scans, indexes, searches, assigns and copies a synthetic folder
+of resumes, and while an indexing run is cancelled part-way. The script fails if any
+gap between heartbeats exceeds the budget.
+
+With a display, the real ResumeDividerApp is driven through its buttons'
+handlers, and its dialogs are answered automatically. Without one (CI,
+SSH), the same background jobs run through TaskRunner on a bare Tcl
+interpreter, which has the same event loop but no windows.
+
+Usage: python check_responsiveness.py [--files N] [--budget MS] [--no-gui]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tkinter
+
+import divider_2
+from bench_ingest import make_folder
+from tasks import TaskRunner
+
+HEARTBEAT_MS = 5
+
+
+class Heartbeat:
+    """Records the longest gap between event-loop callbacks."""
+
+    def __init__(self, root):
+        self.root = root
+        self.worst = 0.0
+        self._last = None
+        self._running = False
+
+    def start(self):
+        self.worst, self._last, self._running = 0.0, time.perf_counter(), True
+        self.root.after(HEARTBEAT_MS, self._beat)
+
+    def stop(self):
+        self._running = False
+        self.root.update()  # let a beat that is due run first
+        idle = time.perf_counter() - self._last - HEARTBEAT_MS / 1000
+        return max(self.worst, idle)
+
+    def _beat(self):
+        if not self._running:
+            return
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self._last - HEARTBEAT_MS / 1000)
+        self._last = now
+        self.root.after(HEARTBEAT_MS, self._beat)
+
+
+def run_until(root, predicate, timeout=300):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("task did not finish")
+        root.tk.dooneevent(0)
+
+
+class HeadlessDriver:
+    """Runs the app's jobs through a TaskRunner on a Tcl-only interpreter."""
+
+    def __init__(self):
+        self.root = tkinter.Tcl()
+        self.tasks = TaskRunner(self.root)
+        self.outcome = None
+
+    def _finish(self, kind):
+        def callback(value=None):
+            self.outcome = (kind, value)
+        return callback
+
+    def run(self, job, *args, cancel_after_progress=False):
+        self.outcome = None
+
+        def on_progress(done, total, message):
+            if cancel_after_progress and total and done:
+                self.tasks.cancel()
+
+        self.tasks.submit(job, *args, on_done=self._finish('done'), on_error=self._finish('error'),
+                          on_cancel=self._finish('cancelled'), on_progress=on_progress)
+        run_until(self.root, lambda: self.outcome is not None)
+        return self.outcome
+
+    def index(self, directory, cancel=False):
+        return self.run(divider_2.index_job, directory, cancel_after_progress=cancel)
+
+    def scan(self, directory):
+        return self.run(divider_2.scan_job, directory)
+
+    def search(self, directory, query):
+        return self.run(divider_2.search_job, directory, query)
+
+    def assign(self, directory, reviewers, per_resume, target):
+        kind, result = self.run(divider_2.assignment_job, directory, reviewers, per_resume, {}, '')
+        if kind != 'done':
+            return kind, result
+        return self.run(divider_2.distribute_job, result, directory, target)
+
+
+class AppDriver:
+    """Drives ResumeDividerApp itself, answering its dialogs automatically."""
+
+    def __init__(self, target):
+        import ttkbootstrap as ttk
+        self.root = ttk.Window(themename="flatly")
+        self.root.withdraw()
+        self.app = divider_2.ResumeDividerApp(self.root)
+        self.messages = []
+        self.target = target
+        # Dialogs would block the loop waiting for a person; answer them instead
+        divider_2.messagebox.showinfo = lambda title, message: self.messages.append(('info', message))
+        divider_2.messagebox.showerror = lambda title, message: self.messages.append(('error', message))
+        divider_2.messagebox.askyesno = lambda title, message: True
+        divider_2.filedialog.asksaveasfilename = lambda **kwargs: os.path.join(target, 'assignment.csv')
+        divider_2.filedialog.askdirectory = lambda **kwargs: target
+
+    def _wait(self):
+        run_until(self.root, lambda: not self.app.tasks.busy)
+        status = self.app.status.get()
+        if status == "Cancelled.":
+            return 'cancelled', None
+        if self.messages and self.messages[-1][0] == 'error':
+            return 'error', self.messages[-1][1]
+        return 'done', status
+
+    def _wait_lookup(self):
+        run_until(self.root, lambda: not self.app.lookups.busy)
+        if self.messages and self.messages[-1][0] == 'error':
+            return 'error', self.messages[-1][1]
+        return 'done', self.app.status.get()
+
+    def scan(self, directory):
+        divider_2.filedialog.askdirectory = lambda **kwargs: directory
+        try:
+            self.app.choose_resume_dir()
+        finally:
+            divider_2.filedialog.askdirectory = lambda **kwargs: self.target
+        return self._wait_lookup()
+
+    def search(self, directory, query):
+        self.app.resume_dir.set(directory)
+        self.app.search_query.set(query)
+        self.app.on_search()
+        return self._wait_lookup()
+
+    def index(self, directory, cancel=False):
+        self.app.resume_dir.set(directory)
+        self.app.on_index()
+        if cancel:
+            run_until(self.root, lambda: self.app.progress.get() > 0)
+            self.app.tasks.cancel()
+        return self._wait()
+
+    def assign(self, directory, reviewers, per_resume, target):
+        self.app.resume_dir.set(directory)
+        self.app.reviewer_names.set(','.join(reviewers))
+        self.app.per_resume.set(per_resume)
+        self.app.on_assign()
+        self._wait()                     # assignment, then the copy it starts
+        return self._wait()
+
+
+def display_available():
+    if sys.platform in ('win32', 'darwin'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--budget', type=float, default=100.0, help="Longest allowed stall in ms.")
+    parser.add_argument('--no-gui', action='store_true', help="Use a Tcl interpreter even with a display.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='divider-responsiveness-')
+    try:
+        folder = os.path.join(workdir, 'resumes')
+        target = os.path.join(workdir, 'out')
+        os.makedirs(folder)
+        os.makedirs(target)
+        make_folder(folder, args.files)
+        # A second copy to cancel part-way through
+        cancel_folder = os.path.join(workdir, 'cancel')
+        shutil.copytree(folder, cancel_folder)
+
+        gui = display_available() and not args.no_gui
+        driver = AppDriver(target) if gui else HeadlessDriver()
+        print(f"{'app' if gui else 'Tcl event loop'}, {args.files} resumes, budget {args.budget:.0f} ms")
+        heartbeat = Heartbeat(driver.root)
+        reviewers = [f"reviewer{n}" for n in range(50)]
+        scenarios = [
+            ('scan folder', lambda: driver.scan(folder), 'done'),
+            ('index', lambda: driver.index(folder), 'done'),
+            ('search', lambda: driver.search(folder, 'python'), 'done'),
+            ('index, cancelled', lambda: driver.index(cancel_folder, cancel=True), 'cancelled'),
+            ('assign + copy', lambda: driver.assign(folder, reviewers, 2, target), 'done'),
+        ]
+        failures = []
+        for label, scenario, expected in scenarios:
+            heartbeat.start()
+            start = time.perf_counter()
+            kind, value = scenario()
+            elapsed = time.perf_counter() - start
+            worst = heartbeat.stop() * 1000
+            ok = kind == expected and worst <= args.budget
+            print(f"{label:18s} {kind:10s} {elapsed:6.2f}s  longest stall {worst:6.1f} ms  "
+                  f"{'ok' if ok else 'FAIL'}")
+            if not ok:
+                failures.append(label)
+        copied = sum(len(files) for _, _, files in os.walk(target))
+        assert copied >= args.files * 2, f"only {copied} files were copied"
+        return 1 if failures else 0
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
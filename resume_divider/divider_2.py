@@ -1,6 +1,45 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from tkinter import StringVar, IntVar, messagebox
+from tkinter import StringVar, IntVar, DoubleVar, messagebox, filedialog
+from assignment import assign, list_resumes, read_conflicts, parse_capacity, write_csv, distribute
+from ingest import ResumeIndex
+from tasks import TaskRunner
+
+
+# Background jobs: run on a worker thread with a TaskContext, never touch widgets
+
+def assignment_job(ctx, directory, reviewers, per_resume, capacity, conflicts_path):
+    ctx.progress(0, None, "Scanning resumes...")
+    resumes = list_resumes(directory)
+    conflicts = read_conflicts(conflicts_path) if conflicts_path else None
+    ctx.progress(0, len(resumes), f"Assigning {len(resumes)} resumes...")
+    return assign(resumes, reviewers, per_resume, capacity, conflicts)
+
+def index_job(ctx, directory):
+    def report_progress(report):
+        done = report.extracted + report.reused + report.unchanged + len(report.failed)
+        ctx.progress(done, report.total, f"Indexed {done} of {report.total} resumes...")
+
+    index = ResumeIndex(directory)
+    try:
+        return index.ingest(batch_size=50, progress=report_progress)
+    finally:
+        index.close()
+
+def scan_job(ctx, directory):
+    return len(list_resumes(directory))
+
+def search_job(ctx, directory, query):
+    index = ResumeIndex(directory)
+    try:
+        return index.search(query, limit=20)
+    finally:
+        index.close()
+
+def distribute_job(ctx, result, source_dir, target_dir):
+    distribute(result, source_dir, target_dir,
+               progress=lambda done, total: ctx.progress(done, total, f"Copied {done} of {total} files..."))
+    return target_dir
 
 class ResumeDividerApp:
     def __init__(self, root):
@@ -8,6 +47,17 @@ class ResumeDividerApp:
         self.root.title("Resume Divider")
         self.num_resumes = IntVar()
         self.num_reviewers = IntVar()
+        self.resume_dir = StringVar()
+        self.reviewer_names = StringVar()
+        self.per_resume = IntVar(value=1)
+        self.capacities = StringVar()
+        self.conflicts_file = StringVar()
+        self.search_query = StringVar()
+        self.status = StringVar(value="Ready.")
+        self.progress = DoubleVar()
+        self.tasks = TaskRunner(root)
+        # Folder scans and searches are short, so they run beside a long task
+        self.lookups = TaskRunner(root)
         self._setup_widgets()
 
     def _setup_widgets(self):
@@ -19,6 +69,83 @@ class ResumeDividerApp:
 
         ttk.Button(self.root, text="Submit", bootstyle=SUCCESS, command=self.on_submit).grid(row=2, column=0, columnspan=2, pady=20)
 
+        ttk.Separator(self.root).grid(row=3, column=0, columnspan=3, sticky=EW, padx=10)
+
+        ttk.Label(self.root, text="Resume folder:").grid(row=4, column=0, padx=10, pady=10)
+        ttk.Entry(self.root, textvariable=self.resume_dir).grid(row=4, column=1, padx=10, pady=10)
+        ttk.Button(self.root, text="Browse...", bootstyle=SECONDARY, command=self.choose_resume_dir).grid(row=4, column=2, padx=10)
+
+        ttk.Label(self.root, text="Reviewer names (comma-separated):").grid(row=5, column=0, padx=10, pady=10)
+        ttk.Entry(self.root, textvariable=self.reviewer_names).grid(row=5, column=1, padx=10, pady=10)
+
+        ttk.Label(self.root, text="Reviewers per resume:").grid(row=6, column=0, padx=10, pady=10)
+        ttk.Spinbox(self.root, from_=1, to=10, textvariable=self.per_resume).grid(row=6, column=1, padx=10, pady=10)
+
+        ttk.Label(self.root, text="Capacities (name=N, optional):").grid(row=7, column=0, padx=10, pady=10)
+        ttk.Entry(self.root, textvariable=self.capacities).grid(row=7, column=1, padx=10, pady=10)
+
+        ttk.Label(self.root, text="Conflicts CSV (optional):").grid(row=8, column=0, padx=10, pady=10)
+        ttk.Entry(self.root, textvariable=self.conflicts_file).grid(row=8, column=1, padx=10, pady=10)
+        ttk.Button(self.root, text="Browse...", bootstyle=SECONDARY, command=self.choose_conflicts_file).grid(row=8, column=2, padx=10)
+
+        ttk.Button(self.root, text="Assign Resumes", bootstyle=PRIMARY, command=self.on_assign).grid(row=9, column=0, pady=20)
+        ttk.Button(self.root, text="Index Resumes", bootstyle=INFO, command=self.on_index).grid(row=9, column=1, pady=20)
+
+        ttk.Label(self.root, text="Search resumes (e.g. python econ*):").grid(row=10, column=0, padx=10, pady=10)
+        ttk.Entry(self.root, textvariable=self.search_query).grid(row=10, column=1, padx=10, pady=10)
+        ttk.Button(self.root, text="Search", bootstyle=SECONDARY, command=self.on_search).grid(row=10, column=2, padx=10)
+
+        ttk.Progressbar(self.root, variable=self.progress, maximum=100, bootstyle=SUCCESS).grid(row=11, column=0, columnspan=2, sticky=EW, padx=10, pady=10)
+        ttk.Button(self.root, text="Cancel", bootstyle=DANGER, command=self.tasks.cancel).grid(row=11, column=2, padx=10)
+        ttk.Label(self.root, textvariable=self.status).grid(row=12, column=0, columnspan=3, padx=10, pady=(0, 10))
+
+    def _start(self, job, *args, on_done):
+        """Run job in the background, reporting progress in the status bar."""
+        if self.tasks.busy:
+            messagebox.showerror("Error", "Please wait for the current task or cancel it.")
+            return
+        self.progress.set(0)
+        self.status.set("Working...")
+        self.tasks.submit(job, *args, on_done=on_done, on_progress=self._show_progress,
+                          on_error=self._task_failed, on_cancel=self._task_cancelled)
+
+    def _lookup(self, job, *args, on_done):
+        """Run a short job in the background without touching the progress bar."""
+        if self.lookups.busy:
+            messagebox.showerror("Error", "Please wait for the current lookup to finish.")
+            return
+        self.lookups.submit(job, *args, on_done=on_done, on_error=self._task_failed)
+
+    def _show_progress(self, done, total, message):
+        if total:
+            self.progress.set(100 * done / total)
+        self.status.set(message)
+
+    def _task_failed(self, error):
+        self.status.set("Failed.")
+        messagebox.showerror("Error", f"Input error: {str(error)}")
+
+    def _task_cancelled(self):
+        self.progress.set(0)
+        self.status.set("Cancelled.")
+
+    def choose_resume_dir(self):
+        directory = filedialog.askdirectory(title="Folder of resumes")
+        if directory:
+            self.resume_dir.set(directory)
+            self.status.set("Counting resumes...")
+            self._lookup(scan_job, directory, on_done=lambda count: self._scan_done(directory, count))
+
+    def _scan_done(self, directory, count):
+        if self.resume_dir.get() == directory:  # unless another folder was chosen since
+            self.num_resumes.set(count)
+        self.status.set(f"Found {count} resumes.")
+
+    def choose_conflicts_file(self):
+        path = filedialog.askopenfilename(title="Conflicts (reviewer,resume)", filetypes=[("CSV files", "*.csv")])
+        if path:
+            self.conflicts_file.set(path)
+
     def on_submit(self):
         try:
             n_resumes = self.num_resumes.get()
@@ -37,6 +164,67 @@ class ResumeDividerApp:
         except Exception as e:
             messagebox.showerror("Error", f"Input error: {str(e)}")
 
+    def on_assign(self):
+        # Widgets are read here, on the Tk thread; the job only gets plain values
+        try:
+            directory = self.resume_dir.get()
+            if not directory:
+                messagebox.showerror("Error", "Choose a folder of resumes first!")
+                return
+            reviewers = [name.strip() for name in self.reviewer_names.get().split(",") if name.strip()]
+            capacity = parse_capacity(v for v in self.capacities.get().split(",") if v.strip())
+            per_resume = self.per_resume.get()
+        except Exception as e:
+            messagebox.showerror("Error", f"Input error: {str(e)}")
+            return
+        self._start(assignment_job, directory, reviewers, per_resume, capacity, self.conflicts_file.get(),
+                    on_done=lambda result: self._assignment_done(result, directory))
+
+    def _assignment_done(self, result, directory):
+        self.progress.set(100)
+        self.status.set("Assignment ready.")
+        messagebox.showinfo("Resume Assignment", result.summary())
+        path = filedialog.asksaveasfilename(title="Save assignment", defaultextension=".csv",
+                                            filetypes=[("CSV files", "*.csv")])
+        if path:
+            write_csv(result, path)
+        if messagebox.askyesno("Resume Assignment", "Copy each reviewer's resumes into their own folder?"):
+            target = filedialog.askdirectory(title="Folder for reviewer copies")
+            if target:
+                self._start(distribute_job, result, directory, target,
+                            on_done=lambda target: self.status.set(f"Copied resumes into {target}."))
+
+    def on_index(self):
+        directory = self.resume_dir.get()
+        if not directory:
+            messagebox.showerror("Error", "Choose a folder of resumes first!")
+            return
+        self._start(index_job, directory, on_done=self._index_done)
+
+    def _index_done(self, report):
+        self.progress.set(100)
+        self.status.set(report.summary())
+        message = report.summary()
+        if report.failed:
+            message += "\n\nCould not read:\n" + "\n".join(sorted(report.failed)[:10])
+        messagebox.showinfo("Resume Index", message)
+
+    def on_search(self):
+        directory = self.resume_dir.get()
+        if not directory:
+            messagebox.showerror("Error", "Choose a folder of resumes first!")
+            return
+        self.status.set("Searching...")
+        self._lookup(search_job, directory, self.search_query.get(), on_done=self._search_done)
+
+    def _search_done(self, results):
+        self.status.set(f"{len(results)} matching resumes.")
+        if results:
+            message = "\n".join(f"{name} ({score})" for name, score in results)
+        else:
+            message = "No indexed resumes match. Index the folder first if you haven't."
+        messagebox.showinfo("Search Results", message)
+
 if __name__ == "__main__":
     app = ttk.Window(themename="flatly")  # Choose a modern theme
     ResumeDividerApp(app)
@@ -0,0 +1,325 @@
+"""Extract text from a folder of resumes and index it for search.
+
+Files are hashed and parsed on a process pool, with only a bounded number
+of files in flight, so memory stays flat however large the folder is.
+Results are stored in one SQLite file (by default .resume_index.sqlite3
+inside the folder):
+
+    files     path -> size, mtime and content hash
+    texts     content hash -> extracted text (the extraction cache)
+    postings  term -> content hash and count (the inverted index)
+
+Files whose size and mtime haven't changed are skipped without being read.
+Changed files whose content hash is already known reuse the cached text.
+PDF extraction needs the optional pypdf package. DOCX is read with
+zipfile, and plain text files are read directly.
+
+Headless use:
+    python ingest.py RESUME_DIR [--workers N] [--index PATH]
+    python ingest.py RESUME_DIR --search "python data 2026"
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import sys
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from xml.etree import ElementTree
+
+from assignment import list_resumes
+
+try:
+    import pypdf
+except ImportError:  # Optional; PDFs are reported as failed without it
+    pypdf = None
+
+INDEX_NAME = '.resume_index.sqlite3'
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+QUERY_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*\*?')
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS files ('
+    'path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, sha256 TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS ix_files_sha256 ON files (sha256)',
+    'CREATE TABLE IF NOT EXISTS texts (sha256 TEXT PRIMARY KEY, text TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS postings ('
+    'term TEXT NOT NULL, sha256 TEXT NOT NULL, count INTEGER NOT NULL, '
+    'PRIMARY KEY (term, sha256)) WITHOUT ROWID',
+)
+
+
+def tokenize(text):
+    """Lowercased search terms of text, dropping single characters."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_pdf(path):
+    if pypdf is None:
+        raise RuntimeError('PDF support needs pypdf: pip install pypdf')
+    reader = pypdf.PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def extract_docx(path):
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        paragraphs, current = [], []
+        for event, element in ElementTree.iterparse(document):
+            if element.tag == WORD_NAMESPACE + 't' and element.text:
+                current.append(element.text)
+            elif element.tag == WORD_NAMESPACE + 'p':
+                paragraphs.append(''.join(current))
+                current = []
+            element.clear()
+    return '\n'.join(paragraphs)
+
+
+def extract_plain(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+EXTRACTORS = {
+    '.pdf': extract_pdf,
+    '.docx': extract_docx,
+    '.txt': extract_plain,
+}
+
+
+def extract_text(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTRACTORS:
+        raise RuntimeError(f'No text extractor for {extension} files')
+    return EXTRACTORS[extension](path)
+
+
+_known_hashes = frozenset()
+
+
+def _init_worker(known_hashes):
+    # Sent once per worker process instead of with every file
+    global _known_hashes
+    _known_hashes = known_hashes
+
+
+def _process(path):
+    """Worker: hash path and, unless the hash is already indexed, extract its text."""
+    sha256 = file_sha256(path)
+    if sha256 in _known_hashes:
+        return sha256, None
+    return sha256, extract_text(path)
+
+
+class IngestReport:
+    """Counts and timing of one ingestion run."""
+
+    def __init__(self):
+        self.total = 0
+        self.extracted = 0
+        self.reused = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.failed = {}  # file name -> error message
+        self.elapsed = 0.0
+
+    @property
+    def files_per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (f"{self.total} files in {self.elapsed:.1f}s ({self.files_per_second:.0f} files/sec): "
+                f"{self.extracted} extracted, {self.reused} reused from cache, "
+                f"{self.unchanged} unchanged, {self.removed} removed, {len(self.failed)} failed")
+
+
+class ResumeIndex:
+    """On-disk text cache and inverted index for one resume folder."""
+
+    def __init__(self, directory, path=None):
+        self.directory = directory
+        self.path = path or os.path.join(directory, INDEX_NAME)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def ingest(self, workers=None, batch_size=200, progress=None):
+        """Bring the index up to date with the folder and return an IngestReport.
+
+        progress, if given, is called with the report after every batch.
+        """
+        report = IngestReport()
+        start = time.perf_counter()
+        known = {path: (size, mtime_ns) for path, size, mtime_ns
+                 in self.conn.execute('SELECT path, size, mtime_ns FROM files')}
+        known_hashes = frozenset(row[0] for row in self.conn.execute('SELECT sha256 FROM texts'))
+
+        names = list_resumes(self.directory)
+        report.total = len(names)
+        pending = []
+        for name in names:
+            stat = os.stat(os.path.join(self.directory, name))
+            if known.pop(name, None) == (stat.st_size, stat.st_mtime_ns):
+                report.unchanged += 1
+            else:
+                pending.append((name, stat.st_size, stat.st_mtime_ns))
+
+        if known:
+            # Files deleted since the last run
+            self.conn.executemany('DELETE FROM files WHERE path = ?', [(path,) for path in known])
+            report.removed = len(known)
+
+        done = []
+        workers = workers or os.cpu_count() or 1
+        # Forking a process that runs threads (e.g. a GUI) is unsafe
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method),
+                                 initializer=_init_worker, initargs=(known_hashes,)) as executor:
+            limit = workers * 4
+            in_flight = {}
+            queue = iter(pending)
+            while True:
+                # Keep a bounded number of files in flight
+                for name, size, mtime_ns in queue:
+                    future = executor.submit(_process, os.path.join(self.directory, name))
+                    in_flight[future] = (name, size, mtime_ns)
+                    if len(in_flight) >= limit:
+                        break
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, size, mtime_ns = in_flight.pop(future)
+                    try:
+                        sha256, text = future.result()
+                    except Exception as e:
+                        report.failed[name] = str(e)
+                        continue
+                    done.append((name, size, mtime_ns, sha256, text))
+                if len(done) >= batch_size:
+                    self._store(done, report)
+                    done = []
+                    if progress:
+                        report.elapsed = time.perf_counter() - start
+                        progress(report)
+        self._store(done, report)
+        self._collect_garbage()
+        report.elapsed = time.perf_counter() - start
+        if progress:
+            progress(report)
+        return report
+
+    def _store(self, done, report):
+        with self.conn:
+            for name, size, mtime_ns, sha256, text in done:
+                if text is None:
+                    report.reused += 1
+                else:
+                    report.extracted += 1
+                    inserted = self.conn.execute(
+                        'INSERT OR IGNORE INTO texts (sha256, text) VALUES (?, ?)', (sha256, text)
+                    ).rowcount
+                    if inserted:
+                        self.conn.executemany(
+                            'INSERT INTO postings (term, sha256, count) VALUES (?, ?, ?)',
+                            [(term, sha256, count) for term, count in Counter(tokenize(text)).items()]
+                        )
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)',
+                    (name, size, mtime_ns, sha256)
+                )
+
+    def _collect_garbage(self):
+        """Drop text and postings no longer referenced by any file."""
+        with self.conn:
+            orphans = [row[0] for row in self.conn.execute(
+                'SELECT sha256 FROM texts WHERE sha256 NOT IN (SELECT sha256 FROM files)'
+            )]
+            for sha256 in orphans:
+                self.conn.execute('DELETE FROM postings WHERE sha256 = ?', (sha256,))
+                self.conn.execute('DELETE FROM texts WHERE sha256 = ?', (sha256,))
+
+    def search(self, query, limit=50):
+        """Files containing every term of query, best matches first.
+
+        A trailing * matches a prefix (e.g. "pyth*"). Returns (file name,
+        score) pairs, where score is the total count of matched terms.
+        """
+        terms = [term for term in QUERY_PATTERN.findall(query.lower()) if len(term.rstrip('*')) > 1]
+        if not terms:
+            return []
+        clauses, params = [], []
+        for term in terms:
+            if term.endswith('*'):
+                prefix = term[:-1]
+                clauses.append('SELECT sha256, SUM(count) AS score FROM postings '
+                               'WHERE term >= ? AND term < ? GROUP BY sha256')
+                params.extend([prefix, prefix + '\U0010ffff'])
+            else:
+                clauses.append('SELECT sha256, count AS score FROM postings WHERE term = ?')
+                params.append(term)
+        # A hash matches if it appears once for every term
+        sql = (
+            'SELECT files.path, matches.score FROM ('
+            'SELECT sha256, SUM(score) AS score, COUNT(*) AS hits FROM ('
+            + ' UNION ALL '.join(clauses) +
+            ') GROUP BY sha256) AS matches '
+            'JOIN files ON files.sha256 = matches.sha256 '
+            'WHERE matches.hits = ? ORDER BY matches.score DESC, files.path LIMIT ?'
+        )
+        return self.conn.execute(sql, params + [len(terms), limit]).fetchall()
+
+    def text(self, name):
+        """Extracted text of one file, or None if it isn't indexed."""
+        row = self.conn.execute(
+            'SELECT texts.text FROM files JOIN texts ON texts.sha256 = files.sha256 WHERE files.path = ?',
+            (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index the text of a folder of resumes.")
+    parser.add_argument('resume_dir')
+    parser.add_argument('--workers', type=int, help="Extraction processes (default: one per core).")
+    parser.add_argument('--index', help=f"Index file (default: RESUME_DIR/{INDEX_NAME}).")
+    parser.add_argument('--search', help="Search the index instead of updating it.")
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    index = ResumeIndex(args.resume_dir, args.index)
+    try:
+        if args.search is not None:
+            for name, score in index.search(args.search, args.limit):
+                print(f"{score:6d}  {name}")
+            return 0
+        report = index.ingest(workers=args.workers,
+                              progress=lambda r: print(r.summary(), file=sys.stderr))
+        for name, error in sorted(report.failed.items()):
+            print(f"failed: {name}: {error}", file=sys.stderr)
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
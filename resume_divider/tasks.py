@@ -0,0 +1,110 @@
+"""Run slow work off the Tk main loop.
+
+A job is a function taking a TaskContext. It runs on a worker thread and
+reports through a queue that the Tk thread polls with root.after(). Its
+callbacks (on_progress, on_done, on_error) therefore always run on the Tk
+thread, where touching widgets is safe. Only the latest progress update
+is delivered on each poll, so a chatty job can't flood the main loop.
+
+    runner = TaskRunner(root)
+    runner.submit(job, on_progress=show, on_done=finish)
+    runner.cancel()  # the job stops at its next ctx.check()
+"""
+
+import queue
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised inside a job by TaskContext.check() once it has been cancelled."""
+
+
+class TaskContext:
+    """Handed to a job so it can report progress and notice cancellation."""
+
+    def __init__(self, events):
+        self._events = events
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        """Raise TaskCancelled if the job has been cancelled."""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def progress(self, done, total=None, message=''):
+        """Report progress, then stop here if the job has been cancelled."""
+        self._events.put(('progress', (done, total, message)))
+        self.check()
+
+
+class TaskRunner:
+    """Runs one background job at a time for a Tk (or Tcl) root."""
+
+    def __init__(self, root, poll_interval=50):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._events = None
+        self._context = None
+        self._callbacks = None
+
+    @property
+    def busy(self):
+        return self._context is not None
+
+    def submit(self, job, *args, on_done=None, on_error=None, on_progress=None, on_cancel=None):
+        """Start job(ctx, *args) on a worker thread."""
+        if self.busy:
+            raise RuntimeError("Another task is still running.")
+        self._events = queue.Queue()
+        self._context = TaskContext(self._events)
+        self._callbacks = {'done': on_done, 'error': on_error,
+                           'progress': on_progress, 'cancelled': on_cancel}
+        thread = threading.Thread(target=self._run, args=(self._events, self._context, job, args),
+                                  name='divider-task', daemon=True)
+        thread.start()
+        self.root.after(self.poll_interval, self._poll)
+        return self._context
+
+    def cancel(self):
+        if self._context is not None:
+            self._context._cancel.set()
+
+    @staticmethod
+    def _run(events, context, job, args):
+        try:
+            events.put(('done', job(context, *args)))
+        except TaskCancelled:
+            events.put(('cancelled', None))
+        except Exception as e:
+            events.put(('error', e))
+
+    def _poll(self):
+        progress, final = None, None
+        while final is None:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                progress = value
+            else:
+                final = (kind, value)
+        callbacks = self._callbacks
+        if progress is not None and callbacks['progress']:
+            callbacks['progress'](*progress)
+        if final is None:
+            self.root.after(self.poll_interval, self._poll)
+            return
+        self._events = self._context = self._callbacks = None
+        kind, value = final
+        if callbacks[kind]:
+            if kind == 'cancelled':
+                callbacks[kind]()
+            else:
+                callbacks[kind](value)
+        elif kind == 'error':
+            raise value
@@ -2,15 +2,44 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
+from app.hashing import PasswordHasher, HashingBusyError
+from app.last_login import LastLoginRecorder
+from app.user_cache import UserCache
+from app.sessions import SessionStore
+from app.database import apply_sqlite_pragmas
+from app.templating import configure_bytecode_cache
+from app.instrumentation import Instrumentation
+from app.availability import AvailabilityIndex
+from app.throttle import LoginThrottle
+from app.render_cache import RenderCache
+from app.assets import Assets
+from app.jobs import JobQueue
+from app.mail import Mailer
 import os
 
 # Initialize extensions
 db = SQLAlchemy()
 login_manager = LoginManager()
 migrate = Migrate()
+hasher = PasswordHasher()
+last_login_recorder = LastLoginRecorder()
+user_cache = UserCache()
+session_store = SessionStore()
+instrumentation = Instrumentation()
+availability_index = AvailabilityIndex()
+login_throttle = LoginThrottle()
+render_cache = RenderCache()
+assets = Assets()
+job_queue = JobQueue()
+mailer = Mailer()
 
 def create_app(config_name=None):
-    """Application factory pattern."""
+    """Application factory pattern.
+    
+    Database tables are not created here; run `flask db upgrade` (or
+    `python run.py init-db` for a demo database) once per deployment instead.
+    """
     app = Flask(__name__)
     
     # Configuration
@@ -19,29 +48,53 @@ def create_app(config_name=None):
     
     from config.config import config
     app.config.from_object(config[config_name])
+    configure_bytecode_cache(app)
+    
+    # Take the client address from X-Forwarded-For when behind trusted proxies,
+    # so per-IP login throttling sees clients rather than the proxy
+    if app.config.get('PROXY_FIX_X_FOR'):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
     
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        apply_sqlite_pragmas(app, db.engine)
     login_manager.init_app(app)
     migrate.init_app(app, db)
+    hasher.init_app(app)
+    last_login_recorder.init_app(app)
+    user_cache.init_app(app)
+    session_store.init_app(app)
+    availability_index.init_app(app)
+    login_throttle.init_app(app)
+    render_cache.init_app(app)
+    assets.init_app(app)
+    job_queue.init_app(app)
+    mailer.init_app(app)
+    instrumentation.init_app(app)
     
     # Configure Flask-Login
     login_manager.login_view = 'main.login'
     login_manager.login_message = 'Please log in to access this page.'
     login_manager.login_message_category = 'info'
     
-    # User loader callback
+    # User loader callback, served from the user snapshot cache
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models import User
-        return User.query.get(int(user_id))
+        return user_cache.load(int(user_id))
     
     # Register blueprints
     from app.routes import main
+    from app.api import api
     app.register_blueprint(main)
+    app.register_blueprint(api)
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Register background tasks with the job queue
+    from app import tasks
+    
+    # Shed load instead of queueing when the hashing pool is saturated
+    @app.errorhandler(HashingBusyError)
+    def hashing_busy(error):
+        return 'The server is busy. Please try again shortly.', 503, {'Retry-After': '1'}
     
     return app
\ No newline at end of file
@@ -0,0 +1,252 @@
+"""JSON API for the React client, mounted at /api/v1.
+
+Every resource is a function of (query args, URL values) that returns a
+plain dict, so the same code serves its own route and POST /api/v1/batch,
+which resolves several resources in one round trip without building a
+request for each. Lists are paged with an opaque `cursor` (keyset on id),
+and `fields=a,b` limits objects to the named fields, which are the only
+columns selected. GET responses carry an ETag and answer a matching
+If-None-Match with 304. Bodies are encoded with orjson when it is
+installed.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from urllib.parse import parse_qsl, urlsplit
+
+from flask import Blueprint, current_app, request
+from flask_login import current_user
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import Map, Rule
+
+from app import db
+from app.models import User, Club
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library encoder is used instead
+    orjson = None
+
+PREFIX = '/api/v1'
+api = Blueprint('api', __name__, url_prefix=PREFIX)
+
+USER_FIELDS = {
+    'id': User.id,
+    'username': User.username,
+    'email': User.email,
+    'first_name': User.first_name,
+    'last_name': User.last_name,
+    'is_active': User.is_active,
+    'created_at': User.created_at,
+}
+CLUB_FIELDS = {
+    'id': Club.id,
+    'name': Club.name,
+    'category': Club.category,
+    'description': Club.description,
+    'website': Club.website,
+    'member_count': Club.member_count,
+    'created_at': Club.created_at,
+}
+SESSION_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'created_at', 'last_login')
+
+# endpoint -> (resource function, login required); mirrored in _batch_map
+_resources = {}
+_batch_map = Map()
+
+
+class ApiError(Exception):
+    """An error returned to the client as {"error": {"status", "message"}}."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload):
+    """Encode payload as compact UTF-8 JSON bytes, with ISO 8601 timestamps."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def encode_cursor(last_id):
+    return base64.urlsafe_b64encode(str(last_id).encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise ApiError(400, 'Invalid cursor.')
+
+
+def _fields(args, available):
+    """The requested subset of available field names, in the order given."""
+    value = args.get('fields')
+    if not value:
+        return list(available)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ApiError(400, f"Unknown field(s): {', '.join(unknown)}.")
+    return fields
+
+
+def _limit(args):
+    config = current_app.config
+    try:
+        limit = int(args.get('limit', config['API_PAGE_SIZE']))
+    except ValueError:
+        raise ApiError(400, 'limit must be an integer.')
+    return max(1, min(limit, config['API_MAX_PAGE_SIZE']))
+
+
+def _select(available, fields):
+    """Columns to select for fields, always starting with id."""
+    return [available['id']] + [available[name] for name in fields if name != 'id']
+
+
+def _objects(rows, fields):
+    names = ['id'] + [name for name in fields if name != 'id']
+    keep_id = 'id' in fields
+    objects = []
+    for row in rows:
+        item = dict(zip(names, row))
+        if not keep_id:
+            del item['id']
+        objects.append(item)
+    return objects
+
+
+def _page(available, args, *conditions):
+    """One keyset page of rows with the requested fields."""
+    fields = _fields(args, available)
+    limit = _limit(args)
+    id_column = available['id']
+    query = db.select(*_select(available, fields)).where(*conditions).order_by(id_column).limit(limit + 1)
+    if args.get('cursor'):
+        query = query.where(id_column > decode_cursor(args['cursor']))
+    rows = db.session.execute(query).all()
+    next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+    return {'data': _objects(rows[:limit], fields), 'next_cursor': next_cursor}
+
+
+def _one(available, args, *conditions):
+    fields = _fields(args, available)
+    row = db.session.execute(db.select(*_select(available, fields)).where(*conditions)).first()
+    if row is None:
+        raise ApiError(404, 'Not found.')
+    return {'data': _objects([row], fields)[0]}
+
+
+def resource(rule, login_required=True):
+    """Expose func(args, **url_values) at PREFIX + rule and to the batch endpoint."""
+    def decorator(func):
+        endpoint = func.__name__
+        _resources[endpoint] = (func, login_required)
+        _batch_map.add(Rule(PREFIX + rule, endpoint=endpoint, methods=['GET']))
+
+        def view(**url_values):
+            status, payload = resolve(endpoint, request.args, url_values)
+            response = current_app.response_class(dumps(payload), status=status, mimetype='application/json')
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Cookie')
+            if status == 200:
+                response.add_etag()
+                response.make_conditional(request)
+            return response
+
+        api.add_url_rule(rule, endpoint, view, methods=['GET'])
+        return func
+    return decorator
+
+
+def resolve(endpoint, args, url_values):
+    """Run a resource and return (status, payload), turning ApiErrors into error payloads."""
+    func, login_required = _resources[endpoint]
+    try:
+        if login_required and not current_user.is_authenticated:
+            raise ApiError(401, 'Authentication required.')
+        return 200, func(args, **url_values)
+    except ApiError as e:
+        return e.status, {'error': {'status': e.status, 'message': e.message}}
+
+
+@resource('/session', login_required=False)
+def session_info(args):
+    """Whether the caller is logged in, and as whom; served from the user cache."""
+    if not current_user.is_authenticated:
+        return {'authenticated': False, 'user': None}
+    return {'authenticated': True,
+            'user': {name: getattr(current_user, name) for name in SESSION_FIELDS}}
+
+
+@resource('/users')
+def list_users(args):
+    return _page(USER_FIELDS, args)
+
+
+@resource('/users/<int:user_id>')
+def get_user(args, user_id):
+    return _one(USER_FIELDS, args, User.id == user_id)
+
+
+@resource('/clubs')
+def list_clubs(args):
+    """Active clubs by id, or with q=, the best search matches (not paged)."""
+    if args.get('q'):
+        fields = _fields(args, CLUB_FIELDS)
+        clubs = Club.search(args['q'], limit=_limit(args))
+        return {'data': [{name: getattr(club, name) for name in fields} for club in clubs],
+                'next_cursor': None}
+    return _page(CLUB_FIELDS, args, Club.is_active)
+
+
+@resource('/clubs/<int:club_id>')
+def get_club(args, club_id):
+    return _one(CLUB_FIELDS, args, Club.id == club_id, Club.is_active)
+
+
+@api.route('/batch', methods=['POST'])
+def batch():
+    """Resolve several GET resources in one round trip.
+
+    Takes {"requests": ["/api/v1/users/1?fields=username", ...]} and
+    returns {"responses": [{"path", "status", "body"}, ...]} in the same
+    order. Each entry succeeds or fails on its own.
+    """
+    payload = request.get_json(silent=True)
+    paths = payload.get('requests') if isinstance(payload, dict) else None
+    if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+        status, body = 400, {'error': {'status': 400, 'message': 'Expected {"requests": [path, ...]}.'}}
+    elif len(paths) > current_app.config['API_BATCH_MAX']:
+        message = f"At most {current_app.config['API_BATCH_MAX']} requests per batch."
+        status, body = 400, {'error': {'status': 400, 'message': message}}
+    else:
+        adapter = _batch_map.bind('localhost')
+        responses = []
+        for path in paths:
+            url = urlsplit(path)
+            try:
+                endpoint, url_values = adapter.match(url.path, method='GET')
+            except (NotFound, MethodNotAllowed):
+                item_status, item_body = 404, {'error': {'status': 404, 'message': 'Not found.'}}
+            else:
+                args = MultiDict(parse_qsl(url.query, keep_blank_values=True))
+                item_status, item_body = resolve(endpoint, args, url_values)
+            responses.append({'path': path, 'status': item_status, 'body': item_body})
+        status, body = 200, {'responses': responses}
+    response = current_app.response_class(dumps(body), status=status, mimetype='application/json')
+    response.headers['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip variants are still written
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.html', '.json', '.txt', '.map')
+
+
+def fingerprint_name(filename, digest):
+    root, ext = os.path.splitext(filename)
+    return f'{root}.{digest}{ext}'
+
+
+def build_assets(static_folder, build_dir):
+    """Write fingerprinted copies (plus .gz/.br variants) of every static file.
+
+    Returns the manifest mapping logical names to fingerprinted names, which
+    is also saved as manifest.json in build_dir. Files already built with
+    the same content hash are left alone.
+    """
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        for name in files:
+            source = os.path.join(root, name)
+            logical = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+            built = fingerprint_name(logical, hashlib.sha256(data).hexdigest()[:12])
+            manifest[logical] = built
+            target = os.path.join(build_dir, built)
+            if os.path.exists(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if name.endswith(COMPRESSIBLE):
+                _write(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    _write(target + '.br', brotli.compress(data, quality=11))
+            # Written last: its presence means the variants are complete
+            _write(target, data)
+    os.makedirs(build_dir, exist_ok=True)
+    _write(os.path.join(build_dir, 'manifest.json'),
+           json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+def _write(path, data):
+    """Replace path with data atomically, so concurrent builds never see partial files."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+class Assets:
+    """Flask extension serving fingerprinted, precompressed static files.
+
+    Templates call static_url('css/style.css'), which resolves to
+    /assets/css/style.<hash>.css. Those URLs are served with a year-long
+    immutable Cache-Control and the best encoding the client accepts.
+    Files missing from the manifest fall back to the plain static URL.
+    The build runs at startup only with ASSETS_BUILD_ON_STARTUP (on in
+    development); otherwise run `flask build-assets` at deploy time.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASSETS_BUILD_DIR', os.path.join(app.instance_path, 'assets'))
+        app.config.setdefault('ASSETS_BUILD_ON_STARTUP', False)
+        app.config.setdefault('ASSETS_MAX_AGE', 31536000)
+        build_dir = app.config['ASSETS_BUILD_DIR']
+        manifest = {}
+        if app.config['ASSETS_BUILD_ON_STARTUP']:
+            manifest = build_assets(app.static_folder, build_dir)
+        elif os.path.exists(os.path.join(build_dir, 'manifest.json')):
+            with open(os.path.join(build_dir, 'manifest.json')) as f:
+                manifest = json.load(f)
+        app.extensions['assets'] = manifest
+        app.add_url_rule('/assets/<path:filename>', 'assets', serve_asset)
+        app.jinja_env.globals['static_url'] = static_url
+
+
+def static_url(filename):
+    """URL of a static file, fingerprinted when it has been built."""
+    built = current_app.extensions['assets'].get(filename)
+    if built is None:
+        return url_for('static', filename=filename)
+    return url_for('assets', filename=built)
+
+
+def serve_asset(filename):
+    """Serve a fingerprinted file, preferring a precompressed variant."""
+    config = current_app.config
+    build_dir = config['ASSETS_BUILD_DIR']
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    served, encoding = filename, None
+    for candidate, extension in (('br', '.br'), ('gzip', '.gz')):
+        # Quality 0 (e.g. "br;q=0") means the client refuses the encoding
+        if (request.accept_encodings[candidate] > 0
+                and os.path.exists(os.path.join(build_dir, filename + extension))):
+            served, encoding = filename + extension, candidate
+            break
+    response = send_from_directory(build_dir, served, mimetype=mimetype,
+                                   max_age=config['ASSETS_MAX_AGE'])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    return response
@@ -0,0 +1,172 @@
+import hashlib
+import math
+import threading
+import time
+from flask import current_app
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+class _AvailabilityState:
+    """Per-application username/email filters and their sync position."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.usernames = None
+        self.emails = None
+        self.max_id = 0
+        # Ids added locally ahead of max_id, so _load doesn't count them twice
+        self.added_ids = set()
+        self.last_sync = 0.0
+        self.counters = dict.fromkeys(('negatives', 'fallthroughs', 'false_positives'), 0)
+
+    def _new_filters(self, expected):
+        capacity = max(self.config['AVAILABILITY_INDEX_CAPACITY'], expected * 2)
+        error_rate = self.config['AVAILABILITY_INDEX_ERROR_RATE']
+        self.usernames = BloomFilter(capacity, error_rate)
+        self.emails = BloomFilter(capacity, error_rate)
+
+    def _load(self, after_id):
+        """Add users with id > after_id with one streamed query."""
+        from app import db
+        from app.models import User
+        query = (db.select(User.id, db.func.lower(User.username), db.func.lower(User.email))
+                 .where(User.id > after_id)
+                 .order_by(User.id)
+                 .execution_options(yield_per=5000))
+        for user_id, username, email in db.session.execute(query):
+            if user_id in self.added_ids:
+                self.added_ids.discard(user_id)
+            else:
+                self.usernames.add(username)
+                self.emails.add(email)
+            self.max_id = user_id
+
+    def sync(self):
+        """Warm the filters on first use, then pick up rows other processes added."""
+        now = time.monotonic()
+        if self.usernames is not None and now - self.last_sync < self.config['AVAILABILITY_INDEX_REFRESH']:
+            return
+        with self.lock:
+            if self.usernames is None or self.usernames.count > self.usernames.capacity:
+                from app import db
+                from app.models import User
+                expected = db.session.execute(db.select(db.func.count(User.id))).scalar()
+                self._new_filters(expected)
+                self.max_id = 0
+                self.added_ids.clear()
+            self._load(self.max_id)
+            self.last_sync = now
+
+    def add(self, username, email, user_id=None):
+        if self.usernames is None:
+            return
+        with self.lock:
+            self.usernames.add(username.lower().strip())
+            self.emails.add(email.lower().strip())
+            if user_id is None or user_id <= self.max_id:
+                return
+            # Only advance past contiguous ids: a gap may be rows another
+            # process added that the next sync still has to load
+            if user_id == self.max_id + 1:
+                self.max_id = user_id
+                while self.max_id + 1 in self.added_ids:
+                    self.max_id += 1
+                    self.added_ids.discard(self.max_id)
+            else:
+                self.added_ids.add(user_id)
+
+
+class AvailabilityIndex:
+    """Flask extension answering "is this username/email free?" from memory.
+
+    Bloom filters of normalized usernames and emails are warmed with one
+    streamed query on first use and kept current by User.create_user and
+    the roster importer. Every AVAILABILITY_INDEX_REFRESH seconds, rows
+    added by other processes are picked up with an id > last_id query.
+    Names not in a filter are free without touching the database; possible
+    matches fall through to User.check_availability.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('AVAILABILITY_INDEX_CAPACITY', 100000)
+        app.config.setdefault('AVAILABILITY_INDEX_ERROR_RATE', 0.01)
+        app.config.setdefault('AVAILABILITY_INDEX_REFRESH', 1.0)
+        app.extensions['availability_index'] = _AvailabilityState(app.config)
+
+    def _state(self):
+        return current_app.extensions['availability_index']
+
+    def check(self, username=None, email=None):
+        """Return {'username': bool, 'email': bool} like User.check_availability."""
+        from app.models import User
+        state = self._state()
+        state.sync()
+        result = {}
+        maybe_taken = {}
+        for field, value, bloom in (('username', username, state.usernames),
+                                    ('email', email, state.emails)):
+            if value is None:
+                continue
+            value = value.lower().strip()
+            if value in bloom:
+                maybe_taken[field] = value
+            else:
+                result[field] = True
+                state.counters['negatives'] += 1
+        if maybe_taken:
+            state.counters['fallthroughs'] += len(maybe_taken)
+            checked = User.check_availability(**maybe_taken)
+            state.counters['false_positives'] += sum(checked.values())
+            result.update(checked)
+        return result
+
+    def add(self, username, email, user_id=None):
+        """Record a newly created user.
+
+        Passing user_id lets the next sync skip the row instead of adding it again.
+        """
+        self._state().add(username, email, user_id)
+
+    def stats(self):
+        """Return counters plus the filters' size and memory footprint."""
+        state = self._state()
+        stats = dict(state.counters)
+        if state.usernames is not None:
+            stats['entries'] = state.usernames.count
+            stats['bytes'] = state.usernames.nbytes + state.emails.nbytes
+        return stats
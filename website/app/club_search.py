@@ -0,0 +1,67 @@
+import re
+from sqlalchemy import DDL, event, text
+
+# External-content FTS5 index over active clubs. Triggers keep it in step
+# with every INSERT/UPDATE/DELETE, including bulk ones that bypass the ORM.
+# The prefix option indexes 2-3 character prefixes so typeahead stays fast.
+_COLUMNS = "name, category, description"
+_ADD_NEW = f"INSERT INTO club_search (rowid, {_COLUMNS}) SELECT new.id, new.name, new.category, new.description WHERE new.is_active;"
+_REMOVE_OLD = (f"INSERT INTO club_search (club_search, rowid, {_COLUMNS}) "
+               "SELECT 'delete', old.id, old.name, old.category, old.description WHERE old.is_active;")
+SCHEMA = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS club_search USING fts5({_COLUMNS}, "
+    "content='clubs', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS clubs_search_insert AFTER INSERT ON clubs BEGIN {_ADD_NEW} END",
+    f"CREATE TRIGGER IF NOT EXISTS clubs_search_delete AFTER DELETE ON clubs BEGIN {_REMOVE_OLD} END",
+    "CREATE TRIGGER IF NOT EXISTS clubs_search_update "
+    f"AFTER UPDATE OF name, category, description, is_active ON clubs BEGIN {_REMOVE_OLD} {_ADD_NEW} END",
+)
+
+# Rank and limit inside FTS5 first, so only the top rows are joined to clubs.
+# bm25 column weights are name, category, description; passing them inline
+# is measurably cheaper than a stored 'rank' configuration.
+SEARCH_SQL = (
+    "SELECT clubs.* FROM ("
+    "SELECT rowid, bm25(club_search, 10.0, 4.0, 1.0) AS rank FROM club_search "
+    "WHERE club_search MATCH :match ORDER BY rank LIMIT :limit"
+    ") AS hits JOIN clubs ON clubs.id = hits.rowid ORDER BY hits.rank"
+)
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+MIN_PREFIX_LENGTH = 2
+
+
+def install(table):
+    """Create the FTS table and triggers whenever the clubs table is created on SQLite."""
+    for statement in SCHEMA:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(table, 'before_drop', DDL('DROP TABLE IF EXISTS club_search').execute_if(dialect='sqlite'))
+
+
+def rebuild(connection):
+    """Create the index if it's missing and refill it with the active clubs."""
+    for statement in SCHEMA:
+        connection.execute(text(statement))
+    connection.execute(text("INSERT INTO club_search (club_search) VALUES ('delete-all')"))
+    connection.execute(text(
+        f"INSERT INTO club_search (rowid, {_COLUMNS}) "
+        "SELECT id, name, category, description FROM clubs WHERE is_active"
+    ))
+
+
+def match_expression(query):
+    """Turn free text into an FTS5 query: every word must match, the last as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in user input are
+    treated as plain text. A single-character last word is matched
+    exactly, since its prefix would merge a large share of the index.
+    Returns None if query has no words.
+    """
+    words = TOKEN_PATTERN.findall(query.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if len(words[-1]) >= MIN_PREFIX_LENGTH:
+        terms[-1] += '*'
+    return ' '.join(terms)
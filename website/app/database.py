@@ -0,0 +1,19 @@
+from sqlalchemy import event
+
+
+def apply_sqlite_pragmas(app, engine):
+    """Run the configured PRAGMA statements on every new SQLite connection."""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    in_memory = engine.url.database in (None, '', ':memory:')
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            # In-memory databases can't use WAL
+            if in_memory and name == 'journal_mode':
+                continue
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
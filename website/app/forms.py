@@ -7,7 +7,7 @@ from wtforms.validators import (
     EqualTo, 
     ValidationError
 )
-from app.models import User
+from app import availability_index
 
 class LoginForm(FlaskForm):
     """User login form."""
@@ -91,16 +91,23 @@ class RegistrationForm(FlaskForm):
     
     submit = SubmitField('Register')
     
+    def _availability(self):
+        """Look up username and email availability once per form."""
+        if not hasattr(self, '_availability_result'):
+            self._availability_result = availability_index.check(
+                username=self.username.data or '',
+                email=self.email.data or ''
+            )
+        return self._availability_result
+    
     def validate_username(self, username):
         """Check if username is already taken."""
-        user = User.get_by_username(username.data)
-        if user:
+        if not self._availability()['username']:
             raise ValidationError('Username already taken. Please choose a different one.')
     
     def validate_email(self, email):
         """Check if email is already registered."""
-        user = User.get_by_email(email.data)
-        if user:
+        if not self._availability()['email']:
             raise ValidationError('Email already registered. Please use a different email address.')
 
 class ChangePasswordForm(FlaskForm):
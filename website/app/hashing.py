@@ -0,0 +1,202 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app, has_app_context
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    generate_password_hash,
+    check_password_hash
+)
+
+
+class HashingBusyError(Exception):
+    """Raised when too many password hashing jobs are already in flight."""
+
+
+class InlineHashingBackend:
+    """Run hashing on the calling thread."""
+
+    def run(self, func, *args):
+        return func(*args)
+
+    def map(self, func, *iterables, chunksize=1):
+        return map(func, *iterables)
+
+    def shutdown(self):
+        pass
+
+
+class ProcessPoolHashingBackend:
+    """Run hashing on a pool of worker processes, created on first use.
+
+    A pool that breaks because a worker died (OOM kill, segfault) is
+    replaced, and the call is retried once on the new pool.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Forking a threaded server is unsafe; forkserver children
+                    # only need to import werkzeug.security.
+                    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(method)
+                    )
+        return self._executor
+
+    def _discard(self, executor):
+        """Drop a broken executor, unless another thread already replaced it."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, operation):
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return operation(executor)
+            except BrokenProcessPool:
+                self._discard(executor)
+                if attempt:
+                    raise
+
+    def run(self, func, *args):
+        return self._call(lambda executor: executor.submit(func, *args).result())
+
+    def map(self, func, *iterables, chunksize=1):
+        # Consumed here, so a pool that breaks part-way is retried as a whole
+        return self._call(lambda executor: list(executor.map(func, *iterables, chunksize=chunksize)))
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+BACKENDS = {
+    'inline': lambda config: InlineHashingBackend(),
+    'process': lambda config: ProcessPoolHashingBackend(config['PASSWORD_HASH_WORKERS']),
+}
+
+
+def normalize_method(method):
+    """Expand a werkzeug hash method to include its default cost parameters."""
+    parts = method.split(':')
+    if parts[0] == 'pbkdf2':
+        if len(parts) == 1:
+            parts.append('sha256')
+        if len(parts) == 2:
+            parts.append(str(DEFAULT_PBKDF2_ITERATIONS))
+    elif parts[0] == 'scrypt' and len(parts) == 1:
+        parts.extend(['32768', '8', '1'])
+    return ':'.join(parts)
+
+
+class _HashingState:
+    """Per-application hashing backend and admission control."""
+
+    def __init__(self, config):
+        self.config = config
+        self._backend = None
+        self._slots = None
+        self._lock = threading.Lock()
+        # Callables receiving the duration of each hashing call
+        self.observers = []
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._slots = threading.BoundedSemaphore(self.config['PASSWORD_HASH_MAX_PENDING'])
+                    self._backend = BACKENDS[self.config['PASSWORD_HASH_BACKEND']](self.config)
+        return self._backend
+
+    def run(self, func, *args):
+        backend = self.backend
+        # Fail fast instead of queueing behind a saturated pool.
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusyError('Too many password hashing requests in flight.')
+        start = time.perf_counter() if self.observers else None
+        try:
+            return backend.run(func, *args)
+        finally:
+            self._slots.release()
+            if start is not None:
+                elapsed = time.perf_counter() - start
+                for observer in self.observers:
+                    observer(elapsed)
+
+
+class PasswordHasher:
+    """Flask extension that hashes and verifies passwords off the request thread."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+        app.config.setdefault('PASSWORD_HASH_BACKEND', 'process')
+        app.config.setdefault('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+        app.config.setdefault('PASSWORD_HASH_MAX_PENDING', 64)
+        app.extensions['password_hasher'] = _HashingState(app.config)
+
+    def _state(self):
+        if has_app_context():
+            return current_app.extensions.get('password_hasher')
+        return None
+
+    @property
+    def method(self):
+        state = self._state()
+        return state.config['PASSWORD_HASH_METHOD'] if state else 'pbkdf2:sha256'
+
+    def hash(self, password):
+        """Return a salted hash of password using the configured method."""
+        state = self._state()
+        if state is None:
+            return generate_password_hash(password, method=self.method)
+        return state.run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords):
+        """Hash a batch of passwords across the backend, preserving order.
+
+        Meant for offline jobs such as bulk imports, so it bypasses the
+        in-flight limit that protects request threads.
+        """
+        state = self._state()
+        method = self.method
+        if state is None:
+            return [generate_password_hash(password, method=method) for password in passwords]
+        workers = state.config['PASSWORD_HASH_WORKERS']
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(state.backend.map(
+            generate_password_hash, passwords, [method] * len(passwords), chunksize=chunksize
+        ))
+
+    def verify(self, pwhash, password):
+        """Return True if password matches pwhash."""
+        state = self._state()
+        if state is None:
+            return check_password_hash(pwhash, password)
+        return state.run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """Return True if pwhash was made with a different method or cost."""
+        stored_method = pwhash.split('$', 1)[0]
+        return normalize_method(stored_method) != normalize_method(self.method)
@@ -0,0 +1,183 @@
+import threading
+import time
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self.lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def render(self, name, labels=''):
+        with self.lock:
+            counts, total, count = list(self.counts), self.total, self.count
+        sep = ',' if labels else ''
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {count}')
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {total}')
+        lines.append(f'{name}_count{suffix} {count}')
+        return lines
+
+
+class _Metrics:
+    """Per-application metric registry."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.statements = {}
+        self.db_time = {}
+        self.hashing = Histogram(LATENCY_BUCKETS)
+
+    def _histogram(self, family, key, buckets):
+        histogram = family.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = family.setdefault(key, Histogram(buckets))
+        return histogram
+
+    def observe_request(self, endpoint, method, status, duration, statements, db_time):
+        self._histogram(self.latency, (endpoint, method, status), LATENCY_BUCKETS).observe(duration)
+        self._histogram(self.statements, endpoint, STATEMENT_BUCKETS).observe(statements)
+        self._histogram(self.db_time, endpoint, LATENCY_BUCKETS).observe(db_time)
+
+
+class Instrumentation:
+    """Opt-in request timing and SQL instrumentation (METRICS_ENABLED).
+    
+    Records per-endpoint latency, SQL statement count, database time and
+    password hashing time. Exposes them as Prometheus text at
+    METRICS_ENDPOINT and in a Server-Timing response header. When
+    disabled, no hooks are installed.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', False)
+        app.config.setdefault('METRICS_ENDPOINT', '/metrics')
+        app.config.setdefault('SERVER_TIMING_HEADER', True)
+        if not app.config['METRICS_ENABLED']:
+            return
+        metrics = _Metrics()
+        app.extensions['instrumentation'] = metrics
+
+        from app import db
+        with app.app_context():
+            engine = db.engine
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def start_statement(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def end_statement(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['query_start'].pop()
+            if has_request_context() and '_timing' in g:
+                g._timing['statements'] += 1
+                g._timing['db'] += elapsed
+
+        def observe_hashing(elapsed):
+            metrics.hashing.observe(elapsed)
+            if has_request_context() and '_timing' in g:
+                g._timing['hash'] += elapsed
+
+        hashing = app.extensions.get('password_hasher')
+        if hashing is not None:
+            hashing.observers.append(observe_hashing)
+
+        @app.before_request
+        def start_timer():
+            g._timing = {'start': time.perf_counter(), 'statements': 0, 'db': 0.0, 'hash': 0.0}
+
+        @app.after_request
+        def record_request(response):
+            timing = g.pop('_timing', None)
+            if timing is None:
+                return response
+            total = time.perf_counter() - timing['start']
+            endpoint = request.endpoint or 'unmatched'
+            metrics.observe_request(endpoint, request.method, response.status_code,
+                                    total, timing['statements'], timing['db'])
+            if app.config['SERVER_TIMING_HEADER']:
+                response.headers['Server-Timing'] = (
+                    f'db;dur={timing["db"] * 1000:.2f};desc="{timing["statements"]} queries", '
+                    f'hash;dur={timing["hash"] * 1000:.2f}, '
+                    f'total;dur={total * 1000:.2f}'
+                )
+            return response
+
+        app.add_url_rule(app.config['METRICS_ENDPOINT'], 'metrics',
+                         lambda: Response(render_metrics(app), mimetype='text/plain; version=0.0.4'))
+
+
+def render_metrics(app):
+    """Render the app's metrics in the Prometheus text exposition format."""
+    metrics = app.extensions['instrumentation']
+    lines = [
+        '# HELP http_request_duration_seconds Request latency by endpoint.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (endpoint, method, status), histogram in sorted(metrics.latency.items()):
+        lines += histogram.render('http_request_duration_seconds',
+                                  f'endpoint="{endpoint}",method="{method}",status="{status}"')
+    lines += [
+        '# HELP http_request_sql_statements SQL statements per request.',
+        '# TYPE http_request_sql_statements histogram',
+    ]
+    for endpoint, histogram in sorted(metrics.statements.items()):
+        lines += histogram.render('http_request_sql_statements', f'endpoint="{endpoint}"')
+    lines += [
+        '# HELP http_request_db_seconds Time spent in SQL per request.',
+        '# TYPE http_request_db_seconds histogram',
+    ]
+    for endpoint, histogram in sorted(metrics.db_time.items()):
+        lines += histogram.render('http_request_db_seconds', f'endpoint="{endpoint}"')
+    lines += [
+        '# HELP password_hash_seconds Time spent hashing or verifying passwords.',
+        '# TYPE password_hash_seconds histogram',
+    ]
+    lines += metrics.hashing.render('password_hash_seconds')
+
+    user_cache = app.extensions.get('user_cache')
+    if user_cache is not None:
+        stats = user_cache.stats()
+        lines += [
+            '# HELP user_cache_events_total User snapshot cache events.',
+            '# TYPE user_cache_events_total counter',
+        ]
+        lines += [f'user_cache_events_total{{event="{name}"}} {value}'
+                  for name, value in sorted(stats.items()) if name != 'size']
+        lines += [
+            '# HELP user_cache_size Cached user snapshots.',
+            '# TYPE user_cache_size gauge',
+            f'user_cache_size {stats["size"]}',
+        ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,217 @@
+"""Durable background jobs kept in the app's database, run by `flask worker`.
+
+enqueue() inserts a row into the jobs table. Workers claim a batch of due
+jobs with a single UPDATE ... RETURNING, so any number of worker threads
+and processes can share the table without running a job twice at the
+same time. A job that raises is retried with exponential backoff until
+it runs out of attempts, then kept as 'failed' with its traceback. A
+worker that dies mid-batch loses its claim once JOBS_LEASE seconds pass,
+and its jobs run again, so tasks should be safe to repeat. Finished jobs
+are deleted.
+
+    @job_queue.task()
+    def send_welcome_email(user_id): ...
+
+    job_queue.enqueue(send_welcome_email, user_id=user.id)
+"""
+
+import json
+import os
+import random
+import signal
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, delete, insert, select, update
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FAILED = 'failed'
+
+# name -> function; tasks are plain functions, registered once per process
+TASKS = {}
+
+
+class JobQueue:
+    """Flask extension for enqueueing jobs and registering the tasks that run them."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('JOBS_BATCH_SIZE', 10)
+        app.config.setdefault('JOBS_POLL_INTERVAL', 1.0)
+        app.config.setdefault('JOBS_MAX_ATTEMPTS', 5)
+        app.config.setdefault('JOBS_RETRY_BACKOFF', 5.0)
+        app.config.setdefault('JOBS_RETRY_MAX_DELAY', 3600.0)
+        app.config.setdefault('JOBS_LEASE', 300.0)
+        app.extensions['job_queue'] = self
+
+    def task(self, name=None, max_attempts=None):
+        """Register a function as a task; its keyword arguments must be JSON-serializable."""
+        def decorator(func):
+            func.job_name = name or func.__name__
+            func.max_attempts = max_attempts
+            TASKS[func.job_name] = func
+            return func
+        return decorator
+
+    def enqueue(self, task, delay=0, **kwargs):
+        """Queue task(**kwargs) to run after delay seconds, commit, and return the job id."""
+        from flask import current_app
+        from app import db
+        from app.models import Job
+        name = getattr(task, 'job_name', task)
+        if name not in TASKS:
+            raise KeyError(f'Unknown task {name!r}')
+        max_attempts = TASKS[name].max_attempts or current_app.config['JOBS_MAX_ATTEMPTS']
+        result = db.session.execute(insert(Job.__table__).values(
+            task=name,
+            payload=json.dumps(kwargs, separators=(',', ':')),
+            max_attempts=max_attempts,
+            run_at=datetime.utcnow() + timedelta(seconds=delay),
+        ))
+        db.session.commit()
+        return result.inserted_primary_key[0]
+
+
+def retry_delay(config, attempts):
+    """Seconds before retry number `attempts`: exponential, capped, with jitter."""
+    delay = min(config['JOBS_RETRY_MAX_DELAY'], config['JOBS_RETRY_BACKOFF'] * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class Worker:
+    """Claims due jobs in batches and runs them, until stopped."""
+
+    def __init__(self, app, name=None, batch_size=None):
+        self.app = app
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.batch_size = batch_size or app.config['JOBS_BATCH_SIZE']
+        self.processed = 0
+        self.failed = 0
+
+    def claim(self):
+        """Mark up to batch_size due jobs as ours and return them."""
+        from app import db
+        from app.models import Job
+        jobs = Job.__table__
+        now = datetime.utcnow()
+        due = (select(jobs.c.id)
+               .where(jobs.c.status == QUEUED, jobs.c.run_at <= now)
+               .order_by(jobs.c.run_at, jobs.c.id)
+               .limit(self.batch_size)
+               .with_for_update(skip_locked=True))
+        statement = (update(jobs)
+                     .where(jobs.c.id.in_(due.scalar_subquery()))
+                     .values(status=RUNNING, claimed_by=self.name, claimed_at=now,
+                             attempts=jobs.c.attempts + 1)
+                     .returning(jobs.c.id, jobs.c.task, jobs.c.payload,
+                                jobs.c.attempts, jobs.c.max_attempts))
+        with db.engine.begin() as connection:
+            return connection.execute(statement).all()
+
+    def requeue_expired(self):
+        """Release jobs whose worker has held them longer than JOBS_LEASE."""
+        from app import db
+        from app.models import Job
+        jobs = Job.__table__
+        cutoff = datetime.utcnow() - timedelta(seconds=self.app.config['JOBS_LEASE'])
+        with db.engine.begin() as connection:
+            return connection.execute(
+                update(jobs)
+                .where(jobs.c.status == RUNNING, jobs.c.claimed_at < cutoff)
+                .values(status=QUEUED, claimed_by=None, claimed_at=None)
+            ).rowcount
+
+    def _execute(self, job):
+        """Run one job; return None on success or the formatted exception."""
+        try:
+            if job.task not in TASKS:
+                raise KeyError(f'Unknown task {job.task!r}')
+            with self.app.app_context():
+                TASKS[job.task](**json.loads(job.payload))
+            return None
+        except Exception:
+            return traceback.format_exc()
+
+    def _finish(self, results):
+        """Record a batch's outcomes in one transaction."""
+        from app import db
+        from app.models import Job
+        jobs = Job.__table__
+        done, retries, failures = [], [], []
+        now = datetime.utcnow()
+        for job, error in results:
+            if error is None:
+                done.append(job.id)
+            elif job.attempts < job.max_attempts:
+                delay = retry_delay(self.app.config, job.attempts)
+                retries.append({'job_id': job.id, 'error': error, 'retry_at': now + timedelta(seconds=delay)})
+            else:
+                failures.append({'job_id': job.id, 'error': error})
+        release = {'claimed_by': None, 'claimed_at': None, 'last_error': bindparam('error')}
+        with db.engine.begin() as connection:
+            if done:
+                connection.execute(delete(jobs).where(jobs.c.id.in_(done)))
+            if retries:
+                connection.execute(update(jobs).where(jobs.c.id == bindparam('job_id'))
+                                   .values(status=QUEUED, run_at=bindparam('retry_at'), **release), retries)
+            if failures:
+                connection.execute(update(jobs).where(jobs.c.id == bindparam('job_id'))
+                                   .values(status=FAILED, **release), failures)
+        self.processed += len(done)
+        self.failed += len(failures)
+
+    def run_batch(self):
+        """Claim and run one batch; return how many jobs it held."""
+        with self.app.app_context():
+            batch = self.claim()
+        if batch:
+            results = [(job, self._execute(job)) for job in batch]
+            with self.app.app_context():
+                self._finish(results)
+        return len(batch)
+
+    def run(self, stop=None, burst=False):
+        """Process jobs until stop is set, or with burst, until none are due."""
+        stop = stop or threading.Event()
+        poll_interval = self.app.config['JOBS_POLL_INTERVAL']
+        with self.app.app_context():
+            self.requeue_expired()
+        while not stop.is_set():
+            if self.run_batch():
+                continue
+            if burst:
+                break
+            stop.wait(poll_interval)
+            with self.app.app_context():
+                self.requeue_expired()
+        return self.processed
+
+
+def run_workers(app, concurrency=1, batch_size=None, burst=False, stop=None):
+    """Run concurrency workers on threads of this process and return them once they stop.
+
+    SIGTERM and Ctrl-C let each worker finish and record its current batch.
+    """
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    prefix = f'{socket.gethostname()}:{os.getpid()}'
+    workers = [Worker(app, f'{prefix}:{n}', batch_size) for n in range(concurrency)]
+    threads = [threading.Thread(target=worker.run, args=(stop, burst), name=f'job-worker-{n}', daemon=True)
+               for n, worker in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return workers
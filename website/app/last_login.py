@@ -0,0 +1,139 @@
+import atexit
+import threading
+from collections import Counter
+from sqlalchemy import bindparam
+from app import stats
+
+
+class _PendingLogins:
+    """Per-application buffer of (user_id, timestamp) pairs awaiting a write.
+
+    Logins per day are buffered alongside, since pending keeps only each
+    user's latest login.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.pending = {}
+        self.logins = Counter()
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    @property
+    def batch_size(self):
+        return self.app.config['LAST_LOGIN_BATCH_SIZE']
+
+    @property
+    def interval(self):
+        return self.app.config['LAST_LOGIN_FLUSH_INTERVAL']
+
+    def record(self, user_id, timestamp):
+        if self.interval <= 0:
+            self._write_in_session({user_id: timestamp}, {timestamp.date(): 1})
+            return
+        with self.lock:
+            self.pending[user_id] = timestamp
+            self.logins[timestamp.date()] += 1
+            full = len(self.pending) >= self.batch_size
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name='last-login-flusher', daemon=True
+                )
+                self.thread.start()
+        if full:
+            self.wake.set()
+
+    def _statement(self):
+        from app.models import User
+        users = User.__table__
+        return (users.update()
+                .where(users.c.id == bindparam('user_id'))
+                .values(last_login=bindparam('timestamp')))
+
+    def _rows(self, pending):
+        return [{'user_id': user_id, 'timestamp': timestamp}
+                for user_id, timestamp in pending.items()]
+
+    def _write_in_session(self, pending, logins):
+        # Synchronous mode: write through the request's session like a plain commit
+        from app import db
+        db.session.execute(self._statement(), self._rows(pending))
+        stats.count_daily(db.session.connection(), stats.LOGINS, logins)
+        db.session.commit()
+
+    def flush(self):
+        """Write all buffered timestamps in one executemany UPDATE, plus the login counts.
+
+        If the write fails the batch goes back into the buffer for the next
+        flush, and the error is raised.
+        """
+        from app import db
+        with self.flush_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+                logins, self.logins = self.logins, Counter()
+            if not pending:
+                return 0
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as connection:
+                        connection.execute(self._statement(), self._rows(pending))
+                        stats.count_daily(connection, stats.LOGINS, logins)
+            except Exception:
+                self._requeue(pending, logins)
+                raise
+            return len(pending)
+
+    def _requeue(self, pending, logins):
+        # Logins recorded since the swap may be newer than the failed batch's
+        with self.lock:
+            for user_id, timestamp in pending.items():
+                if user_id not in self.pending or self.pending[user_id] < timestamp:
+                    self.pending[user_id] = timestamp
+            self.logins.update(logins)
+
+    def _run(self):
+        # Writes happen only on this thread, never while a request holds a
+        # read transaction on the same database.
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.app.logger.warning('Failed to flush last login times, will retry: %s', e)
+
+
+class LastLoginRecorder:
+    """Flask extension that batches last_login writes off the login path.
+
+    Timestamps are flushed by a background thread every
+    LAST_LOGIN_FLUSH_INTERVAL seconds or once LAST_LOGIN_BATCH_SIZE users
+    are pending, and once more when the process exits. An interval of 0
+    writes synchronously.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('LAST_LOGIN_BATCH_SIZE', 100)
+        app.config.setdefault('LAST_LOGIN_FLUSH_INTERVAL', 5.0)
+        state = _PendingLogins(app)
+        app.extensions['last_login_recorder'] = state
+        atexit.register(state.flush)
+
+    def _state(self):
+        from flask import current_app
+        return current_app.extensions['last_login_recorder']
+
+    def record(self, user_id, timestamp):
+        """Buffer a login time until the next flush."""
+        self._state().record(user_id, timestamp)
+
+    def flush(self):
+        """Write buffered login times now and return how many were written."""
+        return self._state().flush()
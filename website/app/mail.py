@@ -0,0 +1,89 @@
+import smtplib
+import threading
+from collections import deque, namedtuple
+from email.message import EmailMessage
+from werkzeug.utils import import_string
+
+Message = namedtuple('Message', 'sender to subject body')
+
+
+class MemorySink:
+    """Keeps the last MAIL_OUTBOX_SIZE messages instead of delivering them, for tests and development."""
+
+    def __init__(self, app):
+        self.outbox = deque(maxlen=app.config['MAIL_OUTBOX_SIZE'])
+        self.lock = threading.Lock()
+        self.logger = app.logger
+
+    def send(self, message):
+        with self.lock:
+            self.outbox.append(message)
+        self.logger.debug('Email to %s: %s', message.to, message.subject)
+
+
+class SMTPSink:
+    """Delivers messages through MAIL_SERVER, one connection per message."""
+
+    def __init__(self, app):
+        self.config = app.config
+
+    def send(self, message):
+        email = EmailMessage()
+        email['From'], email['To'], email['Subject'] = message.sender, message.to, message.subject
+        email.set_content(message.body)
+        with smtplib.SMTP(self.config['MAIL_SERVER'], self.config['MAIL_PORT'], timeout=30) as smtp:
+            if self.config['MAIL_USE_TLS']:
+                smtp.starttls()
+            if self.config['MAIL_USERNAME']:
+                smtp.login(self.config['MAIL_USERNAME'], self.config['MAIL_PASSWORD'])
+            smtp.send_message(email)
+
+
+BACKENDS = {
+    'memory': MemorySink,
+    'smtp': SMTPSink,
+}
+
+
+class Mailer:
+    """Flask extension sending email through a pluggable sink.
+
+    MAIL_BACKEND is 'memory' (recent messages collect in mailer.outbox),
+    'smtp', or an import path of a class taking the app and providing
+    send(message). There is no default, so a deployment can't silently
+    drop its mail.
+    Sending is slow, so call it from a background job, not a request.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MAIL_BACKEND', None)
+        app.config.setdefault('MAIL_OUTBOX_SIZE', 100)
+        app.config.setdefault('MAIL_DEFAULT_SENDER', 'noreply@localhost')
+        app.config.setdefault('MAIL_SERVER', 'localhost')
+        app.config.setdefault('MAIL_PORT', 25)
+        app.config.setdefault('MAIL_USE_TLS', False)
+        app.config.setdefault('MAIL_USERNAME', None)
+        app.config.setdefault('MAIL_PASSWORD', None)
+        backend = app.config['MAIL_BACKEND']
+        if not backend:
+            raise RuntimeError("MAIL_BACKEND is not set; use 'smtp' or, outside production, 'memory'")
+        sink = BACKENDS[backend](app) if backend in BACKENDS else import_string(backend)(app)
+        app.extensions['mailer'] = sink
+
+    def _sink(self):
+        from flask import current_app
+        return current_app.extensions['mailer']
+
+    @property
+    def outbox(self):
+        """Messages kept by the memory sink."""
+        return self._sink().outbox
+
+    def send(self, to, subject, body, sender=None):
+        from flask import current_app
+        sender = sender or current_app.config['MAIL_DEFAULT_SENDER']
+        self._sink().send(Message(sender, to, subject, body))
@@ -1,8 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
-from app import db
+from app import db, hasher, last_login_recorder, user_cache, availability_index
+from app import club_search, stats
 
 class User(UserMixin, db.Model):
     """User model for authentication."""
@@ -14,10 +17,22 @@ class User(UserMixin, db.Model):
     password_hash = db.Column(db.String(200), nullable=False)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
-    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    # Active history keeps the old value around for the stats events
+    is_active = db.column_property(db.Column(db.Boolean, default=True, nullable=False),
+                                   active_history=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     last_login = db.Column(db.DateTime)
     
+    # Never lazy-loaded: use Membership.for_user() so pages stay at a fixed query count
+    memberships = db.relationship('Membership', back_populates='user', lazy='raise_on_sql',
+                                  cascade='all, delete-orphan')
+    
+    # Case-normalized indexes so lookups on lower(...) stay index-only
+    __table_args__ = (
+        db.Index('ix_users_username_lower', db.func.lower(username), unique=True),
+        db.Index('ix_users_email_lower', db.func.lower(email), unique=True),
+    )
+    
     def __init__(self, username, email, password, first_name, last_name):
         """Initialize a new user."""
         self.username = username
@@ -28,20 +43,32 @@ class User(UserMixin, db.Model):
     
     def set_password(self, password):
         """Create hashed password."""
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = hasher.hash(password)
     
     def check_password(self, password):
-        """Check if provided password matches hash."""
-        return check_password_hash(self.password_hash, password)
+        """Check if provided password matches hash, upgrading outdated hashes."""
+        if not hasher.verify(self.password_hash, password):
+            return False
+        if hasher.needs_rehash(self.password_hash):
+            self.password_hash = hasher.hash(password)
+            db.session.commit()
+        return True
     
     def get_full_name(self):
         """Return user's full name."""
         return f"{self.first_name} {self.last_name}"
     
     def update_last_login(self):
-        """Update last login timestamp."""
-        self.last_login = datetime.utcnow()
-        db.session.commit()
+        """Update last login timestamp.
+        
+        The write is buffered and batched by the last login recorder, so
+        the attribute is set without marking the session dirty.
+        """
+        now = datetime.utcnow()
+        set_committed_value(self, 'last_login', now)
+        last_login_recorder.record(self.id, now)
+        # The database lags behind until the next flush, so cache this copy
+        user_cache.put(self)
     
     def is_authenticated(self):
         """Return True if user is authenticated."""
@@ -70,9 +97,312 @@ class User(UserMixin, db.Model):
         return User.query.filter_by(email=email).first()
     
     @staticmethod
-    def create_user(username, email, password, first_name, last_name):
-        """Create a new user and save to database."""
+    def find_login_candidate(username_or_email):
+        """Get user by username or email in one query, preferring a username match."""
+        value = username_or_email.lower().strip()
+        username_match = db.func.lower(User.username) == value
+        return (User.query
+                .filter(db.or_(username_match, db.func.lower(User.email) == value))
+                .order_by(db.case((username_match, 0), else_=1))
+                .first())
+    
+    @staticmethod
+    def check_availability(username=None, email=None):
+        """Return which of username/email are still free, using one query.
+        
+        The result maps 'username' and/or 'email' to True when available.
+        """
+        conditions = []
+        result = {}
+        if username is not None:
+            username = username.lower().strip()
+            conditions.append(db.func.lower(User.username) == username)
+            result['username'] = True
+        if email is not None:
+            email = email.lower().strip()
+            conditions.append(db.func.lower(User.email) == email)
+            result['email'] = True
+        if not conditions:
+            return result
+        
+        rows = (db.session.query(db.func.lower(User.username), db.func.lower(User.email))
+                .filter(db.or_(*conditions))
+                .limit(2)
+                .all())
+        for row_username, row_email in rows:
+            if username is not None and row_username == username:
+                result['username'] = False
+            if email is not None and row_email == email:
+                result['email'] = False
+        return result
+    
+    @staticmethod
+    def directory_columns():
+        """Columns shown in user listings; skips password_hash."""
+        return (User.id, User.username, User.email, User.first_name,
+                User.last_name, User.is_active, User.created_at)
+    
+    @staticmethod
+    def directory_page(after_id=None, limit=50):
+        """Get one keyset page of user rows ordered by id.
+        
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        query = db.select(*User.directory_columns()).order_by(User.id).limit(limit + 1)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        rows = db.session.execute(query).all()
+        next_cursor = rows[limit - 1].id if len(rows) > limit else None
+        return rows[:limit], next_cursor
+    
+    @staticmethod
+    def iter_directory(batch_size=1000):
+        """Yield user rows for the whole table with constant memory."""
+        query = (db.select(*User.directory_columns())
+                 .order_by(User.id)
+                 .execution_options(yield_per=batch_size))
+        yield from db.session.execute(query)
+    
+    @staticmethod
+    def create_user(username, email, password, first_name, last_name, commit=True):
+        """Create a new user and save to database.
+        
+        With commit=False the user is only flushed, so it has an id and the
+        caller can add more to the same transaction before committing.
+        """
         user = User(username, email, password, first_name, last_name)
         db.session.add(user)
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
+        # Safe before the commit too: a rolled-back name only costs a lookup
+        availability_index.add(username, email, user.id)
+        return user
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    """Mark a changed user's cached snapshots to be dropped once the change commits.
+    
+    Dropping them during the flush would let another request cache the
+    old row again before the commit.
+    """
+    session = db.object_session(target)
+    session.info.setdefault('invalidated_users', set()).add(target.id)
+
+@event.listens_for(db.session, 'after_commit')
+def drop_invalidated_users(session):
+    """Drop the snapshots of users changed by the committed transaction."""
+    for user_id in session.info.pop('invalidated_users', ()):
+        user_cache.invalidate(user_id)
+
+@event.listens_for(db.session, 'after_rollback')
+def keep_cached_users(session):
+    """The changes never happened, so their snapshots stay valid."""
+    session.info.pop('invalidated_users', None)
+
+@event.listens_for(User, 'after_insert')
+def count_new_user(mapper, connection, target):
+    """Count a signup in the same transaction as the insert."""
+    stats.count_users(connection, total=1, active=1 if target.is_active else 0)
+    stats.count_daily(connection, stats.SIGNUPS, {(target.created_at or datetime.utcnow()).date(): 1})
+
+@event.listens_for(User, 'after_update')
+def count_status_change(mapper, connection, target):
+    """Keep the active user count in step with deactivation and reactivation."""
+    added, _, deleted = db.inspect(target).attrs.is_active.history
+    if added and deleted and bool(added[0]) != bool(deleted[0]):
+        stats.count_users(connection, active=1 if added[0] else -1)
+
+@event.listens_for(User, 'after_delete')
+def count_deleted_user(mapper, connection, target):
+    """Uncount a deleted user."""
+    stats.count_users(connection, total=-1, active=-1 if target.is_active else 0)
+
+class SiteCounter(db.Model):
+    """A site-wide running total, maintained by app.stats."""
+    __tablename__ = 'site_counters'
+    
+    name = db.Column(db.String(30), primary_key=True)
+    value = db.Column(db.Integer, default=0, nullable=False)
+
+class DailyStat(db.Model):
+    """One metric's count for one UTC day, maintained by app.stats."""
+    __tablename__ = 'daily_stats'
+    
+    # Day first, so the last week of every metric is one range scan
+    day = db.Column(db.Date, primary_key=True)
+    metric = db.Column(db.String(30), primary_key=True)
+    value = db.Column(db.Integer, default=0, nullable=False)
+
+class Club(db.Model):
+    """Student organization listed in the club directory."""
+    __tablename__ = 'clubs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), unique=True, nullable=False)
+    category = db.Column(db.String(50), nullable=False, default='', index=True)
+    description = db.Column(db.Text, nullable=False, default='')
+    website = db.Column(db.String(200))
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Maintained by the Membership insert/delete events, so listings never COUNT(*)
+    member_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
+    memberships = db.relationship('Membership', back_populates='club', lazy='raise_on_sql',
+                                  cascade='all, delete-orphan')
+    
+    def to_dict(self):
+        """Return the club's public fields."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'category': self.category,
+            'description': self.description,
+            'website': self.website,
+            'member_count': self.member_count,
+        }
+    
+    def __repr__(self):
+        return f'<Club {self.name}>'
+    
+    @staticmethod
+    def search(query, limit=20):
+        """Get active clubs matching every word of query, best matches first.
+        
+        The last word matches as a prefix, so partial input works for
+        typeahead. SQLite uses the club_search FTS5 index (active clubs
+        only) ranked by bm25; other databases fall back to a LIKE scan over
+        name and description.
+        """
+        match = club_search.match_expression(query)
+        if match is None:
+            return []
+        if db.engine.dialect.name == 'sqlite':
+            statement = db.select(Club).from_statement(db.text(club_search.SEARCH_SQL))
+            return db.session.scalars(statement, {'match': match, 'limit': limit}).all()
+        # autoescape keeps '_' in a word from matching any character
+        conditions = [db.or_(Club.name.icontains(word, autoescape=True),
+                             Club.description.icontains(word, autoescape=True))
+                      for word in club_search.TOKEN_PATTERN.findall(query)]
+        return (Club.query
+                .filter(Club.is_active, *conditions)
+                .order_by(Club.name)
+                .limit(limit)
+                .all())
+
+    @staticmethod
+    def recount_members():
+        """Recompute every club's member_count from the memberships table.
+        
+        Only needed after memberships were changed with bulk SQL, which
+        bypasses the events that keep the counts current.
+        """
+        count = (db.select(db.func.count())
+                 .where(Membership.club_id == Club.id)
+                 .scalar_subquery())
+        db.session.execute(db.update(Club).values(member_count=count))
         db.session.commit()
-        return user
\ No newline at end of file
+
+club_search.install(Club.__table__)
+
+class Membership(db.Model):
+    """A user's membership in a club."""
+    __tablename__ = 'memberships'
+    
+    # The primary key doubles as the index for "clubs of a user"
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('clubs.id', ondelete='CASCADE'), primary_key=True)
+    role = db.Column(db.String(20), default='member', nullable=False)
+    joined_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    user = db.relationship('User', back_populates='memberships', lazy='raise_on_sql')
+    club = db.relationship('Club', back_populates='memberships', lazy='raise_on_sql')
+    
+    # Members of a club in join order
+    __table_args__ = (
+        db.Index('ix_memberships_club_id_joined_at', club_id, joined_at),
+    )
+    
+    def __repr__(self):
+        return f'<Membership user={self.user_id} club={self.club_id} {self.role}>'
+    
+    @staticmethod
+    def for_user(user_id):
+        """Get a user's memberships with their clubs, newest first.
+        
+        Always two queries: the memberships, then their clubs in one
+        batched IN query, however many clubs the user belongs to.
+        """
+        query = (db.select(Membership)
+                 .where(Membership.user_id == user_id)
+                 .options(selectinload(Membership.club))
+                 .order_by(Membership.joined_at.desc()))
+        return db.session.scalars(query).all()
+    
+    @staticmethod
+    def members_of(club_id, limit=50):
+        """Get a club's earliest members with their users, in two queries."""
+        query = (db.select(Membership)
+                 .where(Membership.club_id == club_id)
+                 .options(selectinload(Membership.user))
+                 .order_by(Membership.joined_at)
+                 .limit(limit))
+        return db.session.scalars(query).all()
+    
+    @staticmethod
+    def join(user_id, club_id, role='member'):
+        """Add a user to a club and save to database."""
+        membership = Membership(user_id=user_id, club_id=club_id, role=role)
+        db.session.add(membership)
+        db.session.commit()
+        return membership
+    
+    @staticmethod
+    def leave(user_id, club_id):
+        """Remove a user from a club; returns False if they weren't a member."""
+        membership = db.session.get(Membership, (user_id, club_id))
+        if membership is None:
+            return False
+        db.session.delete(membership)
+        db.session.commit()
+        return True
+
+@event.listens_for(Membership, 'after_insert')
+def increment_member_count(mapper, connection, target):
+    """Count a new member in the same transaction, without reading the club."""
+    connection.execute(db.update(Club)
+                       .where(Club.id == target.club_id)
+                       .values(member_count=Club.member_count + 1))
+
+@event.listens_for(Membership, 'after_delete')
+def decrement_member_count(mapper, connection, target):
+    """Uncount a removed member in the same transaction."""
+    connection.execute(db.update(Club)
+                       .where(Club.id == target.club_id)
+                       .values(member_count=Club.member_count - 1))
+
+class Job(db.Model):
+    """A unit of background work, queued and run by app.jobs."""
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(10), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by = db.Column(db.String(100))
+    claimed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Workers look for the oldest due job of a status
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', status, run_at),
+    )
+    
+    def __repr__(self):
+        return f'<Job {self.id} {self.task} {self.status}>'
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from flask import current_app, g, make_response, request, session
+from flask_login import current_user
+from werkzeug.http import http_date, is_resource_modified
+
+CSRF_PLACEHOLDER = '__render_cache_csrf_token__'
+
+
+class _RenderCacheState:
+    """Per-application cache of rendered page shells."""
+
+    def __init__(self, app):
+        self.app = app
+        self.pages = {}
+        self.lock = threading.Lock()
+        self.version = None
+        self.last_modified = None
+        self.last_modified_header = None
+        self.checked = 0.0
+
+    def _template_mtime(self):
+        latest = 0.0
+        for folder in self.app.jinja_loader.searchpath:
+            for root, dirs, files in os.walk(folder):
+                for name in files:
+                    latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+        return latest
+
+    def current_version(self):
+        """Return a key that changes when templates or relevant config change."""
+        now = time.monotonic()
+        if self.version is None or now - self.checked >= self.app.config['RENDER_CACHE_CHECK_INTERVAL']:
+            mtime = self._template_mtime()
+            settings = tuple(repr(self.app.config.get(name)) for name in self.app.config['RENDER_CACHE_VARY_CONFIG'])
+            version = hashlib.sha1(repr((mtime, settings)).encode()).hexdigest()
+            with self.lock:
+                if version != self.version:
+                    self.pages.clear()
+                self.version = version
+                self.last_modified = datetime.fromtimestamp(int(mtime), timezone.utc)
+                self.last_modified_header = http_date(self.last_modified)
+                self.checked = now
+        return self.version
+
+
+class RenderCache:
+    """Flask extension caching rendered pages for anonymous GET requests.
+
+    A page is rendered once per template version. The request's CSRF token
+    is swapped for a placeholder before storing, and each response gets a
+    fresh token injected. Responses carry a weak ETag (and Last-Modified
+    for pages without a form), so revalidating browsers get a 304. For
+    pages with a token, the ETag includes the session's CSRF secret, so a
+    304 never revives a page whose token no longer validates.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RENDER_CACHE_ENABLED', True)
+        app.config.setdefault('RENDER_CACHE_CHECK_INTERVAL', 2.0)
+        app.config.setdefault('RENDER_CACHE_VARY_CONFIG', ('WTF_CSRF_ENABLED',))
+        app.extensions['render_cache'] = _RenderCacheState(app)
+
+    def cached(self, view):
+        """Decorate a view whose anonymous GET response depends only on templates."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            app = current_app
+            if (not app.config['RENDER_CACHE_ENABLED'] or request.method != 'GET'
+                    or not self._anonymous_without_flashes(app)):
+                return view(*args, **kwargs)
+
+            state = app.extensions['render_cache']
+            version = state.current_version()
+            key = (request.endpoint, version)
+            page = state.pages.get(key)
+            if page is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.mimetype != 'text/html':
+                    return response
+                shell = response.get_data(as_text=True)
+                token = g.get(app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token'))
+                has_token = bool(token) and token in shell
+                if has_token:
+                    shell = shell.replace(token, CSRF_PLACEHOLDER)
+                    page = (shell, None, hashlib.sha1(shell.encode()).hexdigest(), None)
+                else:
+                    # Pages without a token are served from pre-encoded bytes
+                    # with headers built once
+                    etag = hashlib.sha1(shell.encode()).hexdigest()
+                    headers = [('Content-Type', 'text/html; charset=utf-8'),
+                               ('Cache-Control', 'no-cache'), ('Vary', 'Cookie'),
+                               ('Last-Modified', state.last_modified_header),
+                               ('ETag', f'W/"{etag}"')]
+                    page = (shell, shell.encode(), etag, headers)
+                with state.lock:
+                    state.pages[key] = page
+            return self._respond(app, page, state)
+
+        return wrapper
+
+    def _anonymous_without_flashes(self, app):
+        """Return True if the request has no logged-in user and no pending flashes."""
+        cookies = request.cookies
+        if (app.config['SESSION_COOKIE_NAME'] not in cookies
+                and app.config.get('REMEMBER_COOKIE_NAME', 'remember_token') not in cookies):
+            # No session or remember cookie: skip loading the session at all
+            return True
+        return not current_user.is_authenticated and not session.get('_flashes')
+
+    def _respond(self, app, page, state):
+        shell, body, etag, headers = page
+        environ = request.environ
+        if headers is not None:
+            # Token-free page: the common revalidation, an exact If-None-Match,
+            # skips header parsing
+            if environ.get('HTTP_IF_NONE_MATCH') == headers[-1][1]:
+                return app.response_class(status=304, headers=headers[1:])
+            if (('HTTP_IF_NONE_MATCH' in environ or 'HTTP_IF_MODIFIED_SINCE' in environ)
+                    and not is_resource_modified(environ, etag=etag, last_modified=state.last_modified)):
+                return app.response_class(status=304, headers=headers[1:])
+            return app.response_class(body, headers=headers)
+
+        from flask_wtf.csrf import generate_csrf
+        body = shell.replace(CSRF_PLACEHOLDER, generate_csrf()).encode()
+        secret = session.get(app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token'), '')
+        etag = hashlib.sha1(f'{etag}:{secret}'.encode()).hexdigest()
+        # Only the session-bound ETag may revalidate a page with a token
+        headers = {'Cache-Control': 'no-cache', 'Vary': 'Cookie', 'ETag': f'W/"{etag}"'}
+        if ('HTTP_IF_NONE_MATCH' in environ or 'HTTP_IF_MODIFIED_SINCE' in environ) and not is_resource_modified(
+                environ, etag=etag, last_modified=None):
+            return app.response_class(status=304, headers=headers)
+        return app.response_class(body, mimetype='text/html', headers=headers)
@@ -1,19 +1,24 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
-from app.models import User
+from app.models import User, Club, Membership
 from app.forms import LoginForm, RegistrationForm
-from app import db
+from app import db, availability_index, login_throttle, render_cache, stats, job_queue
+from app.tasks import send_welcome_email
+from app.hashing import HashingBusyError
 from datetime import datetime
+import math
 
 # Create Blueprint
 main = Blueprint('main', __name__)
 
 @main.route('/')
+@render_cache.cached
 def index():
     """Home page route."""
     return render_template('index.html')
 
 @main.route('/login', methods=['GET', 'POST'])
+@render_cache.cached
 def login():
     """User login route."""
     # Redirect if user is already authenticated
@@ -26,8 +31,16 @@ def login():
         username_or_email = form.username_or_email.data.lower().strip()
         password = form.password.data
         
-        # Try to find user by username or email
-        user = User.get_by_username(username_or_email) or User.get_by_email(username_or_email)
+        # Turn away brute-force floods before spending any time on hashing
+        retry_after = login_throttle.check_ip(request.remote_addr)
+        if not retry_after:
+            # Find user by username or email in a single query
+            user = User.find_login_candidate(username_or_email)
+            # The username and email of one account share a bucket
+            retry_after = login_throttle.check_account(username_or_email, user.id if user else None)
+        if retry_after:
+            return ('Too many login attempts. Please try again later.', 429,
+                    {'Retry-After': str(math.ceil(retry_after))})
         
         # Check if user exists and password is correct
         if user and user.check_password(password):
@@ -51,6 +64,7 @@ def login():
     return render_template('login.html', form=form)
 
 @main.route('/register', methods=['GET', 'POST'])
+@render_cache.cached
 def register():
     """User registration route."""
     # Redirect if user is already authenticated
@@ -67,8 +81,12 @@ def register():
                 email=form.email.data.lower().strip(),
                 password=form.password.data,
                 first_name=form.first_name.data.strip().title(),
-                last_name=form.last_name.data.strip().title()
+                last_name=form.last_name.data.strip().title(),
+                commit=False
             )
+            # Sent by `flask worker`, so the POST doesn't wait on the mail server.
+            # enqueue commits the user and the job together, so neither exists alone.
+            job_queue.enqueue(send_welcome_email, user_id=user.id)
             
             flash(f'Registration successful! Welcome, {user.first_name}!', 'success')
             
@@ -78,24 +96,48 @@ def register():
             
             return redirect(url_for('main.dashboard'))
             
-        except Exception as e:
+        except HashingBusyError:
+            # Answered with a 503 by the handler registered in create_app
+            db.session.rollback()
+            raise
+        except Exception:
             db.session.rollback()
             flash('Registration failed. Please try again.', 'error')
-            print(f"Registration error: {e}")  # For debugging
+            current_app.logger.exception('Registration failed')
     
     return render_template('register.html', form=form)
 
+@main.route('/availability')
+def availability():
+    """Live username/email availability check for the registration form."""
+    username = request.args.get('username')
+    email = request.args.get('email')
+    if username is None and email is None:
+        return jsonify(error='Pass a username and/or email.'), 400
+    return jsonify(availability_index.check(username=username, email=email))
+
+@main.route('/clubs/search')
+def club_search():
+    """Ranked club search; the last word is a prefix, for typeahead."""
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', 20, type=int), 50)
+    clubs = Club.search(query, limit=max(limit, 1))
+    return jsonify(query=query, results=[club.to_dict() for club in clubs])
+
 @main.route('/dashboard')
 @login_required
 def dashboard():
     """User dashboard - protected route."""
-    return render_template('dashboard.html', user=current_user)
+    memberships = Membership.for_user(current_user.id)
+    return render_template('dashboard.html', user=current_user, memberships=memberships,
+                           site_stats=stats.snapshot())
 
 @main.route('/profile')
 @login_required
 def profile():
     """User profile page."""
-    return render_template('profile.html', user=current_user)
+    memberships = Membership.for_user(current_user.id)
+    return render_template('profile.html', user=current_user, memberships=memberships)
 
 @main.route('/logout')
 @login_required
@@ -109,9 +151,15 @@ def logout():
 @main.route('/users')
 @login_required
 def users():
-    """Display all users - admin functionality."""
-    all_users = User.query.all()
-    return render_template('users.html', users=all_users)
+    """Display all users - admin functionality, paginated by user id."""
+    after = request.args.get('after', type=int)
+    # Clamped once, so the Next link carries the page size actually used
+    per_page = max(1, min(
+        request.args.get('per_page', current_app.config['USERS_PER_PAGE'], type=int),
+        current_app.config['USERS_MAX_PER_PAGE']
+    ))
+    page, next_cursor = User.directory_page(after_id=after, limit=per_page)
+    return render_template('users.html', users=page, next_cursor=next_cursor, per_page=per_page)
 
 # Error handlers
 @main.errorhandler(404)
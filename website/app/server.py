@@ -0,0 +1,59 @@
+import multiprocessing
+
+
+def default_workers():
+    """gunicorn's suggested worker count: two per core, plus one."""
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def serve(app, bind='127.0.0.1:8000', workers=None, threads=1, max_requests=1000,
+          max_requests_jitter=100, timeout=30, graceful_timeout=30, keepalive=5):
+    """Run app under gunicorn's pre-forking server until it is stopped.
+
+    The app is created once in the master, with every template compiled,
+    and inherited by every worker, so imports, templates and the asset
+    build are shared copy-on-write. With threads > 1 each worker uses
+    gunicorn's gthread worker. Workers are replaced gracefully after
+    max_requests (plus jitter) requests.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise RuntimeError('The production server needs gunicorn: pip install gunicorn')
+
+    from app.templating import precompile_templates
+    from app.assets import build_assets
+    precompile_templates(app)
+    app.extensions['assets'] = build_assets(app.static_folder, app.config['ASSETS_BUILD_DIR'])
+
+    def post_fork(server, worker):
+        # Pooled connections must not be shared with the master or siblings
+        from app import db
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+    options = {
+        'bind': bind,
+        'workers': workers or default_workers(),
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'max_requests': max_requests,
+        'max_requests_jitter': max_requests_jitter,
+        'timeout': timeout,
+        'graceful_timeout': graceful_timeout,
+        'keepalive': keepalive,
+        'post_fork': post_fork,
+        'accesslog': None,
+    }
+
+    class PreloadedApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    PreloadedApplication().run()
@@ -0,0 +1,260 @@
+import os
+import pickle
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface, SessionInterface
+from werkzeug.utils import import_string
+
+
+class ServerSideSession(SecureCookieSession):
+    """Session whose data lives in a store, keyed by an opaque cookie id."""
+
+    def __init__(self, initial=None, sid=None, expires=None):
+        super().__init__(initial)
+        self.sid = sid
+        self.expires = expires
+        self.initial_user_id = self.get('_user_id')
+
+
+class MemorySessionStore:
+    """Single-process session store: an LRU of (data, expires) by session id.
+
+    Each write also sweeps up to sweep_batch of the least recently used
+    entries, so expired sessions are dropped without a blocking pass.
+    """
+
+    def __init__(self, max_entries=10000, sweep_batch=100):
+        self.max_entries = max_entries
+        self.sweep_batch = sweep_batch
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            item = self._entries.get(sid)
+            if item is None:
+                return None
+            if item[1] < time.time():
+                del self._entries[sid]
+                return None
+            self._entries.move_to_end(sid)
+            return item
+
+    def set(self, sid, data, expires):
+        with self._lock:
+            self._entries[sid] = (data, expires)
+            self._entries.move_to_end(sid)
+            self._sweep()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, sid, expires):
+        with self._lock:
+            item = self._entries.get(sid)
+            if item is not None:
+                self._entries[sid] = (item[0], expires)
+
+    def delete(self, sid):
+        with self._lock:
+            self._entries.pop(sid, None)
+
+    def _sweep(self):
+        now = time.time()
+        expired = [sid for sid, (data, expires) in islice(self._entries.items(), self.sweep_batch)
+                   if expires < now]
+        for sid in expired:
+            del self._entries[sid]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteSessionStore:
+    """Session store in a SQLite file shared by every worker process.
+
+    Data is pickled; it never leaves the server. Expired rows are deleted
+    sweep_batch at a time, at most once every sweep_interval seconds.
+    """
+
+    def __init__(self, path, sweep_batch=100, sweep_interval=10.0):
+        self.path = path
+        self.sweep_batch = sweep_batch
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'sid TEXT PRIMARY KEY, data BLOB NOT NULL, expires REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_sessions_expires ON sessions (expires)')
+
+    def _connect(self):
+        # Connections are per thread, and never reused across a fork
+        conn, pid = getattr(self._local, 'conn', (None, None))
+        if conn is None or pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=15, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = (conn, os.getpid())
+        return conn
+
+    def get(self, sid):
+        row = self._connect().execute(
+            'SELECT data, expires FROM sessions WHERE sid = ? AND expires >= ?',
+            (sid, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, sid, data, expires):
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)',
+            (sid, pickle.dumps(data, pickle.HIGHEST_PROTOCOL), expires)
+        )
+        now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            conn.execute(
+                'DELETE FROM sessions WHERE rowid IN '
+                '(SELECT rowid FROM sessions WHERE expires < ? LIMIT ?)',
+                (now, self.sweep_batch)
+            )
+
+    def touch(self, sid, expires):
+        self._connect().execute('UPDATE sessions SET expires = ? WHERE sid = ?', (expires, sid))
+
+    def delete(self, sid):
+        self._connect().execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+
+BACKENDS = {
+    'memory': lambda app: MemorySessionStore(
+        app.config['SESSION_MAX_ENTRIES'], app.config['SESSION_SWEEP_BATCH']
+    ),
+    'sqlite': lambda app: SQLiteSessionStore(
+        app.config['SESSION_SQLITE_PATH'], app.config['SESSION_SWEEP_BATCH']
+    ),
+}
+
+
+class SignedCookieSessionInterface(SecureCookieSessionInterface):
+    """Flask's signed cookie session, with the serializer built once per secret key.
+
+    Flask builds it on every request, even ones without a session cookie.
+    """
+
+    def __init__(self):
+        self._serializer = (None, None)
+
+    def get_signing_serializer(self, app):
+        secret_key, serializer = self._serializer
+        if serializer is None or secret_key != app.secret_key:
+            serializer = super().get_signing_serializer(app)
+            self._serializer = (app.secret_key, serializer)
+        return serializer
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Keep session data in a store; the cookie only carries a random id.
+
+    The id is 256 bits from secrets, so there is nothing to sign or verify
+    per request. Unmodified sessions are not written back; their expiry is
+    extended once less than half of the lifetime remains.
+    """
+
+    session_class = ServerSideSession
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            item = self.store.get(sid)
+            if item is not None:
+                data, expires = item
+                return self.session_class(data, sid=sid, expires=expires)
+        return self.session_class()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.sid is not None:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        now = time.time()
+        new_sid = session.sid is None
+        if not new_sid and session.get('_user_id') != session.initial_user_id:
+            # Issue a fresh id on login/logout to prevent session fixation
+            self.store.delete(session.sid)
+            new_sid = True
+        if new_sid:
+            session.sid = secrets.token_urlsafe(32)
+
+        if new_sid or session.modified:
+            self.store.set(session.sid, dict(session), now + lifetime)
+        elif session.expires - now < lifetime / 2:
+            self.store.touch(session.sid, now + lifetime)
+        else:
+            return
+
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+class SessionStore:
+    """Flask extension replacing the signed cookie session with a server-side one.
+
+    SESSION_BACKEND is 'cookie' (Flask's signed cookie), 'memory' for a
+    single process, 'sqlite' for several workers sharing SESSION_SQLITE_PATH,
+    or an import path of a store with get/set/touch/delete.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SESSION_BACKEND', 'cookie')
+        app.config.setdefault('SESSION_MAX_ENTRIES', 10000)
+        app.config.setdefault('SESSION_SWEEP_BATCH', 100)
+        if not app.config.get('SESSION_SQLITE_PATH'):
+            app.config['SESSION_SQLITE_PATH'] = os.path.join(app.instance_path, 'sessions.sqlite3')
+        backend = app.config['SESSION_BACKEND']
+        if backend == 'cookie':
+            app.session_interface = SignedCookieSessionInterface()
+            return
+        if backend in BACKENDS:
+            store = BACKENDS[backend](app)
+        else:
+            store = import_string(backend)()
+        app.session_interface = ServerSideSessionInterface(store)
+        app.extensions['session_store'] = store
@@ -0,0 +1,119 @@
+"""Site statistics kept current as users sign up, log in and change status.
+
+Totals live in site_counters and per-day counts in daily_stats, so
+reading them is a couple of primary-key lookups however many users there
+are. Each change is counted in the same transaction that makes it: the
+User mapper events, the roster importer and the last login recorder all
+call in here. Days are UTC, like the timestamps on users.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import Date, Integer, cast, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+USERS = 'users'
+ACTIVE_USERS = 'active_users'
+SIGNUPS = 'signups'
+LOGINS = 'logins'
+
+_UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def _add(connection, table, keys, rows):
+    """Add each row's value to the stored one, inserting rows that don't exist yet."""
+    rows = [row for row in rows if row['value']]
+    if not rows:
+        return
+    insert = _UPSERT_DIALECTS.get(connection.dialect.name)
+    if insert is not None:
+        statement = insert(table).values(rows)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=keys, set_={'value': table.c.value + statement.excluded.value}
+        ))
+        return
+    for row in rows:
+        match = [table.c[key] == row[key] for key in keys]
+        updated = connection.execute(
+            table.update().where(*match).values(value=table.c.value + row['value'])
+        ).rowcount
+        if not updated:
+            connection.execute(table.insert().values(row))
+
+
+def count_users(connection, total=0, active=0):
+    """Adjust the total and active user counters."""
+    from app.models import SiteCounter
+    _add(connection, SiteCounter.__table__, ['name'],
+         [{'name': USERS, 'value': total}, {'name': ACTIVE_USERS, 'value': active}])
+
+
+def count_daily(connection, metric, per_day):
+    """Add per_day ({date: count}) to metric's daily buckets."""
+    from app.models import DailyStat
+    _add(connection, DailyStat.__table__, ['day', 'metric'],
+         [{'day': day, 'metric': metric, 'value': count} for day, count in per_day.items()])
+
+
+def _day(column, dialect):
+    # SQLite has no DATE type: CAST would give just the year
+    if dialect.name == 'sqlite':
+        return func.date(column, type_=Date)
+    return cast(column, Date)
+
+
+def rebuild(connection):
+    """Recompute the user totals and daily signups from the users table.
+
+    Login counts can't be recomputed, since users only keeps each user's
+    latest login, so existing login buckets are left alone. If there are
+    none yet, they're seeded from last_login as a lower bound.
+    """
+    from app.models import User, SiteCounter, DailyStat
+    users = User.__table__
+    connection.execute(delete(SiteCounter.__table__))
+    connection.execute(delete(DailyStat.__table__).where(DailyStat.metric == SIGNUPS))
+    total, active = connection.execute(
+        select(func.count(), func.coalesce(func.sum(cast(users.c.is_active, Integer)), 0))
+    ).one()
+    count_users(connection, total=total, active=active)
+
+    day = _day(users.c.created_at, connection.dialect)
+    count_daily(connection, SIGNUPS, dict(connection.execute(
+        select(day, func.count()).group_by(day)
+    ).all()))
+
+    has_logins = connection.execute(
+        select(DailyStat.day).where(DailyStat.metric == LOGINS).limit(1)
+    ).first()
+    if not has_logins:
+        day = _day(users.c.last_login, connection.dialect)
+        count_daily(connection, LOGINS, dict(connection.execute(
+            select(day, func.count()).where(users.c.last_login.isnot(None)).group_by(day)
+        ).all()))
+
+
+def snapshot(days=7):
+    """Return current totals and the last `days` days of signups and logins.
+
+    Two indexed queries that read at most 2 + 2 * days rows.
+    """
+    from app import db
+    from app.models import SiteCounter, DailyStat
+    today = datetime.utcnow().date()
+    since = today - timedelta(days=days - 1)
+    counters = dict(db.session.execute(db.select(SiteCounter.name, SiteCounter.value)).all())
+    daily = {day: {SIGNUPS: 0, LOGINS: 0} for day in (since + timedelta(n) for n in range(days))}
+    for day, metric, value in db.session.execute(
+        db.select(DailyStat.day, DailyStat.metric, DailyStat.value).where(DailyStat.day >= since)
+    ):
+        if day in daily and metric in daily[day]:
+            daily[day][metric] = value
+    return {
+        'users': counters.get(USERS, 0),
+        'active_users': counters.get(ACTIVE_USERS, 0),
+        'signups_today': daily[today][SIGNUPS],
+        'logins_today': daily[today][LOGINS],
+        'signups': sum(counts[SIGNUPS] for counts in daily.values()),
+        'logins': sum(counts[LOGINS] for counts in daily.values()),
+        'days': daily,
+    }
@@ -0,0 +1,15 @@
+"""Background tasks run by `flask worker`; queue them with job_queue.enqueue()."""
+
+from flask import render_template
+from app import db, job_queue, mailer
+from app.models import User
+
+
+@job_queue.task()
+def send_welcome_email(user_id):
+    """Email a newly registered user."""
+    user = db.session.get(User, user_id)
+    if user is None or not user.is_active:
+        return
+    mailer.send(user.email, 'Welcome to Berkeley Clubs Portal',
+                render_template('email/welcome.txt', user=user))
@@ -0,0 +1,25 @@
+import os
+import time
+from jinja2 import FileSystemBytecodeCache
+
+
+def configure_bytecode_cache(app):
+    """Persist compiled templates under TEMPLATE_CACHE_DIR across restarts and workers."""
+    if not app.config.get('TEMPLATE_CACHE_DIR'):
+        app.config['TEMPLATE_CACHE_DIR'] = os.path.join(app.instance_path, 'jinja_cache')
+    directory = app.config['TEMPLATE_CACHE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def precompile_templates(app):
+    """Compile every template into the bytecode cache and the in-memory cache.
+
+    Returns (template name, seconds) pairs.
+    """
+    timings = []
+    for name in app.jinja_env.list_templates():
+        start = time.perf_counter()
+        app.jinja_env.get_template(name)
+        timings.append((name, time.perf_counter() - start))
+    return timings
@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from werkzeug.utils import import_string
+
+
+def _take(tokens, updated, capacity, rate, now):
+    """Refill a bucket up to now and take one token.
+
+    Returns (tokens, full_at, retry_after); retry_after is 0 if allowed.
+    """
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        tokens -= 1
+        retry_after = 0.0
+    else:
+        retry_after = (1 - tokens) / rate
+    # Each bucket remembers when it will be full again, since
+    # buckets of different kinds refill at different rates
+    return tokens, now + (capacity - tokens) / rate, retry_after
+
+
+class LocalBucketStore:
+    """In-process token buckets in a bounded LRU.
+
+    Each worker process has its own buckets, so under `serve --workers N`
+    a client gets up to N times the configured attempts. Use
+    SQLiteBucketStore (or another store with the same consume() method)
+    to share them.
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, now=None):
+        """Take one token from key's bucket.
+
+        Returns 0 if allowed, else the seconds until a token is available.
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tokens, updated, _ = self.buckets.pop(key, (capacity, now, now))
+            tokens, full_at, retry_after = _take(tokens, updated, capacity, rate, now)
+            self.buckets[key] = (tokens, now, full_at)
+            self._expire(now)
+            return retry_after
+
+    def _expire(self, now):
+        # Evict a few of the oldest buckets per call instead of sweeping:
+        # a bucket idle long enough to refill is the same as no bucket.
+        for _ in range(2):
+            if not self.buckets:
+                break
+            key, (tokens, updated, full_at) = next(iter(self.buckets.items()))
+            if len(self.buckets) > self.max_entries or now >= full_at:
+                del self.buckets[key]
+            else:
+                break
+
+    def __len__(self):
+        return len(self.buckets)
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file shared by every worker process.
+
+    Each attempt is one short write transaction. Buckets that have
+    refilled are deleted sweep_batch at a time, at most once every
+    sweep_interval seconds.
+    """
+
+    def __init__(self, path, sweep_batch=100, sweep_interval=10.0):
+        self.path = path
+        self.sweep_batch = sweep_batch
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, '
+            'full_at REAL NOT NULL)'
+        )
+
+    def _connect(self):
+        # Connections are per thread, and never reused across a fork
+        conn, pid = getattr(self._local, 'conn', (None, None))
+        if conn is None or pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=15, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = (conn, os.getpid())
+        return conn
+
+    def consume(self, key, capacity, rate, now=None):
+        """Take one token from key's bucket.
+
+        Returns 0 if allowed, else the seconds until a token is available.
+        """
+        # Wall-clock time, since monotonic clocks aren't shared between processes
+        now = time.time() if now is None else now
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row is not None else (capacity, now)
+            tokens, full_at, retry_after = _take(tokens, updated, capacity, rate, now)
+            conn.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated, full_at) '
+                         'VALUES (?, ?, ?, ?)', (key, tokens, now, full_at))
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_interval
+                conn.execute('DELETE FROM buckets WHERE key IN '
+                             '(SELECT key FROM buckets WHERE full_at <= ? LIMIT ?)',
+                             (now, self.sweep_batch))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM buckets').fetchone()[0]
+
+
+STORES = {
+    'local': lambda app: LocalBucketStore(app.config['LOGIN_THROTTLE_MAX_ENTRIES']),
+    'sqlite': lambda app: SQLiteBucketStore(app.config['LOGIN_THROTTLE_SQLITE_PATH']),
+}
+
+
+class LoginThrottle:
+    """Flask extension limiting login attempts per IP and per account.
+
+    Checked before any password hashing: the IP first, for the cost of a
+    dictionary lookup, then the account once the user has been looked up.
+    Exhausted buckets are turned away with a 429.
+
+    LOGIN_THROTTLE_STORE is 'local' (per process), 'sqlite' for several
+    workers sharing LOGIN_THROTTLE_SQLITE_PATH, or an import path of a
+    store with consume().
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('LOGIN_THROTTLE_ENABLED', True)
+        app.config.setdefault('LOGIN_THROTTLE_IP_BURST', 20)
+        app.config.setdefault('LOGIN_THROTTLE_IP_RATE', 1.0)
+        app.config.setdefault('LOGIN_THROTTLE_ACCOUNT_BURST', 10)
+        app.config.setdefault('LOGIN_THROTTLE_ACCOUNT_RATE', 0.2)
+        app.config.setdefault('LOGIN_THROTTLE_MAX_ENTRIES', 100000)
+        app.config.setdefault('LOGIN_THROTTLE_STORE', None)
+        if not app.config.get('LOGIN_THROTTLE_SQLITE_PATH'):
+            app.config['LOGIN_THROTTLE_SQLITE_PATH'] = os.path.join(app.instance_path,
+                                                                    'throttle.sqlite3')
+        store = app.config['LOGIN_THROTTLE_STORE'] or 'local'
+        if store in STORES:
+            store = STORES[store](app)
+        else:
+            store = import_string(store)()
+        app.extensions['login_throttle'] = store
+
+    def check_ip(self, ip):
+        """Consume a login attempt for ip.
+
+        Returns None if allowed, else the seconds to wait before retrying.
+        """
+        return self._consume(f'ip:{ip}', 'IP')
+
+    def check_account(self, identifier, user_id=None):
+        """Consume a login attempt for the account being logged into.
+
+        Attempts on a known account share one bucket keyed by user_id,
+        whether it was named by username or email; unknown identifiers are
+        bucketed by their normalized text. Returns None if allowed, else
+        the seconds to wait before retrying.
+        """
+        if user_id is not None:
+            return self._consume(f'account:id:{user_id}', 'ACCOUNT')
+        return self._consume(f'account:name:{identifier.strip().lower()}', 'ACCOUNT')
+
+    def _consume(self, key, kind):
+        config = current_app.config
+        if not config['LOGIN_THROTTLE_ENABLED']:
+            return None
+        store = current_app.extensions['login_throttle']
+        retry_after = store.consume(key, config[f'LOGIN_THROTTLE_{kind}_BURST'],
+                                    config[f'LOGIN_THROTTLE_{kind}_RATE'])
+        return retry_after or None
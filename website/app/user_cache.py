@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, g, has_app_context, has_request_context, session
+from flask_login import UserMixin, user_logged_out
+from werkzeug.utils import import_string
+from app.sessions import ServerSideSession
+
+# Session key holding (snapshot fields, expiry) for server-side sessions
+SESSION_SNAPSHOT_KEY = '_user_snapshot'
+
+
+class UserSnapshot(UserMixin):
+    """Lightweight, session-independent copy of a User for request handling."""
+
+    FIELDS = ('id', 'username', 'email', 'first_name', 'last_name',
+              'is_active', 'created_at', 'last_login')
+
+    # Shadow UserMixin's property so the stored flag is used
+    is_active = True
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(**{name: getattr(user, name) for name in cls.FIELDS})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def get_full_name(self):
+        """Return user's full name."""
+        return f"{self.first_name} {self.last_name}"
+
+    def get_id(self):
+        """Return user ID as string for Flask-Login."""
+        return str(self.id)
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.username}>'
+
+
+class LocalCacheBackend:
+    """In-memory stand-in for a shared cache (get/set/delete with TTL)."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class _UserCacheState:
+    """Per-application LRU of user snapshots plus hit/miss counters."""
+
+    def __init__(self, config, shared):
+        self.max_size = config['USER_CACHE_SIZE']
+        self.ttl = config['USER_CACHE_TTL']
+        self.shared = shared
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(
+            ('hits', 'shared_hits', 'misses', 'evictions', 'expirations', 'invalidations'), 0
+        )
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self.lock:
+            item = self.entries.get(user_id)
+            if item is not None:
+                snapshot, expires = item
+                if expires >= now:
+                    self.entries.move_to_end(user_id)
+                    self.counters['hits'] += 1
+                    return snapshot
+                del self.entries[user_id]
+                self.counters['expirations'] += 1
+        if self.shared is not None:
+            data = self.shared.get(f'user:{user_id}')
+            if data is not None:
+                snapshot = UserSnapshot(**data)
+                self._store(snapshot)
+                with self.lock:
+                    self.counters['shared_hits'] += 1
+                return snapshot
+        with self.lock:
+            self.counters['misses'] += 1
+        return None
+
+    def _store(self, snapshot):
+        with self.lock:
+            self.entries[snapshot.id] = (snapshot, time.monotonic() + self.ttl)
+            self.entries.move_to_end(snapshot.id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def put(self, snapshot):
+        self._store(snapshot)
+        if self.shared is not None:
+            self.shared.set(f'user:{snapshot.id}', snapshot.to_dict(), self.ttl)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+            self.counters['invalidations'] += 1
+        if self.shared is not None:
+            self.shared.delete(f'user:{user_id}')
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats['size'] = len(self.entries)
+        return stats
+
+
+def _server_side_session():
+    """Return the current session if it is stored server-side, else None."""
+    if has_request_context() and isinstance(session, ServerSideSession):
+        return session
+    return None
+
+
+def _forget_session_snapshot(app, user=None):
+    server_session = _server_side_session()
+    if server_session is not None:
+        server_session.pop(SESSION_SNAPSHOT_KEY, None)
+
+
+class UserCache:
+    """Flask extension caching user snapshots for the Flask-Login user loader.
+
+    Lookups go through a per-request identity map, then the server-side
+    session (when SESSION_BACKEND stores one), then an in-process LRU with a
+    TTL, then an optional shared backend (USER_CACHE_SHARED_BACKEND, an
+    object or import path with get/set/delete). Entries are invalidated
+    when an ORM update or delete of a User row commits; other processes
+    and sessions see the change once their copy expires.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('USER_CACHE_SIZE', 1024)
+        app.config.setdefault('USER_CACHE_TTL', 60)
+        app.config.setdefault('USER_CACHE_SHARED_BACKEND', None)
+        shared = app.config['USER_CACHE_SHARED_BACKEND']
+        if isinstance(shared, str):
+            shared = import_string(shared)()
+        app.extensions['user_cache'] = _UserCacheState(app.config, shared)
+        user_logged_out.connect(_forget_session_snapshot, app)
+
+    def _state(self):
+        if has_app_context():
+            return current_app.extensions.get('user_cache')
+        return None
+
+    def load(self, user_id):
+        """Return a snapshot of the user, or None if it doesn't exist."""
+        identity_map = g.setdefault('_user_snapshots', {})
+        if user_id in identity_map:
+            return identity_map[user_id]
+        server_session = _server_side_session()
+        if server_session is not None:
+            fields, expires = server_session.get(SESSION_SNAPSHOT_KEY, (None, 0))
+            if fields is not None and fields['id'] == user_id and expires >= time.time():
+                snapshot = identity_map[user_id] = UserSnapshot(**fields)
+                return snapshot
+        state = self._state()
+        snapshot = state.get(user_id)
+        if snapshot is None:
+            from app import db
+            from app.models import User
+            user = db.session.get(User, user_id)
+            if user is not None:
+                snapshot = UserSnapshot.from_user(user)
+                state.put(snapshot)
+        identity_map[user_id] = snapshot
+        if snapshot is not None:
+            self._store_in_session(snapshot, state.ttl)
+        return snapshot
+
+    def _store_in_session(self, snapshot, ttl):
+        server_session = _server_side_session()
+        if server_session is not None:
+            server_session[SESSION_SNAPSHOT_KEY] = (snapshot.to_dict(), time.time() + ttl)
+
+    def put(self, user):
+        """Cache a fresh snapshot of user."""
+        state = self._state()
+        if state is not None:
+            snapshot = UserSnapshot.from_user(user)
+            state.put(snapshot)
+            g.setdefault('_user_snapshots', {})[snapshot.id] = snapshot
+            self._store_in_session(snapshot, state.ttl)
+
+    def invalidate(self, user_id):
+        """Drop any cached snapshot of the user."""
+        state = self._state()
+        if state is not None:
+            state.invalidate(user_id)
+            g.get('_user_snapshots', {}).pop(user_id, None)
+            server_session = _server_side_session()
+            if server_session is not None:
+                fields, expires = server_session.get(SESSION_SNAPSHOT_KEY, (None, 0))
+                if fields is not None and fields['id'] == user_id:
+                    del server_session[SESSION_SNAPSHOT_KEY]
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size."""
+        return self._state().stats()
@@ -0,0 +1,109 @@
+"""Compare the /api/v1 JSON endpoints with rendering the equivalent HTML.
+
+Serialization: one page of users encoded by api.dumps (orjson if
+installed), by the standard library json module, and rendered as the
+users.html table. End to end: logged-in clients request the /users HTML
+page and the /api/v1/users page of the same size, with all and with
+sparse fields, revalidate the page with If-None-Match, and fetch three
+resources in one batch request instead of three separate requests.
+
+Usage: python -m benchmarks.bench_api [--users N] [--per-page N] [--requests N] [--clients N]
+"""
+
+import argparse
+import json
+import time
+
+from flask import render_template
+
+from benchmarks.common import make_app, seed_users, run_concurrent
+from app.api import USER_FIELDS, dumps, orjson
+from app.models import User
+
+
+def per_call_us(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def serialization(app, per_page, iterations=300):
+    with app.test_request_context():
+        rows, _ = User.directory_page(limit=per_page)
+        payload = {'data': [dict(zip(USER_FIELDS, row)) for row in rows], 'next_cursor': 'x'}
+        stdlib = lambda: json.dumps(payload, default=str, separators=(',', ':')).encode()  # noqa: E731
+        results = [
+            ('api.dumps' + (' (orjson)' if orjson else ' (json)'), per_call_us(lambda: dumps(payload), iterations),
+             len(dumps(payload))),
+            ('json.dumps', per_call_us(stdlib, iterations), len(stdlib())),
+            ('users.html', per_call_us(lambda: render_template('users.html', users=rows, next_cursor=None,
+                                                               per_page=per_page), iterations),
+             len(render_template('users.html', users=rows, next_cursor=None, per_page=per_page).encode())),
+        ]
+    print(f'serializing {per_page} users:')
+    for name, us, size in results:
+        print(f'  {name:20s} {us:8.1f} us  {size / 1024:6.1f} KiB')
+
+
+def logged_in(app, usernames, count):
+    clients = []
+    for i in range(count):
+        client = app.test_client()
+        client.post('/login', data={'username_or_email': usernames[i], 'password': 'password123'})
+        clients.append(client)
+    return clients
+
+
+def bench(name, clients, task, requests):
+    def run(client_index, i):
+        responses = task(clients[client_index])
+        if not isinstance(responses, list):
+            responses = [responses]
+        for response in responses:
+            if response.status_code not in (200, 304):
+                raise RuntimeError(f'{name} returned {response.status_code}')
+        sizes.append(sum(len(response.data) for response in responses))
+
+    sizes = []
+    result = run_concurrent(run, len(clients), requests)
+    assert not result['errors'], f"{name}: {result['errors']} errors"
+    print(f"  {name:38s} {result['req_per_sec']:8.1f} req/s  p95 {result['p95_ms']:6.2f} ms  "
+          f"{sum(sizes) / len(sizes) / 1024:6.1f} KiB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--per-page', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=4)
+    args = parser.parse_args()
+
+    app = make_app()
+    usernames = seed_users(app, args.users)
+    serialization(app, args.per_page)
+
+    clients = logged_in(app, usernames, args.clients)
+    page = f'/api/v1/users?limit={args.per_page}'
+    etag = clients[0].get(page).headers['ETag']
+    print(f'\nend to end, {args.per_page} users per page, {args.clients} clients:')
+    bench('GET /users (HTML)', clients, lambda c: c.get(f'/users?per_page={args.per_page}'), args.requests)
+    bench('GET /api/v1/users', clients, lambda c: c.get(page), args.requests)
+    bench('GET /api/v1/users?fields=id,username', clients,
+          lambda c: c.get(page + '&fields=id,username'), args.requests)
+    bench('GET /api/v1/users, If-None-Match', clients,
+          lambda c: c.get(page, headers={'If-None-Match': etag}), args.requests)
+
+    paths = ['/api/v1/session', '/api/v1/users/1?fields=username', '/api/v1/clubs?limit=10']
+    print('\nthree resources:')
+    separate = bench('3 separate GETs', clients, lambda c: [c.get(path) for path in paths], args.requests // 3)
+    batched = bench('1 POST /api/v1/batch', clients,
+                    lambda c: c.post('/api/v1/batch', json={'requests': paths}), args.requests // 3)
+    print(f"  batch resolves the set {batched['req_per_sec'] / separate['req_per_sec']:.1f}x faster "
+          f"(before any network round trips)")
+
+
+if __name__ == '__main__':
+    main()
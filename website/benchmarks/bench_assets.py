@@ -0,0 +1,75 @@
+"""Bytes transferred and worker requests per page view, before and after
+asset fingerprinting.
+
+Simulates a browser loading /login, fetching its local CSS/JS and then
+viewing the page again. "Before" serves assets through the default static
+handler, which browsers must revalidate. "After" serves fingerprinted,
+precompressed, immutable assets.
+
+Usage: python -m benchmarks.bench_assets [--views N]
+"""
+
+import argparse
+import re
+
+from benchmarks.common import make_app
+
+ASSET_PATTERN = re.compile(r'(?:href|src)="(/(?:static|assets)/[^"]+)"')
+
+
+class Browser:
+    """Minimal HTTP cache honouring max-age/immutable and ETag revalidation."""
+
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}
+        self.requests = 0
+        self.bytes = 0
+
+    def fetch(self, path):
+        cached = self.cache.get(path)
+        if cached and 'immutable' in cached.headers.get('Cache-Control', ''):
+            return
+        headers = {'Accept-Encoding': 'br, gzip'}
+        if cached and cached.headers.get('ETag'):
+            headers['If-None-Match'] = cached.headers['ETag']
+        response = self.client.get(path, headers=headers)
+        self.requests += 1
+        self.bytes += len(response.get_data())
+        if response.status_code == 200:
+            self.cache[path] = response
+
+    def view(self, page):
+        response = self.client.get(page)
+        self.requests += 1
+        self.bytes += len(response.get_data())
+        for asset in ASSET_PATTERN.findall(response.get_data(as_text=True)):
+            self.fetch(asset)
+
+
+def measure(fingerprinted, views):
+    app = make_app(RENDER_CACHE_ENABLED=False, ASSETS_BUILD_ON_STARTUP=True)
+    if not fingerprinted:
+        app.extensions['assets'] = {}
+    browser = Browser(app.test_client())
+    browser.view('/login')
+    first = (browser.requests, browser.bytes)
+    browser.requests = browser.bytes = 0
+    for _ in range(views):
+        browser.view('/login')
+    return first, (browser.requests / views, browser.bytes / views)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--views', type=int, default=10)
+    args = parser.parse_args()
+
+    for label, fingerprinted in (('before (static)', False), ('after (assets)', True)):
+        (first_requests, first_bytes), (repeat_requests, repeat_bytes) = measure(fingerprinted, args.views)
+        print(f'{label:16s} first view: {first_requests} requests, {first_bytes / 1024:6.1f} KiB  '
+              f'repeat view: {repeat_requests:.0f} requests, {repeat_bytes / 1024:6.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Measure the username/email availability index.
+
+Reports the Bloom filter's false-positive rate and memory next to a plain
+Python set, and compares check latency with a database query.
+
+Usage: python -m benchmarks.bench_availability [--users N] [--probes N]
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.common import make_app, seed_users, count_queries
+from app import availability_index
+from app.availability import BloomFilter
+from app.models import User
+
+
+def set_size(items):
+    return sys.getsizeof(items) + sum(sys.getsizeof(item) for item in items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--probes', type=int, default=20000)
+    args = parser.parse_args()
+
+    names = [f'user{i}' for i in range(args.users)]
+    bloom = BloomFilter(args.users, 0.01)
+    for name in names:
+        bloom.add(name)
+    false_positives = sum(1 for i in range(args.probes) if f'absent{i}' in bloom)
+    print(f'{args.users} names: bloom {bloom.nbytes / 1024:8.1f} KiB, {bloom.hashes} hashes, '
+          f'false-positive rate {false_positives / args.probes:.2%}')
+    print(f'{args.users} names: python set {set_size(set(names)) / 1024:8.1f} KiB')
+
+    app = make_app(AVAILABILITY_INDEX_CAPACITY=args.users)
+    seed_users(app, args.users)
+    with app.test_request_context():
+        start = time.perf_counter()
+        availability_index.check(username='warmup')
+        print(f'\nwarm-up (one streamed query): {(time.perf_counter() - start) * 1000:.1f} ms')
+
+        with count_queries(app) as statements:
+            start = time.perf_counter()
+            for i in range(args.probes):
+                availability_index.check(username=f'new{i}', email=f'new{i}@example.com')
+            index_us = (time.perf_counter() - start) / args.probes * 1e6
+        start = time.perf_counter()
+        for i in range(args.probes):
+            User.check_availability(username=f'new{i}', email=f'new{i}@example.com')
+        db_us = (time.perf_counter() - start) / args.probes * 1e6
+        print(f'index check: {index_us:7.1f} us, {len(statements)} queries for {args.probes} probes')
+        print(f'db check:    {db_us:7.1f} us')
+        print(f'stats: {availability_index.stats()}')
+
+        assert availability_index.check(username='USER7') == {'username': False}
+        User.create_user('freshname', 'fresh@example.com', 'password123', 'Fresh', 'Name')
+        assert availability_index.check(username='freshname') == {'username': False}
+
+    response = app.test_client().get('/availability?username=user1&email=free@example.com')
+    assert response.get_json() == {'username': False, 'email': True}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Club search latency over synthetic clubs: FTS5 vs LIKE '%term%'.
+
+Usage: python -m benchmarks.bench_club_search [--clubs N] [--repeat N]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.common import make_app, percentile
+from app import db
+from app.models import Club
+
+ADJECTIVES = ['Berkeley', 'Golden Bear', 'Undergraduate', 'Graduate', 'Intercollegiate', 'Cal',
+              'Pacific', 'Bay Area', 'Student', 'Global', 'Women in', 'Queer', 'First-Gen', 'Pre-Med']
+TOPICS = ['Robotics', 'Chess', 'Data Science', 'Debate', 'Photography', 'Hiking', 'Entrepreneurship',
+          'Astronomy', 'Film', 'Jazz', 'Consulting', 'Blockchain', 'Poetry', 'Climbing', 'Sailing',
+          'Neuroscience', 'Economics', 'Design', 'Cooking', 'Quantum Computing', 'Tennis', 'Origami']
+KINDS = ['Club', 'Society', 'Association', 'Collective', 'Union', 'Team', 'Guild', 'Network']
+CATEGORIES = ['Academic', 'Arts', 'Cultural', 'Engineering', 'Professional', 'Recreation',
+              'Service', 'Sports', 'Technology', 'Spiritual']
+COMMON = ('members meet weekly to share projects host workshops invite speakers organize trips '
+          'compete in tournaments mentor newcomers volunteer with local schools build community '
+          'explore research collaborate on campus events socials hackathons').split()
+
+QUERIES = ['robotics', 'data science', 'quantum comp', 'hackathons mentor', 'rob', 'ch', 'z',
+           'berkeley film society', 'xylophone']
+
+
+def vocabulary(rng, size=5000):
+    """Common words plus made-up ones, weighted like natural text (Zipf)."""
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = COMMON + [''.join(rng.choices(letters, k=rng.randint(4, 10))) for _ in range(size)]
+    return words, [1 / (rank + 1) for rank in range(len(words))]
+
+
+def seed_clubs(app, count):
+    rng = random.Random(21)
+    words, weights = vocabulary(rng)
+    rows = []
+    for n in range(count):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(TOPICS)} {rng.choice(KINDS)} {n}"
+        rows.append({
+            'name': name,
+            'category': rng.choice(CATEGORIES),
+            'description': ' '.join(rng.choices(words, weights, k=rng.randint(20, 60))),
+            'is_active': n % 50 != 0,
+        })
+    with app.app_context():
+        start = time.perf_counter()
+        db.session.execute(Club.__table__.insert(), rows)
+        db.session.commit()
+        return time.perf_counter() - start
+
+
+def like_search(query, limit=20):
+    conditions = [db.or_(Club.name.like(f'%{word}%'), Club.description.like(f'%{word}%'))
+                  for word in query.split()]
+    return Club.query.filter(Club.is_active, *conditions).order_by(Club.name).limit(limit).all()
+
+
+def measure(search, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = search(query)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return len(results), percentile(timings, 50) * 1000, percentile(timings, 95) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clubs', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--budget', type=float, default=10.0, help="FTS p95 budget in ms.")
+    args = parser.parse_args()
+
+    app = make_app()
+    elapsed = seed_clubs(app, args.clubs)
+    print(f"inserted {args.clubs} clubs (index kept current by triggers) in {elapsed:.1f}s")
+    print(f"{'query':24s} {'FTS5 p50/p95 ms':>18s} {'LIKE p50/p95 ms':>18s}  results")
+    worst = 0.0
+    with app.app_context():
+        for query in QUERIES:
+            count, fts_p50, fts_p95 = measure(Club.search, query, args.repeat)
+            like_count, like_p50, like_p95 = measure(like_search, query, max(args.repeat // 10, 3))
+            worst = max(worst, fts_p95)
+            print(f"{query!r:24s} {fts_p50:8.2f} / {fts_p95:6.2f}   {like_p50:8.2f} / {like_p95:6.2f}  "
+                  f"{count:3d} / {like_count:3d}")
+    client = app.test_client()
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        assert client.get('/clubs/search?q=robo').status_code == 200
+    print(f"GET /clubs/search?q=robo: {(time.perf_counter() - start) / args.repeat * 1000:.2f} ms/request")
+    assert worst < args.budget, f"FTS p95 {worst:.2f} ms is over the {args.budget} ms budget"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Measure /login throughput with inline vs process-pool password hashing.
+
+Usage: python -m benchmarks.bench_hashing [--requests N]
+"""
+
+import argparse
+
+from benchmarks.common import make_app, seed_users, run_concurrent
+
+CLIENTS = (1, 4, 16)
+
+
+def bench_backend(backend, requests):
+    app = make_app(PASSWORD_HASH_BACKEND=backend)
+    usernames = seed_users(app, 16)
+
+    def login(client_index, i):
+        client = app.test_client()
+        response = client.post('/login', data={
+            'username_or_email': usernames[client_index % len(usernames)],
+            'password': 'password123',
+        })
+        if response.status_code != 302:
+            raise RuntimeError(f'login failed with {response.status_code}')
+
+    results = {}
+    for clients in CLIENTS:
+        results[clients] = run_concurrent(login, clients, requests)
+    with app.app_context():
+        app.extensions['password_hasher'].backend.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=64)
+    args = parser.parse_args()
+
+    for backend in ('inline', 'process'):
+        print(f'\n{backend} hashing')
+        for clients, result in bench_backend(backend, args.requests).items():
+            print(f"  {clients:2d} clients: {result['req_per_sec']:7.1f} logins/s  "
+                  f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+                  f"errors {result['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare a create_user loop with the bulk roster import.
+
+Usage: python -m benchmarks.bench_import [--rows N] [--hash-method METHOD]
+
+Use a cheap --hash-method (e.g. pbkdf2:sha256:1000) to isolate the
+database side of the import.
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from benchmarks.common import make_app
+from app import db
+from app.importer import import_users
+from app.models import User
+
+
+def write_roster(path, rows):
+    with open(path, 'w', newline='') as roster:
+        writer = csv.writer(roster)
+        writer.writerow(['username', 'email', 'password', 'first_name', 'last_name'])
+        for i in range(rows):
+            writer.writerow([f'member{i}', f'member{i}@berkeley.edu', f'secret{i:04d}', 'club', f'member{i}'])
+        # A duplicate and an invalid row, which should both be skipped
+        writer.writerow(['member0', 'other@berkeley.edu', 'secret', 'Club', 'Member'])
+        writer.writerow(['x', 'not-an-email', '123', 'C', 'M'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--hash-method', default='pbkdf2:sha256')
+    args = parser.parse_args()
+
+    fd, roster = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    write_roster(roster, args.rows)
+
+    app = make_app(PASSWORD_HASH_METHOD=args.hash_method)
+    with app.app_context():
+        start = time.perf_counter()
+        with open(roster, newline='') as rows:
+            for row in csv.DictReader(rows):
+                if User.check_availability(row['username'], row['email']) == {'username': True, 'email': True}:
+                    User.create_user(row['username'], row['email'], row['password'],
+                                     row['first_name'].title(), row['last_name'].title())
+        elapsed = time.perf_counter() - start
+    print(f'create_user loop: {args.rows / elapsed:8.1f} rows/s')
+
+    for backend in ('inline', 'process'):
+        app = make_app(PASSWORD_HASH_METHOD=args.hash_method, PASSWORD_HASH_BACKEND=backend)
+        with app.app_context():
+            result = import_users(roster, chunk_size=100)
+            assert result.imported == args.rows and result.duplicates == 1 and result.invalid == 1
+            assert db.session.execute(db.select(db.func.count(User.id))).scalar() == args.rows
+            app.extensions['password_hasher'].backend.shutdown()
+        print(f'import ({backend:7s}): {result.rows_per_second:8.1f} rows/s')
+    os.remove(roster)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Measure the overhead of request/SQL instrumentation.
+
+Usage: python -m benchmarks.bench_instrumentation [--requests N]
+"""
+
+import argparse
+import time
+
+from benchmarks.common import make_app, seed_users
+
+
+def bench(requests, enabled):
+    app = make_app(METRICS_ENABLED=enabled)
+    seed_users(app, 1)
+    client = app.test_client()
+    client.post('/login', data={'username_or_email': 'user0', 'password': 'password123'})
+    for path in ('/', '/users'):
+        client.get(path)
+    start = time.perf_counter()
+    for i in range(requests):
+        client.get('/users')
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    disabled = bench(args.requests, False)
+    enabled = bench(args.requests, True)
+    print(f'GET /users, metrics disabled: {disabled:8.1f} us/request')
+    print(f'GET /users, metrics enabled:  {enabled:8.1f} us/request  '
+          f'(+{(enabled - disabled) / disabled * 100:.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Throughput of the job queue with 1 vs 4 workers, as processes and as threads.
+
+Each job simulates a slow side effect, such as an SMTP round trip, with a
+short sleep. Every 10th job fails on its first attempt and is retried
+after a backoff. Workers share one SQLite file in WAL mode and claim
+batches with UPDATE ... RETURNING. The script fails if any job runs twice,
+is lost, or ends up failed.
+
+Usage: python -m benchmarks.bench_jobs [--jobs N] [--task-ms MS] [--batch-size N]
+"""
+
+import argparse
+import multiprocessing
+import threading
+import time
+
+from benchmarks.common import make_app
+from app import db, job_queue
+from app.jobs import Worker, run_workers
+from app.models import Job
+
+SETTINGS = {
+    'SQLITE_PRAGMAS': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 15000},
+    'JOBS_POLL_INTERVAL': 0.02,
+    'JOBS_RETRY_BACKOFF': 0.05,
+}
+
+# Created before forking, so worker processes share them:
+# every run of a job is reported on _runs, and _failed marks jobs that
+# have already failed once
+_runs = None
+_failed = None
+
+
+@job_queue.task(name='bench.side_effect')
+def side_effect(n, sleep_ms):
+    retry = bool(_failed[n])
+    _runs.put((n, retry))
+    time.sleep(sleep_ms / 1000)
+    if n % 10 == 0 and not retry:
+        _failed[n] = 1
+        raise RuntimeError('simulated transient failure')
+
+
+def enqueue(app, count, sleep_ms):
+    with app.app_context():
+        db.session.execute(db.delete(Job))
+        db.session.commit()
+        rows = [{'task': 'bench.side_effect', 'max_attempts': 3,
+                 'payload': f'{{"n":{n},"sleep_ms":{sleep_ms}}}'}
+                for n in range(count)]
+        db.session.execute(Job.__table__.insert(), rows)
+        db.session.commit()
+    for n in range(count):
+        _failed[n] = 0
+
+
+def remaining(app):
+    with app.app_context():
+        return dict(db.session.execute(db.select(Job.status, db.func.count()).group_by(Job.status)).all())
+
+
+def _process_worker(app, stop, batch_size):
+    with app.app_context():
+        db.engine.dispose(close=False)  # don't share the parent's connections
+    Worker(app, batch_size=batch_size).run(stop)
+
+
+def run(app, workers, mode, batch_size):
+    """Run workers until no jobs are left; return elapsed seconds."""
+    if mode == 'process':
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        children = [context.Process(target=_process_worker, args=(app, stop, batch_size)) for _ in range(workers)]
+    else:
+        stop = threading.Event()
+        children = [threading.Thread(target=run_workers, args=(app, workers, batch_size, False, stop))]
+    start = time.perf_counter()
+    for child in children:
+        child.start()
+    while True:
+        time.sleep(0.01)
+        left = remaining(app)
+        if not left.get('queued') and not left.get('running'):
+            break
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for child in children:
+        child.join()
+    assert not left, f'jobs left over: {left}'
+    return elapsed
+
+
+def collect(queue, count):
+    runs = {}
+    deadline = time.monotonic() + 5
+    while len(runs) < count + count // 10 and time.monotonic() < deadline:
+        try:
+            key = queue.get(timeout=0.5)
+        except Exception:
+            continue
+        runs[key] = runs.get(key, 0) + 1
+    return runs
+
+
+def main():
+    global _runs, _failed
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=1000)
+    parser.add_argument('--task-ms', type=float, default=5.0, help='Simulated work per job.')
+    parser.add_argument('--batch-size', type=int, default=10)
+    args = parser.parse_args()
+
+    app = make_app(**SETTINGS)
+    context = multiprocessing.get_context('fork')
+    _runs = context.Queue()
+    _failed = context.RawArray('b', args.jobs)
+    print(f'{args.jobs} jobs of {args.task_ms:.0f} ms, every 10th retried once, batch size {args.batch_size}')
+    results = {}
+    for mode, workers in (('process', 1), ('process', 4), ('thread', 1), ('thread', 4)):
+        enqueue(app, args.jobs, args.task_ms)
+        elapsed = run(app, workers, mode, args.batch_size)
+        runs = collect(_runs, args.jobs)
+        expected = {(n, False) for n in range(args.jobs)} | {(n, True) for n in range(0, args.jobs, 10)}
+        assert set(runs) == expected, f'{len(expected - set(runs))} runs missing'
+        duplicates = sum(1 for count in runs.values() if count > 1)
+        assert not duplicates, f'{duplicates} jobs ran twice'
+        results[mode, workers] = args.jobs / elapsed
+        print(f'{workers} {mode} worker(s): {results[mode, workers]:8.1f} jobs/s')
+    for mode in ('process', 'thread'):
+        print(f'{mode}es, 4 vs 1 workers: {results[mode, 4] / results[mode, 1]:.1f}x')
+
+    for batch_size in (1, args.batch_size):
+        enqueue(app, args.jobs, 0)
+        elapsed = run(app, 1, 'thread', batch_size)
+        collect(_runs, args.jobs)
+        print(f'queue overhead, 1 worker, batch size {batch_size:3d}: {args.jobs / elapsed:8.1f} jobs/s')
+
+
+if __name__ == '__main__':
+    main()
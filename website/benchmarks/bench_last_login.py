@@ -0,0 +1,57 @@
+"""Compare write transactions on the login path with and without batching.
+
+Drives User.update_last_login from concurrent clients against a file-backed
+SQLite database and reports write transactions, lock errors and throughput.
+
+Usage: python -m benchmarks.bench_last_login [--logins N] [--clients N]
+"""
+
+import argparse
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import make_app, seed_users, count_queries, run_concurrent
+from app import db, last_login_recorder
+from app.models import User
+
+
+def bench(interval, logins, clients):
+    app = make_app(LAST_LOGIN_BATCH_SIZE=100, LAST_LOGIN_FLUSH_INTERVAL=interval)
+    users = seed_users(app, 200)
+    lock_errors = []
+
+    def login(client_index, i):
+        with app.app_context():
+            user = User.find_login_candidate(users[i % len(users)])
+            try:
+                user.update_last_login()
+            except OperationalError as e:
+                lock_errors.append(e)
+                db.session.rollback()
+
+    with count_queries(app) as statements:
+        result = run_concurrent(login, clients, logins)
+        with app.app_context():
+            last_login_recorder.flush()
+    writes = sum(1 for statement in statements if statement.startswith('UPDATE'))
+    with app.app_context():
+        stamped = User.query.filter(User.last_login.isnot(None)).count()
+    result.update(write_transactions=writes, lock_errors=len(lock_errors), stamped=stamped)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=16)
+    args = parser.parse_args()
+
+    for name, interval in (('synchronous', 0), ('batched', 1.0)):
+        result = bench(interval, args.logins, args.clients)
+        print(f"{name:11s}: {result['req_per_sec']:8.1f} logins/s  "
+              f"p99 {result['p99_ms']:6.2f} ms  write transactions {result['write_transactions']:5d}  "
+              f"lock errors {result['lock_errors']}  users stamped {result['stamped']}")
+
+
+if __name__ == '__main__':
+    main()
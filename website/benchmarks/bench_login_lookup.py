@@ -0,0 +1,54 @@
+"""Time the single-query login and availability lookups.
+
+Prints the queries each lookup runs; tests/test_login_lookup.py asserts
+that it stays at one.
+
+Usage: python -m benchmarks.bench_login_lookup [--users N] [--iterations N]
+"""
+
+import argparse
+import time
+
+from benchmarks.common import make_app, seed_users, count_queries
+from app.models import User
+
+
+def timed(app, func, iterations):
+    with app.app_context():
+        start = time.perf_counter()
+        for i in range(iterations):
+            func(i)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed_users(app, args.users)
+
+    checks = {
+        'find_login_candidate(username)': lambda: User.find_login_candidate('USER42'),
+        'find_login_candidate(email)': lambda: User.find_login_candidate('user42@example.com'),
+        'find_login_candidate(missing)': lambda: User.find_login_candidate('nobody'),
+        'check_availability': lambda: User.check_availability('user42', 'new@example.com'),
+    }
+    for name, check in checks.items():
+        with app.app_context(), count_queries(app) as statements:
+            check()
+        print(f'{name:34s} queries: {len(statements)}')
+
+    two_step = timed(app, lambda i: User.get_by_username(f'missing{i}@example.com')
+                     or User.get_by_email(f'missing{i}@example.com'), args.iterations)
+    one_step = timed(app, lambda i: User.find_login_candidate(f'missing{i}@example.com'),
+                     args.iterations)
+    print(f'\nmiss lookup, {args.users} users:')
+    print(f'  get_by_username + get_by_email: {two_step:7.1f} us')
+    print(f'  find_login_candidate:           {one_step:7.1f} us')
+
+
+if __name__ == '__main__':
+    main()
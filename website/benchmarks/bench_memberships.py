@@ -0,0 +1,109 @@
+"""Show dashboard and profile query counts, and time loading a user's clubs.
+
+Users with 0 to --max-clubs memberships view /dashboard and /profile and
+the SQL statements per page are printed; tests/test_memberships.py
+asserts they don't change with the membership count. The script then
+times loading a user's clubs with their member counts against the lazy,
+per-club COUNT(*) approach.
+
+Usage: python -m benchmarks.bench_memberships [--max-clubs N] [--members N] [--iterations N]
+"""
+
+import argparse
+import time
+
+from benchmarks.common import make_app, seed_users, count_queries
+from app import db
+from app.models import Club, Membership
+
+SIZES = (0, 1, 10, 100)
+
+
+def seed(app, max_clubs, members):
+    """Create clubs, give user{n} n memberships, and pad clubs with other members."""
+    usernames = seed_users(app, max(members, max(SIZES)) + 1)
+    with app.app_context():
+        db.session.execute(Club.__table__.insert(), [
+            {'name': f'Club {n}', 'category': 'Academic', 'description': ''} for n in range(max_clubs)
+        ])
+        db.session.commit()
+        users = {name: user_id for user_id, name in db.session.execute(db.text('SELECT id, username FROM users'))}
+        clubs = [row[0] for row in db.session.execute(db.text('SELECT id FROM clubs ORDER BY id'))]
+        for size in SIZES:
+            for club_id in clubs[:size]:
+                db.session.add(Membership(user_id=users[f'user{size}'], club_id=club_id))
+        # Bulk rows bypass the counter events; recount_members catches up
+        rows = [{'user_id': users[f'user{n}'], 'club_id': club_id}
+                for club_id in clubs[:max(SIZES)] for n in range(max(SIZES) + 1, members)]
+        db.session.execute(Membership.__table__.insert(), rows)
+        db.session.commit()
+        Club.recount_members()
+    return usernames
+
+
+def page_queries(app, username, path):
+    client = app.test_client()
+    client.post('/login', data={'username_or_email': username, 'password': 'password123'})
+    client.get(path)  # warm the user cache so only the page's own queries remain
+    with count_queries(app) as statements:
+        response = client.get(path)
+    assert response.status_code == 200, f'{path} returned {response.status_code}'
+    return len(statements)
+
+
+def lazy_clubs(user_id):
+    """The N+1 shape: one query per club, plus a COUNT(*) per club."""
+    memberships = db.session.execute(
+        db.select(Membership.club_id, Membership.role).where(Membership.user_id == user_id)
+    ).all()
+    rows = []
+    for club_id, role in memberships:
+        club = db.session.execute(db.select(Club).where(Club.id == club_id)).scalar_one()
+        count = db.session.execute(
+            db.select(db.func.count()).select_from(Membership).where(Membership.club_id == club_id)
+        ).scalar()
+        rows.append((club.name, role, count))
+    return rows
+
+
+def batched_clubs(user_id):
+    return [(m.club.name, m.role, m.club.member_count) for m in Membership.for_user(user_id)]
+
+
+def timed(app, func, user_id, iterations):
+    with app.app_context():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(user_id)
+            db.session.expunge_all()
+        return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max-clubs', type=int, default=200)
+    parser.add_argument('--members', type=int, default=2000, help='Users, most of them filling club rosters.')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed(app, args.max_clubs, args.members)
+
+    print(f"{'memberships':>12s} {'/dashboard':>11s} {'/profile':>9s}   (SQL statements per view)")
+    for size in SIZES:
+        dashboard = page_queries(app, f'user{size}', '/dashboard')
+        profile = page_queries(app, f'user{size}', '/profile')
+        print(f'{size:12d} {dashboard:11d} {profile:9d}')
+
+    with app.app_context():
+        user_id = db.session.execute(db.text("SELECT id FROM users WHERE username = 'user100'")).scalar()
+        assert sorted(batched_clubs(user_id)) == sorted(lazy_clubs(user_id)), 'member counts drifted'
+    lazy = timed(app, lazy_clubs, user_id, args.iterations)
+    batched = timed(app, batched_clubs, user_id, args.iterations)
+    print(f'\nclubs of a user in {max(SIZES)} clubs, ~{args.members - max(SIZES)} members each:')
+    print(f'  lazy loads + COUNT(*) per club: {lazy:7.2f} ms')
+    print(f'  Membership.for_user:            {batched:7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Compare anonymous page throughput with and without the render cache.
+
+req/s goes through the test client, whose own overhead is a large part of
+each request for small pages. "app" is the median time per request spent
+in app.wsgi_app alone, which is what the cache can change.
+
+Usage: python -m benchmarks.bench_render_cache [--requests N] [--clients N]
+"""
+
+import argparse
+import statistics
+import time
+
+from werkzeug.test import EnvironBuilder
+
+from benchmarks.common import make_app, run_concurrent
+
+
+def bench(path, enabled, requests, clients, conditional=False):
+    app = make_app(RENDER_CACHE_ENABLED=enabled, WTF_CSRF_ENABLED=True)
+    sessions = [app.test_client() for _ in range(clients)]
+    etags = [session.get(path).headers.get('ETag') for session in sessions]
+
+    def fetch(client_index, i):
+        headers = {'If-None-Match': etags[client_index]} if conditional and etags[client_index] else {}
+        response = sessions[client_index].get(path, headers=headers)
+        if response.status_code not in (200, 304):
+            raise RuntimeError(f'{path} returned {response.status_code}')
+
+    result = run_concurrent(fetch, clients, requests)
+    assert result['errors'] == 0, f'{path} had {result["errors"]} errors'
+    headers = {'If-None-Match': etags[0]} if conditional and etags[0] else {}
+    result['app_us'] = app_time_us(app, path, headers, requests)
+    return result
+
+
+def app_time_us(app, path, headers, requests, rounds=5):
+    """Median microseconds per request in app.wsgi_app, without a client."""
+    environ = EnvironBuilder(path=path, headers=headers).get_environ()
+
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    def once():
+        body = app.wsgi_app(dict(environ), start_response)
+        for _ in body:
+            pass
+        body.close()
+
+    per_round = max(1, requests // rounds)
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(per_round):
+            once()
+        times.append((time.perf_counter() - start) / per_round * 1e6)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--clients', type=int, default=4)
+    args = parser.parse_args()
+
+    for path in ('/', '/login', '/register'):
+        uncached = bench(path, False, args.requests, args.clients)
+        cached = bench(path, True, args.requests, args.clients)
+        revalidated = bench(path, True, args.requests, args.clients, conditional=True)
+        print(f"{path:10s} uncached {uncached['req_per_sec']:7.1f} req/s {uncached['app_us']:6.0f} us  "
+              f"cached {cached['req_per_sec']:7.1f} req/s {cached['app_us']:6.0f} us  "
+              f"304 {revalidated['req_per_sec']:7.1f} req/s {revalidated['app_us']:6.0f} us  "
+              f"({cached['req_per_sec'] / uncached['req_per_sec']:.1f}x req/s, "
+              f"{uncached['app_us'] / cached['app_us']:.1f}x app)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Throughput of the production server vs. the development server.
+
+Starts `python run.py` (app.run(threaded=True)) and `python run.py serve`
+as subprocesses on a temporary database, both with the production config,
+and drives anonymous GETs of / and /login over keep-alive HTTP
+connections.
+
+Usage: python -m benchmarks.bench_server [--requests N] [--clients N]
+                                          [--workers N] [--threads N]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import run_concurrent
+
+PATHS = ('/', '/login')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'server exited with {process.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('server did not start')
+
+
+def bench(name, command, env, port, requests, clients):
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(port, process)
+        connections = [http.client.HTTPConnection('127.0.0.1', port, timeout=30) for _ in range(clients)]
+        reconnects = []
+
+        def fetch(client_index, i):
+            connection = connections[client_index]
+            try:
+                connection.request('GET', PATHS[i % len(PATHS)])
+                response = connection.getresponse()
+            except ConnectionError:
+                # Keep-alive connection closed by the server (e.g. a recycled
+                # worker); browsers retry idempotent requests the same way.
+                reconnects.append(i)
+                connection.close()
+                connection.request('GET', PATHS[i % len(PATHS)])
+                response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f'GET returned {response.status}')
+
+        run_concurrent(fetch, clients, clients * 10)  # warm up workers
+        del reconnects[:]
+        result = run_concurrent(fetch, clients, requests)
+        for connection in connections:
+            connection.close()
+        print(f"{name:28s} {result['req_per_sec']:8.1f} req/s  p50 {result['p50_ms']:6.2f} ms  "
+              f"p95 {result['p95_ms']:7.2f} ms  reconnects {len(reconnects)}  errors {result['errors']}")
+        return result
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db', prefix='bench-server-')
+    os.close(fd)
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}', FLASK_DEBUG='False', SECRET_KEY='bench')
+    env.pop('FLASK_ENV', None)
+    try:
+        subprocess.run([sys.executable, 'run.py', 'init-db'], env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        port = free_port()
+        # Same config for both servers; serve picks production by default
+        bench('app.run(threaded=True)', [sys.executable, 'run.py'],
+              dict(env, PORT=str(port), FLASK_ENV='production'), port, args.requests, args.clients)
+        port = free_port()
+        serve = [sys.executable, 'run.py', 'serve', '--bind', f'127.0.0.1:{port}',
+                 '--threads', str(args.threads)]
+        if args.workers:
+            serve += ['--workers', str(args.workers)]
+        bench(f'serve (gunicorn, {args.threads} threads)', serve, env, port, args.requests, args.clients)
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Authenticated page views per second with each session backend.
+
+Compares Flask's signed cookie session with the in-memory and SQLite
+server-side stores, and checks that login rotates the session id and
+logout removes the stored session.
+
+Usage: python -m benchmarks.bench_sessions [--requests N] [--clients N]
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import make_app, seed_users, count_queries, run_concurrent
+
+
+def login(app, username):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['visited'] = True
+    before = client.get_cookie(app.config['SESSION_COOKIE_NAME'])
+    response = client.post('/login', data={'username_or_email': username, 'password': 'password123'})
+    if response.status_code != 302:
+        raise RuntimeError(f'login returned {response.status_code}')
+    after = client.get_cookie(app.config['SESSION_COOKIE_NAME'])
+    return client, before, after
+
+
+def bench(name, requests, clients, **settings):
+    app = make_app(**settings)
+    usernames = seed_users(app, clients)
+    logins = [login(app, usernames[i]) for i in range(clients)]
+    sessions = [client for client, before, after in logins]
+    cookie_size = len(logins[0][2].value)
+
+    def view_dashboard(client_index, i):
+        response = sessions[client_index].get('/dashboard')
+        if response.status_code != 200:
+            raise RuntimeError(f'dashboard returned {response.status_code}')
+
+    with count_queries(app) as statements:
+        result = run_concurrent(view_dashboard, clients, requests)
+    print(f"{name:8s} {result['req_per_sec']:8.1f} req/s  p95 {result['p95_ms']:6.2f} ms  "
+          f"{len(statements) / requests:4.2f} queries/request  cookie {cookie_size} bytes")
+    return app, logins
+
+
+def check_lifecycle(app, logins):
+    store = app.extensions['session_store']
+    client, before, after = logins[0]
+    assert before is not None and before.value != after.value, 'session id not rotated on login'
+    assert store.get(before.value) is None, 'pre-login session still stored'
+    client.get('/logout')
+    assert store.get(after.value) is None, 'session still stored after logout'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=8)
+    args = parser.parse_args()
+
+    # The user cache is disabled so the session snapshot is what saves the query
+    bench('cookie', args.requests, args.clients, USER_CACHE_SIZE=0)
+    app, logins = bench('memory', args.requests, args.clients,
+                        USER_CACHE_SIZE=0, SESSION_BACKEND='memory')
+    check_lifecycle(app, logins)
+    fd, path = tempfile.mkstemp(suffix='.sqlite3', prefix='bench-sessions-')
+    os.close(fd)
+    try:
+        app, logins = bench('sqlite', args.requests, args.clients, USER_CACHE_SIZE=0,
+                            SESSION_BACKEND='sqlite', SESSION_SQLITE_PATH=path)
+        check_lifecycle(app, logins)
+    finally:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Stress concurrent SQLite writers with a baseline and the production profile.
+
+Each thread registers users (availability check, INSERT, commit) and then
+updates them, mirroring the register/login write path. Each write
+transaction holds the lock for --hold-ms, like a slow request would.
+
+The baseline has no busy timeout and the default rollback journal, so
+contended writers fail at once with "database is locked". The production
+profile (WAL plus a busy timeout) must queue them instead: the script
+fails unless the baseline hits lock errors and production hits none.
+
+Usage: python -m benchmarks.bench_sqlite_writers [--threads N] [--writes N] [--hold-ms N]
+"""
+
+import argparse
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import make_app, run_concurrent
+from app import db
+from app.models import User
+from config.config import ProductionConfig, engine_options
+
+
+def stress(threads, writes, hold, **settings):
+    app = make_app(**settings)
+    with app.app_context():
+        password_hash = User('seed', 'seed@example.com', 'password123', 'Seed', 'User').password_hash
+    lock_errors = []
+
+    def write(client_index, i):
+        with app.app_context():
+            try:
+                username = f'writer{i}'
+                User.check_availability(username, f'{username}@example.com')
+                # Skip __init__, which would hash a password per write
+                user = User.__mapper__.class_manager.new_instance()
+                db.session.add(user)
+                user.username = username
+                user.email = f'{username}@example.com'
+                user.password_hash = password_hash
+                user.first_name = 'Stress'
+                user.last_name = 'Writer'
+                db.session.flush()
+                time.sleep(hold)
+                db.session.commit()
+                user.first_name = 'Updated'
+                db.session.flush()
+                time.sleep(hold)
+                db.session.commit()
+            except OperationalError as e:
+                db.session.rollback()
+                if 'locked' in str(e):
+                    lock_errors.append(e)
+                raise
+
+    result = run_concurrent(write, threads, threads * writes)
+    with app.app_context():
+        journal_mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+    result.update(lock_errors=len(lock_errors), journal_mode=journal_mode)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--writes', type=int, default=20)
+    parser.add_argument('--hold-ms', type=float, default=1.0,
+                        help='Milliseconds each write transaction holds the lock.')
+    args = parser.parse_args()
+
+    profiles = {
+        'baseline': {
+            'SQLALCHEMY_ENGINE_OPTIONS': {'connect_args': {'timeout': 0}},
+        },
+        'production': {
+            'SQLALCHEMY_ENGINE_OPTIONS': engine_options('sqlite://'),
+            'SQLITE_PRAGMAS': ProductionConfig.SQLITE_PRAGMAS,
+        },
+    }
+    results = {}
+    for name, settings in profiles.items():
+        result = results[name] = stress(args.threads, args.writes, args.hold_ms / 1000, **settings)
+        print(f"{name:10s} journal={result['journal_mode']:8s} {result['req_per_sec']:8.1f} writes/s  "
+              f"p99 {result['p99_ms']:7.1f} ms  lock errors {result['lock_errors']}")
+    for name, result in results.items():
+        other = result['errors'] - result['lock_errors']
+        assert other == 0, f'{name} profile failed {other} writes for reasons other than locking'
+    assert results['baseline']['lock_errors'] > 0, 'baseline hit no lock errors; raise --threads or --hold-ms'
+    assert results['production']['lock_errors'] == 0, 'production profile hit lock errors'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Measure cold create_app() time with and without schema creation.
+
+Each sample runs in a fresh interpreter against an existing file-backed
+SQLite database. "with create_all" reproduces the old factory, which
+reflected the schema on every start.
+
+Usage: python -m benchmarks.bench_startup [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import make_app
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+from app import create_app, db
+app = create_app('production')
+if {create_all}:
+    with app.app_context():
+        db.create_all()
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(database_uri, create_all):
+    env = dict(os.environ, DATABASE_URL=database_uri)
+    output = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(create_all=create_all)],
+        env=env, capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    app = make_app()
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    for label, create_all in (('with create_all', True), ('without create_all', False)):
+        samples = [cold_start(database_uri, create_all) for _ in range(args.runs)]
+        print(f'{label:20s} median {statistics.median(samples):7.1f} ms  '
+              f'min {min(samples):7.1f} ms  max {max(samples):7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
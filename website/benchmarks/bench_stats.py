@@ -0,0 +1,104 @@
+"""Compare reading site statistics from the summary tables with aggregating users.
+
+For each table size, users are spread over the last 90 days of signups
+and logins, the summary tables are rebuilt, and both ways of getting the
+dashboard numbers are timed and checked against each other. The script
+fails if the dashboard's query count grows with the number of users.
+
+Usage: python -m benchmarks.bench_stats [--sizes 10000,100000] [--iterations N]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import make_app, count_queries
+from app import db, stats
+from app.models import User
+
+
+def seed(app, count):
+    now = datetime.utcnow()
+    rng = random.Random(count)
+    rows = []
+    for i in range(count):
+        created = now - timedelta(days=rng.uniform(0, 90))
+        rows.append({
+            'username': f'user{i}',
+            'email': f'user{i}@example.com',
+            'password_hash': 'x',
+            'first_name': 'Bench',
+            'last_name': f'User{i}',
+            'is_active': rng.random() > 0.1,
+            'created_at': created,
+            'last_login': created + (now - created) * rng.random() if rng.random() > 0.3 else None,
+        })
+    with app.app_context():
+        db.session.execute(User.__table__.insert(), rows)
+        db.session.commit()
+        with db.engine.begin() as connection:
+            stats.rebuild(connection)
+
+
+def aggregate(days=7):
+    """The dashboard numbers from scans over users."""
+    since = datetime.combine(datetime.utcnow().date() - timedelta(days=days - 1), datetime.min.time())
+    total, active = db.session.execute(
+        db.select(db.func.count(), db.func.sum(db.cast(User.is_active, db.Integer)))
+    ).one()
+    signups = db.session.execute(
+        db.select(db.func.count()).where(User.created_at >= since)
+    ).scalar()
+    logins = db.session.execute(
+        db.select(db.func.count()).where(User.last_login >= since)
+    ).scalar()
+    return {'users': total, 'active_users': active, 'signups': signups, 'logins': logins}
+
+
+def timed(app, func, iterations):
+    with app.app_context():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1000
+
+
+def dashboard_queries(app):
+    with app.app_context():
+        User.create_user('viewer', 'viewer@example.com', 'password123', 'View', 'Er')
+    client = app.test_client()
+    client.post('/login', data={'username_or_email': 'viewer', 'password': 'password123'})
+    client.get('/dashboard')
+    with count_queries(app) as statements:
+        response = client.get('/dashboard')
+    assert response.status_code == 200, f'dashboard returned {response.status_code}'
+    return len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='10000,100000')
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'users':>8s} {'aggregate ms':>13s} {'summary ms':>11s} {'dashboard queries':>18s}")
+    queries = set()
+    for size in (int(value) for value in args.sizes.split(',')):
+        app = make_app()
+        seed(app, size)
+        with app.app_context():
+            summary, scanned = stats.snapshot(), aggregate()
+            # Only the latest login per user survives, so seeded login counts match the scan
+            for key in ('users', 'active_users', 'signups', 'logins'):
+                assert summary[key] == scanned[key], f'{key}: {summary[key]} != {scanned[key]}'
+        slow = timed(app, aggregate, args.iterations)
+        fast = timed(app, stats.snapshot, args.iterations)
+        count = dashboard_queries(app)
+        queries.add(count)
+        print(f'{size:8d} {slow:13.2f} {fast:11.3f} {count:18d}')
+    assert len(queries) == 1, f'dashboard query count depends on table size: {sorted(queries)}'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""First-request and steady-state latency per page template.
+
+Each page is requested once by a fresh app in three states:
+  compile      empty bytecode cache, templates are parsed and compiled
+  bytecode     templates loaded from the on-disk bytecode cache
+  precompiled  precompile_templates() ran before the first request
+and then repeatedly from the in-memory template cache, with template
+auto-reload on and off. The render cache is disabled throughout.
+
+Usage: python -m benchmarks.bench_templates [--repeat N]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import make_app, seed_users
+from app.templating import precompile_templates
+
+# Pages needing a login come first; the rest are requested after logging out
+PRIVATE_PAGES = (('/dashboard', 'dashboard.html'), ('/users', 'users.html'))
+PUBLIC_PAGES = (('/', 'index.html'), ('/login', 'login.html'), ('/register', 'register.html'))
+
+
+def timed_get(client, path):
+    start = time.perf_counter()
+    response = client.get(path)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f'{path} returned {response.status_code}')
+    return elapsed
+
+
+def fresh_client(cache_dir, precompile=False, **settings):
+    app = make_app(TEMPLATE_CACHE_DIR=cache_dir, RENDER_CACHE_ENABLED=False, **settings)
+    username = seed_users(app, 1)[0]
+    client = app.test_client()
+    client.post('/login', data={'username_or_email': username, 'password': 'password123'})
+    if precompile:
+        precompile_templates(app)
+    return client
+
+
+def each_page(client, measure):
+    timings = {path: measure(path) for path, template in PRIVATE_PAGES}
+    client.get('/logout')
+    timings.update({path: measure(path) for path, template in PUBLIC_PAGES})
+    return timings
+
+
+def first_requests(cache_dir, precompile=False):
+    client = fresh_client(cache_dir, precompile)
+    return each_page(client, lambda path: timed_get(client, path))
+
+
+def steady_state(cache_dir, repeat, auto_reload):
+    client = fresh_client(cache_dir, TEMPLATES_AUTO_RELOAD=auto_reload)
+
+    def measure(path):
+        timed_get(client, path)
+        return min(timed_get(client, path) for _ in range(repeat))
+
+    return each_page(client, measure)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='bench-jinja-')
+    try:
+        results = {
+            'compile': first_requests(cache_dir),
+            'bytecode': first_requests(cache_dir),
+            'precompiled': first_requests(cache_dir, precompile=True),
+            'steady reload': steady_state(cache_dir, args.repeat, True),
+            'steady no-reload': steady_state(cache_dir, args.repeat, False),
+        }
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print(f"{'template':16s}" + ''.join(f'{label:>18s}' for label in results) + '   (ms)')
+    for path, template in PRIVATE_PAGES + PUBLIC_PAGES:
+        print(f'{template:16s}' + ''.join(f'{timings[path] * 1000:18.2f}' for timings in results.values()))
+
+
+if __name__ == '__main__':
+    main()
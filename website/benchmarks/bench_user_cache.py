@@ -0,0 +1,67 @@
+"""Measure authenticated page views with and without the user snapshot cache.
+
+Usage: python -m benchmarks.bench_user_cache [--requests N] [--clients N]
+"""
+
+import argparse
+
+from benchmarks.common import make_app, seed_users, count_queries, run_concurrent
+from app import db, user_cache
+from app.models import User
+
+
+def logged_in_clients(app, usernames, count):
+    clients = []
+    for i in range(count):
+        client = app.test_client()
+        client.post('/login', data={'username_or_email': usernames[i], 'password': 'password123'})
+        clients.append(client)
+    return clients
+
+
+def bench(name, requests, clients, **settings):
+    app = make_app(**settings)
+    usernames = seed_users(app, clients)
+    sessions = logged_in_clients(app, usernames, clients)
+
+    def view_dashboard(client_index, i):
+        response = sessions[client_index].get('/dashboard')
+        if response.status_code != 200:
+            raise RuntimeError(f'dashboard returned {response.status_code}')
+
+    with count_queries(app) as statements:
+        result = run_concurrent(view_dashboard, clients, requests)
+    with app.app_context():
+        stats = user_cache.stats()
+    print(f"{name:22s} {result['req_per_sec']:8.1f} req/s  p95 {result['p95_ms']:6.2f} ms  "
+          f"{len(statements) / requests:4.2f} queries/request  "
+          f"hits {stats['hits'] + stats['shared_hits']} misses {stats['misses']}")
+    return app
+
+
+def check_invalidation(app):
+    with app.app_context():
+        user = User.query.first()
+        user_id = user.id
+        user_cache.put(user)
+        user.is_active = False
+        db.session.commit()
+    with app.test_request_context():
+        assert user_cache.load(user_id).is_active is False, 'stale snapshot after update'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=8)
+    args = parser.parse_args()
+
+    bench('no cache', args.requests, args.clients, USER_CACHE_SIZE=0)
+    app = bench('in-process cache', args.requests, args.clients)
+    bench('shared backend (local)', args.requests, args.clients, USER_CACHE_SIZE=0,
+          USER_CACHE_SHARED_BACKEND='app.user_cache.LocalCacheBackend')
+    check_invalidation(app)
+
+
+if __name__ == '__main__':
+    main()
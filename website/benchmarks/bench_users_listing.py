@@ -0,0 +1,62 @@
+"""Compare full-table and keyset-paginated user listings.
+
+Reports latency and peak Python memory for the /users page and for
+streaming the whole table as the list-users CLI does.
+
+Usage: python -m benchmarks.bench_users_listing [--users N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from flask import render_template
+
+from benchmarks.common import make_app, seed_users
+from app.models import User
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed_users(app, args.users)
+    client = app.test_client()
+    client.post('/login', data={'username_or_email': 'user0', 'password': 'password123'})
+
+    with app.test_request_context():
+        _, ms, mb = measure(lambda: render_template('users.html', users=User.query.all()))
+    print(f'render all ORM users:     {ms:8.1f} ms  peak {mb:7.1f} MB')
+
+    response, ms, mb = measure(lambda: client.get('/users'))
+    assert response.status_code == 200 and b'after=' in response.data
+    print(f'GET /users (first page):  {ms:8.1f} ms  peak {mb:7.1f} MB')
+
+    with app.app_context():
+        last_page_cursor = User.directory_page(limit=args.users - 10)[1]
+    response, ms, mb = measure(lambda: client.get(f'/users?after={last_page_cursor}'))
+    assert response.status_code == 200 and b'after=' not in response.data
+    print(f'GET /users (last page):   {ms:8.1f} ms  peak {mb:7.1f} MB')
+
+    with app.app_context():
+        _, ms, mb = measure(lambda: sum(1 for user in User.query.all()))
+        print(f'list users via query.all: {ms:8.1f} ms  peak {mb:7.1f} MB')
+        count, ms, mb = measure(lambda: sum(1 for row in User.iter_directory()))
+        assert count == args.users
+        print(f'list users via yield_per: {ms:8.1f} ms  peak {mb:7.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
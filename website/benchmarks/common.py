@@ -0,0 +1,134 @@
+"""Shared helpers for the benchmark scripts.
+
+Run benchmarks from the website directory, e.g.
+``python -m benchmarks.bench_hashing``.
+"""
+
+import atexit
+import os
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import create_app, db
+from config.config import config, TestingConfig
+
+
+def make_app(**overrides):
+    """Create a testing app backed by a temporary SQLite file."""
+    fd, path = tempfile.mkstemp(suffix='.db', prefix='bench-')
+    os.close(fd)
+    atexit.register(os.remove, path)
+    settings = {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'}
+    settings.update(overrides)
+    config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), settings)
+    app = create_app('benchmark')
+    with app.app_context():
+        db.create_all()
+    app.benchmark_db_path = path
+    return app
+
+
+def seed_users(app, count, password='password123'):
+    """Insert count users sharing one password hash and return their usernames."""
+    from app.models import User
+    with app.app_context():
+        password_hash = User(
+            'seed', 'seed@example.com', password, 'Seed', 'User'
+        ).password_hash
+        rows = [
+            {
+                'username': f'user{i}',
+                'email': f'user{i}@example.com',
+                'password_hash': password_hash,
+                'first_name': 'Bench',
+                'last_name': f'User{i}',
+                'is_active': True,
+            }
+            for i in range(count)
+        ]
+        db.session.execute(User.__table__.insert(), rows)
+        db.session.commit()
+    return [row['username'] for row in rows]
+
+
+@contextmanager
+def count_queries(app):
+    """Count SQL statements executed on the app's engine inside the block.
+    
+    Yields a list that receives each statement.
+    """
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def run_concurrent(task, clients, total):
+    """Run task(client_index, i) total times across clients threads.
+
+    Returns a dict with throughput and latency percentiles in milliseconds.
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker(index):
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            try:
+                task(index, i)
+            except Exception as e:
+                errors.append(e)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed, errors=len(errors))
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile of a sorted list."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Summarize a list of latencies in seconds."""
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'req_per_sec': len(ordered) / elapsed if elapsed else 0.0,
+        'mean_ms': statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        'p50_ms': percentile(ordered, 50) * 1000,
+        'p95_ms': percentile(ordered, 95) * 1000,
+        'p99_ms': percentile(ordered, 99) * 1000,
+    }
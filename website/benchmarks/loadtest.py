@@ -0,0 +1,161 @@
+"""Load-test the auth app and compare the results with a stored baseline.
+
+Boots the app against a file-backed SQLite database, seeds users and drives
+each workload with concurrent clients. Reports p50/p95/p99 latency, req/s
+and SQL statements per request, and writes the results as JSON.
+
+Usage:
+    python -m benchmarks.loadtest --output results.json
+    python -m benchmarks.loadtest --baseline baseline.json --threshold 0.15
+    python -m benchmarks.loadtest --save-baseline baseline.json
+
+Exits with status 1 if any workload regresses past the threshold.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+
+from benchmarks.common import make_app, seed_users, count_queries, run_concurrent
+
+WORKLOADS = ('index', 'login', 'register', 'dashboard', 'users')
+
+
+def login(app, username):
+    client = app.test_client()
+    response = client.post('/login', data={'username_or_email': username, 'password': 'password123'})
+    if response.status_code != 302:
+        raise RuntimeError(f'login failed with {response.status_code}')
+    return client
+
+
+def build_workloads(app, usernames, clients):
+    """Return {name: task(client_index, i)} for every workload."""
+    sessions = {}
+    sequence = itertools.count()
+
+    def session(client_index):
+        if client_index not in sessions:
+            sessions[client_index] = login(app, usernames[client_index % len(usernames)])
+        return sessions[client_index]
+
+    def get(path):
+        def task(client_index, i):
+            response = session(client_index).get(path)
+            if response.status_code != 200:
+                raise RuntimeError(f'{path} returned {response.status_code}')
+        return task
+
+    def index(client_index, i):
+        if app.test_client().get('/').status_code != 200:
+            raise RuntimeError('index failed')
+
+    def register(client_index, i):
+        n = next(sequence)
+        response = app.test_client().post('/register', data={
+            'first_name': 'Load', 'last_name': 'Test', 'username': f'loadtest{n}',
+            'email': f'loadtest{n}@example.com', 'password': 'password123',
+            'password_confirm': 'password123',
+        })
+        if response.status_code != 302:
+            raise RuntimeError(f'register failed with {response.status_code}')
+
+    # Log every client in up front so session setup isn't measured
+    for client_index in range(clients):
+        session(client_index)
+    return {
+        'index': index,
+        'login': lambda client_index, i: login(app, usernames[i % len(usernames)]),
+        'register': register,
+        'dashboard': get('/dashboard'),
+        'users': get('/users'),
+    }
+
+
+def run(args):
+    app = make_app(PASSWORD_HASH_METHOD=args.hash_method, PASSWORD_HASH_BACKEND=args.hash_backend,
+                   LAST_LOGIN_FLUSH_INTERVAL=5.0)
+    usernames = seed_users(app, args.users)
+    tasks = build_workloads(app, usernames, args.clients)
+
+    results = {}
+    for name in args.workloads:
+        # Warm up templates and caches
+        run_concurrent(tasks[name], 1, min(5, args.requests))
+        with count_queries(app) as statements:
+            result = run_concurrent(tasks[name], args.clients, args.requests)
+        result['sql_per_request'] = len(statements) / max(result['requests'], 1)
+        results[name] = result
+        print(f"{name:10s} {result['req_per_sec']:9.1f} req/s  p50 {result['p50_ms']:7.2f}  "
+              f"p95 {result['p95_ms']:7.2f}  p99 {result['p99_ms']:7.2f} ms  "
+              f"sql/req {result['sql_per_request']:5.2f}  errors {result['errors']}")
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'users': args.users,
+            'clients': args.clients,
+            'requests': args.requests,
+            'hash_method': args.hash_method,
+        },
+        'workloads': results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages versus baseline."""
+    regressions = []
+    for name, current in results['workloads'].items():
+        previous = baseline.get('workloads', {}).get(name)
+        if previous is None:
+            continue
+        if current['req_per_sec'] < previous['req_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {current['req_per_sec']:.1f} req/s vs "
+                               f"baseline {previous['req_per_sec']:.1f}")
+        if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p95 {current['p95_ms']:.2f} ms vs "
+                               f"baseline {previous['p95_ms']:.2f}")
+        if current['sql_per_request'] > previous['sql_per_request'] + 0.01:
+            regressions.append(f"{name}: {current['sql_per_request']:.2f} SQL/request vs "
+                               f"baseline {previous['sql_per_request']:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000, help='users to seed')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=500, help='requests per workload')
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--hash-method', default='pbkdf2:sha256:1000',
+                        help='password hash method; the cheap default keeps hashing from dominating')
+    parser.add_argument('--hash-backend', default='inline', choices=('inline', 'process'))
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against this results JSON')
+    parser.add_argument('--save-baseline', help='write results JSON as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed relative regression (default 0.10)')
+    args = parser.parse_args()
+
+    results = run(args)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print('\nRegressions:')
+            for message in regressions:
+                print(f'  {message}')
+            sys.exit(1)
+        print(f'\nNo regressions beyond {args.threshold:.0%}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,29 +4,149 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+def engine_options(database_uri):
+    """Return SQLAlchemy engine options suited to the database backend."""
+    if database_uri.startswith('sqlite'):
+        # Seconds the driver waits on a locked database before raising
+        return {'connect_args': {'timeout': 15}}
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE') or 10),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or 20),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT') or 30),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE') or 1800),
+        'pool_pre_ping': True,
+    }
+
 class Config:
     """Base configuration class."""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLITE_PRAGMAS = {}
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None
+    
+    # Password hashing runs in a process pool so it doesn't pin request threads
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256'
+    PASSWORD_HASH_BACKEND = os.environ.get('PASSWORD_HASH_BACKEND') or 'process'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING') or 64)
+    
+    # last_login writes are buffered and flushed in batches
+    LAST_LOGIN_BATCH_SIZE = int(os.environ.get('LAST_LOGIN_BATCH_SIZE') or 100)
+    LAST_LOGIN_FLUSH_INTERVAL = float(os.environ.get('LAST_LOGIN_FLUSH_INTERVAL') or 5.0)
+    
+    # Snapshots of logged-in users, so user_loader skips the database
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE') or 1024)
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL') or 60)
+    USER_CACHE_SHARED_BACKEND = os.environ.get('USER_CACHE_SHARED_BACKEND')
+    
+    # In-memory Bloom filters for username/email availability checks
+    AVAILABILITY_INDEX_CAPACITY = int(os.environ.get('AVAILABILITY_INDEX_CAPACITY') or 100000)
+    AVAILABILITY_INDEX_ERROR_RATE = float(os.environ.get('AVAILABILITY_INDEX_ERROR_RATE') or 0.01)
+    AVAILABILITY_INDEX_REFRESH = float(os.environ.get('AVAILABILITY_INDEX_REFRESH') or 1.0)
+    
+    # Login attempts allowed per IP and per account (burst, tokens/second)
+    LOGIN_THROTTLE_ENABLED = os.environ.get('LOGIN_THROTTLE_ENABLED', 'True').lower() == 'true'
+    LOGIN_THROTTLE_IP_BURST = int(os.environ.get('LOGIN_THROTTLE_IP_BURST') or 20)
+    LOGIN_THROTTLE_IP_RATE = float(os.environ.get('LOGIN_THROTTLE_IP_RATE') or 1.0)
+    LOGIN_THROTTLE_ACCOUNT_BURST = int(os.environ.get('LOGIN_THROTTLE_ACCOUNT_BURST') or 10)
+    LOGIN_THROTTLE_ACCOUNT_RATE = float(os.environ.get('LOGIN_THROTTLE_ACCOUNT_RATE') or 0.2)
+    # 'local' (per worker process), 'sqlite' (shared by all workers) or an import path
+    LOGIN_THROTTLE_STORE = os.environ.get('LOGIN_THROTTLE_STORE')
+    LOGIN_THROTTLE_SQLITE_PATH = os.environ.get('LOGIN_THROTTLE_SQLITE_PATH')
+    
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted;
+    # 0 uses the socket address, which behind nginx is the proxy's
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR') or 0)
+    
+    # Rendered anonymous pages (index, login, register) with ETag/304 support
+    RENDER_CACHE_ENABLED = os.environ.get('RENDER_CACHE_ENABLED', 'True').lower() == 'true'
+    RENDER_CACHE_CHECK_INTERVAL = float(os.environ.get('RENDER_CACHE_CHECK_INTERVAL') or 2.0)
+    
+    # Session storage: 'cookie' (signed cookie), 'memory' or 'sqlite'
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND') or 'cookie'
+    SESSION_MAX_ENTRIES = int(os.environ.get('SESSION_MAX_ENTRIES') or 10000)
+    SESSION_SWEEP_BATCH = int(os.environ.get('SESSION_SWEEP_BATCH') or 100)
+    SESSION_SQLITE_PATH = os.environ.get('SESSION_SQLITE_PATH')
+    
+    # Compiled Jinja templates (defaults to instance/jinja_cache)
+    TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR')
+    
+    # Fingerprinted, precompressed static files under /assets, built by
+    # `flask build-assets` (or on startup, by default only in development)
+    ASSETS_BUILD_ON_STARTUP = os.environ.get('ASSETS_BUILD_ON_STARTUP', 'False').lower() == 'true'
+    ASSETS_MAX_AGE = int(os.environ.get('ASSETS_MAX_AGE') or 31536000)
+    
+    # Background jobs in the jobs table, run by `flask worker`
+    JOBS_BATCH_SIZE = int(os.environ.get('JOBS_BATCH_SIZE') or 10)
+    JOBS_POLL_INTERVAL = float(os.environ.get('JOBS_POLL_INTERVAL') or 1.0)
+    JOBS_MAX_ATTEMPTS = int(os.environ.get('JOBS_MAX_ATTEMPTS') or 5)
+    JOBS_RETRY_BACKOFF = float(os.environ.get('JOBS_RETRY_BACKOFF') or 5.0)
+    JOBS_RETRY_MAX_DELAY = float(os.environ.get('JOBS_RETRY_MAX_DELAY') or 3600.0)
+    JOBS_LEASE = float(os.environ.get('JOBS_LEASE') or 300.0)
+    
+    # Outgoing email: 'smtp', or 'memory' (kept in mailer.outbox) in
+    # development and testing; the app refuses to start without one
+    MAIL_BACKEND = os.environ.get('MAIL_BACKEND')
+    MAIL_OUTBOX_SIZE = int(os.environ.get('MAIL_OUTBOX_SIZE') or 100)
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER') or 'noreply@localhost'
+    MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'localhost'
+    MAIL_PORT = int(os.environ.get('MAIL_PORT') or 25)
+    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'False').lower() == 'true'
+    MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
+    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    
+    # /users listing page size
+    USERS_PER_PAGE = int(os.environ.get('USERS_PER_PAGE') or 50)
+    USERS_MAX_PER_PAGE = int(os.environ.get('USERS_MAX_PER_PAGE') or 200)
+    
+    # /api/v1 page sizes and sub-requests per batch
+    API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE') or 50)
+    API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE') or 200)
+    API_BATCH_MAX = int(os.environ.get('API_BATCH_MAX') or 20)
+    
+    # Request/SQL instrumentation with a Prometheus /metrics endpoint (opt-in)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'False').lower() == 'true'
+    METRICS_ENDPOINT = os.environ.get('METRICS_ENDPOINT') or '/metrics'
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     FLASK_ENV = 'development'
+    MAIL_BACKEND = os.environ.get('MAIL_BACKEND') or 'memory'
+    ASSETS_BUILD_ON_STARTUP = os.environ.get('ASSETS_BUILD_ON_STARTUP', 'True').lower() == 'true'
 
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     FLASK_ENV = 'production'
+    MAIL_BACKEND = os.environ.get('MAIL_BACKEND') or 'smtp'
+    
+    # Templates are precompiled at deploy time; don't stat them per render
+    TEMPLATES_AUTO_RELOAD = False
+    
+    # Engine profile: WAL so readers don't block the writer, and a busy
+    # timeout so concurrent writers wait instead of failing
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.SQLALCHEMY_DATABASE_URI)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 15000,
+        'mmap_size': 268435456,
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+    }
 
 class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    PASSWORD_HASH_BACKEND = 'inline'
+    LAST_LOGIN_FLUSH_INTERVAL = 0
+    LOGIN_THROTTLE_ENABLED = False
+    MAIL_BACKEND = 'memory'
 
 # Configuration dictionary
 config = {
@@ -1,7 +1,8 @@
+import os
 from app import create_app
 
 # Create the Flask application instance
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=os.environ.get('FLASK_DEBUG', 'False').lower() == 'true')
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Users table
+
+The schema the site shipped with. Databases created with `init-db` before
+migrations were added already have it; this revision then does nothing,
+so `flask db upgrade` can adopt them as well as build a new database.
+
+Revision ID: 1a6b0e2c9d31
+Revises:
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a6b0e2c9d31'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=200), nullable=False),
+        sa.Column('first_name', sa.String(length=50), nullable=False),
+        sa.Column('last_name', sa.String(length=50), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_users_username', 'users', ['username'], unique=True, if_not_exists=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_users_email', table_name='users', if_exists=True)
+    op.drop_index('ix_users_username', table_name='users', if_exists=True)
+    op.drop_table('users', if_exists=True)
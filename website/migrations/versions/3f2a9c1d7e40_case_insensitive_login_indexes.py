@@ -0,0 +1,53 @@
+"""Unique lower() indexes for case-insensitive username and email lookups
+
+Databases created before the indexes were added to the User model have
+no index on lower(username) or lower(email), so every login scans the
+users table. Databases created since already have both; this revision
+then does nothing.
+
+Revision ID: 3f2a9c1d7e40
+Revises: 1a6b0e2c9d31
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7e40'
+down_revision = '1a6b0e2c9d31'
+branch_labels = None
+depends_on = None
+
+
+def _collisions(connection, column):
+    """Values of column shared, ignoring case, by more than one user."""
+    return connection.execute(sa.text(
+        f'SELECT lower({column}), count(*) FROM users '
+        f'GROUP BY lower({column}) HAVING count(*) > 1 ORDER BY lower({column})'
+    )).all()
+
+
+def upgrade():
+    connection = op.get_bind()
+    problems = []
+    for column in ('username', 'email'):
+        for value, count in _collisions(connection, column):
+            problems.append(f'  {column} {value!r}: {count} users')
+    if problems:
+        raise RuntimeError(
+            'Cannot add unique case-insensitive indexes; these users differ only in case:\n'
+            + '\n'.join(problems)
+            + '\nRename or merge them, then run `flask db upgrade` again.'
+        )
+
+    op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username)')],
+                    unique=True, if_not_exists=True)
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')],
+                    unique=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users', if_exists=True)
+    op.drop_index('ix_users_username_lower', table_name='users', if_exists=True)
@@ -0,0 +1,49 @@
+"""Clubs table and its FTS5 search index
+
+On SQLite this also creates the club_search index and the triggers that
+keep it in step with clubs, then fills it from the existing active clubs.
+Existing tables and triggers are left as they are.
+
+Revision ID: 5d7e2f9a1c04
+Revises: 3f2a9c1d7e40
+Create Date: 2026-10-18 18:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app import club_search
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7e2f9a1c04'
+down_revision = '3f2a9c1d7e40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'clubs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('website', sa.String(length=200), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_clubs_category', 'clubs', ['category'], if_not_exists=True)
+
+    connection = op.get_bind()
+    if connection.dialect.name == 'sqlite':
+        club_search.rebuild(connection)
+
+
+def downgrade():
+    op.execute('DROP TABLE IF EXISTS club_search')
+    op.drop_index('ix_clubs_category', table_name='clubs', if_exists=True)
+    op.drop_table('clubs', if_exists=True)
@@ -0,0 +1,50 @@
+"""Club memberships and the denormalized clubs.member_count
+
+member_count is computed from any memberships that already exist.
+
+Revision ID: 6e8f3a0b2d15
+Revises: 5d7e2f9a1c04
+Create Date: 2026-10-18 18:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e8f3a0b2d15'
+down_revision = '5d7e2f9a1c04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    connection = op.get_bind()
+    columns = {column['name'] for column in sa.inspect(connection).get_columns('clubs')}
+    if 'member_count' not in columns:
+        op.add_column('clubs', sa.Column('member_count', sa.Integer(), server_default='0',
+                                         nullable=False))
+
+    op.create_table(
+        'memberships',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('club_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.Column('joined_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'club_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_memberships_club_id_joined_at', 'memberships', ['club_id', 'joined_at'],
+                    if_not_exists=True)
+
+    op.execute('UPDATE clubs SET member_count = '
+               '(SELECT count(*) FROM memberships WHERE memberships.club_id = clubs.id)')
+
+
+def downgrade():
+    op.drop_index('ix_memberships_club_id_joined_at', table_name='memberships', if_exists=True)
+    op.drop_table('memberships', if_exists=True)
+    with op.batch_alter_table('clubs') as batch_op:
+        batch_op.drop_column('member_count')
@@ -0,0 +1,46 @@
+"""Site statistics summary tables
+
+Creates site_counters and daily_stats and fills them from the users
+table, so the counters the app keeps current start from the right
+totals. Running it again recomputes the same values.
+
+Revision ID: 7f904b1c3e26
+Revises: 6e8f3a0b2d15
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app import stats
+
+
+# revision identifiers, used by Alembic.
+revision = '7f904b1c3e26'
+down_revision = '6e8f3a0b2d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'site_counters',
+        sa.Column('name', sa.String(length=30), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(length=30), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'metric'),
+        if_not_exists=True,
+    )
+    stats.rebuild(op.get_bind())
+
+
+def downgrade():
+    op.drop_table('daily_stats', if_exists=True)
+    op.drop_table('site_counters', if_exists=True)
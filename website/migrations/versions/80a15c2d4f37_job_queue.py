@@ -0,0 +1,41 @@
+"""Background job queue table
+
+Revision ID: 80a15c2d4f37
+Revises: 7f904b1c3e26
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '80a15c2d4f37'
+down_revision = '7f904b1c3e26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('claimed_by', sa.String(length=100), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_jobs_status_run_at', 'jobs', ['status', 'run_at'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_jobs_status_run_at', table_name='jobs', if_exists=True)
+    op.drop_table('jobs', if_exists=True)
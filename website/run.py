@@ -8,10 +8,14 @@ Use this file to start the development server.
 
 import os
 import sys
+import click
 from app import create_app, db
 from app.models import User
 
-# Create the Flask application
+# Create the Flask application; the production server defaults to the
+# production config, everything else to development
+if sys.argv[1:2] == ['serve']:
+    os.environ.setdefault('FLASK_ENV', 'production')
 app = create_app()
 
 def init_db():
@@ -60,7 +64,8 @@ def create_admin_user():
 @app.shell_context_processor
 def make_shell_context():
     """Make database and models available in Flask shell."""
-    return {'db': db, 'User': User}
+    from app.models import Club, Membership, Job
+    return {'db': db, 'User': User, 'Club': Club, 'Membership': Membership, 'Job': Job}
 
 @app.cli.command()
 def init_database():
@@ -76,22 +81,129 @@ def create_admin():
 def list_users():
     """List all users in the database."""
     with app.app_context():
-        users = User.query.all()
-        if users:
-            print(f"\n📋 Found {len(users)} users:")
+        total = db.session.query(db.func.count(User.id)).scalar()
+        if total:
+            print(f"\n📋 Found {total} users:")
             print("-" * 60)
-            for user in users:
+            # Stream rows in batches instead of loading every User object
+            for user in User.iter_directory():
                 status = "✅ Active" if user.is_active else "❌ Inactive"
+                full_name = f"{user.first_name} {user.last_name}"
                 print(f"ID: {user.id:2d} | {user.username:15s} | {user.email:25s} | {status}")
-                print(f"     Name: {user.get_full_name():20s} | Created: {user.created_at.strftime('%Y-%m-%d %H:%M')}")
+                print(f"     Name: {full_name:20s} | Created: {user.created_at.strftime('%Y-%m-%d %H:%M')}")
                 print("-" * 60)
         else:
             print("📭 No users found in the database.")
 
+@app.cli.command()
+@click.argument('roster', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=500, show_default=True, help='Rows per INSERT batch.')
+def import_users(roster, chunk_size):
+    """Import users from a CSV roster (username,email,password,first_name,last_name)."""
+    from app.importer import import_users as run_import
+    
+    def report(result):
+        print(f"   {result.processed} rows | {result.imported} imported | "
+              f"{result.duplicates} duplicates | {result.invalid} invalid | "
+              f"{result.rows_per_second:.0f} rows/sec")
+    
+    with app.app_context():
+        print(f"📥 Importing users from {roster}...")
+        result = run_import(roster, chunk_size=chunk_size, progress=report)
+        for line, errors in result.errors[:20]:
+            problems = ' '.join(f"{field}: {', '.join(messages)}" for field, messages in errors.items())
+            print(f"   ⚠️  Line {line}: {problems}")
+        if len(result.errors) > 20:
+            print(f"   ... and {len(result.errors) - 20} more invalid rows")
+        print(f"✅ Imported {result.imported} users in {result.elapsed:.1f}s")
+
+@app.cli.command()
+def rebuild_club_search():
+    """Create the club search index if missing and refill it from the clubs table."""
+    from app import club_search
+    from app.models import Club
+    Club.__table__.create(db.engine, checkfirst=True)
+    with db.engine.begin() as connection:
+        club_search.rebuild(connection)
+    print(f"✅ Indexed {Club.query.count()} clubs")
+
+@app.cli.command()
+def recount_members():
+    """Recompute every club's member count, e.g. after bulk SQL on memberships."""
+    from app.models import Club
+    Club.recount_members()
+    print(f"✅ Recounted members of {Club.query.count()} clubs")
+
+@app.cli.command()
+def rebuild_stats():
+    """Recompute the site statistics summary tables from the users table."""
+    from app import stats
+    with db.engine.begin() as connection:
+        stats.rebuild(connection)
+    summary = stats.snapshot()
+    print(f"✅ {summary['users']} users, {summary['active_users']} active, "
+          f"{summary['signups']} signups and {summary['logins']} logins in the last 7 days")
+
+@app.cli.command()
+@click.option('--concurrency', default=1, show_default=True, help='Worker threads in this process.')
+@click.option('--batch-size', type=int, help='Jobs claimed per query (default: JOBS_BATCH_SIZE).')
+@click.option('--burst', is_flag=True, help='Exit once no jobs are due instead of polling.')
+def worker(concurrency, batch_size, burst):
+    """Run background jobs (welcome emails, ...) from the jobs table."""
+    from app.jobs import run_workers
+    print(f"👷 {concurrency} worker(s) waiting for jobs{' (burst)' if burst else ''}")
+    workers = run_workers(app, concurrency, batch_size=batch_size, burst=burst)
+    print(f"✅ {sum(w.processed for w in workers)} jobs done, {sum(w.failed for w in workers)} failed")
+
+@app.cli.command()
+def build_assets():
+    """Fingerprint and precompress static files for /assets."""
+    from app.assets import build_assets as build
+    manifest = build(app.static_folder, app.config['ASSETS_BUILD_DIR'])
+    print(f"✅ Built {len(manifest)} assets into {app.config['ASSETS_BUILD_DIR']}")
+
+@app.cli.command()
+def precompile_templates():
+    """Compile all templates into the bytecode cache."""
+    from app.templating import precompile_templates as precompile
+    timings = precompile(app)
+    for name, seconds in timings:
+        print(f"   {name:25s} {seconds * 1000:7.2f} ms")
+    print(f"✅ Compiled {len(timings)} templates into {app.config['TEMPLATE_CACHE_DIR']}")
+
+@app.cli.command(with_appcontext=False)
+@click.option('--bind', default=lambda: f"{os.environ.get('HOST', '127.0.0.1')}:{os.environ.get('PORT', 8000)}",
+              show_default='HOST:PORT or 127.0.0.1:8000', help='Address to listen on.')
+@click.option('--workers', type=int, envvar='WEB_CONCURRENCY',
+              help='Worker processes (default: 2 x cores + 1, or $WEB_CONCURRENCY).')
+@click.option('--threads', default=1, show_default=True, help='Threads per worker.')
+@click.option('--max-requests', default=1000, show_default=True,
+              help='Recycle a worker after this many requests (0 disables).')
+@click.option('--timeout', default=30, show_default=True, help='Seconds before a silent worker is restarted.')
+def serve(bind, workers, threads, max_requests, timeout):
+    """Run the app under a pre-forking production server (gunicorn)."""
+    from app.server import serve as run_server, default_workers
+    if app.debug:
+        raise click.ClickException('serve needs a non-debug config; set FLASK_ENV=production')
+    workers = workers or default_workers()
+    print("🚀 Starting Flask Authentication App (production server)...")
+    print(f"   Environment: {app.config.get('FLASK_ENV', 'development')}")
+    print(f"   Listening: http://{bind}")
+    print(f"   Workers: {workers} x {threads} threads")
+    print("-" * 50)
+    try:
+        run_server(app, bind=bind, workers=workers, threads=threads,
+                   max_requests=max_requests, max_requests_jitter=max_requests // 10,
+                   timeout=timeout)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
 if __name__ == '__main__':
     # Handle command line arguments
     if len(sys.argv) > 1:
-        if sys.argv[1] == 'init-db':
+        if sys.argv[1] == 'serve':
+            serve.main(sys.argv[2:], prog_name='run.py serve')
+        elif sys.argv[1] == 'init-db':
             init_db()
             sys.exit(0)
         elif sys.argv[1] == 'create-admin':
@@ -99,22 +211,22 @@ if __name__ == '__main__':
             sys.exit(0)
         elif sys.argv[1] == 'list-users':
             with app.app_context():
-                users = User.query.all()
-                if users:
-                    print(f"\nFound {len(users)} users:")
-                    for user in users:
-                        print(f"- {user.username} ({user.email}) - {user.get_full_name()}")
+                total = db.session.query(db.func.count(User.id)).scalar()
+                if total:
+                    print(f"\nFound {total} users:")
+                    for user in User.iter_directory():
+                        print(f"- {user.username} ({user.email}) - {user.first_name} {user.last_name}")
                 else:
                     print("No users found.")
             sys.exit(0)
     
     # Get configuration from environment variables
-    debug_mode = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
+    debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '127.0.0.1')
     
     print("🚀 Starting Flask Authentication App...")
-    print(f"   Environment: {os.environ.get('FLASK_ENV', 'development')}")
+    print(f"   Environment: {app.config.get('FLASK_ENV', 'development')}")
     print(f"   Debug Mode: {debug_mode}")
     print(f"   Host: {host}")
     print(f"   Port: {port}")
@@ -125,7 +237,7 @@ if __name__ == '__main__':
     print("\n🛑 Press Ctrl+C to stop the server")
     print("-" * 50)
     
-    # Run the Flask development server
+    # Run the Flask development server (use `python run.py serve` in production)
     app.run(
         host=host,
         port=port,
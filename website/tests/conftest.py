@@ -0,0 +1,59 @@
+"""Shared fixtures: a testing app on a temporary SQLite file."""
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from config.config import config, TestingConfig
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Return a factory of testing apps sharing one empty SQLite file."""
+    apps = []
+    
+    def make(**overrides):
+        settings = {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "test.db"}'}
+        settings.update(overrides)
+        config['pytest'] = type('PytestConfig', (TestingConfig,), settings)
+        app = create_app('pytest')
+        apps.append(app)
+        return app
+    
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def empty_app(make_app):
+    """A testing app whose database has no tables yet."""
+    app = make_app()
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def app(empty_app):
+    db.create_all()
+    return empty_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def queries(app):
+    """A list that receives every SQL statement run on the app's engine."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
@@ -0,0 +1,34 @@
+"""The availability filters track users added in and out of process."""
+
+from app import availability_index, db
+from app.models import User
+
+
+def state(app):
+    return app.extensions['availability_index']
+
+
+def test_create_user_advances_max_id(app):
+    availability_index.check(username='warm')
+    user = User.create_user('ann', 'ann@example.com', 'password123', 'Ann', 'User')
+    assert state(app).max_id == user.id
+    entries = availability_index.stats()['entries']
+    state(app).last_sync = 0
+    assert availability_index.check(username='ann') == {'username': False}
+    # The sync didn't add ann a second time
+    assert availability_index.stats()['entries'] == entries
+
+
+def test_gap_from_another_process_is_still_loaded(app):
+    availability_index.check(username='warm')
+    # A row another process inserted, which this one hasn't synced yet
+    db.session.execute(User.__table__.insert().values(
+        username='bob', email='bob@example.com', password_hash='x', first_name='Bob',
+        last_name='User', is_active=True))
+    db.session.commit()
+    user = User.create_user('ann', 'ann@example.com', 'password123', 'Ann', 'User')
+    assert state(app).max_id < user.id
+    state(app).last_sync = 0
+    assert availability_index.check(username='bob') == {'username': False}
+    assert state(app).max_id == user.id
+    assert availability_index.stats()['entries'] == 2
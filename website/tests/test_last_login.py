@@ -0,0 +1,41 @@
+"""Buffered last login times survive a failed write."""
+
+from datetime import datetime
+
+import pytest
+
+from app import db, last_login_recorder, stats
+from app.models import DailyStat, User
+
+
+@pytest.fixture
+def buffered(app):
+    app.config['LAST_LOGIN_FLUSH_INTERVAL'] = 3600
+    user = User.create_user('ann', 'ann@example.com', 'password123', 'Ann', 'User')
+    return user.id
+
+
+def test_failed_flush_keeps_the_batch_for_the_next_one(app, buffered, monkeypatch):
+    first, second, third = (datetime(2026, 10, 18, hour) for hour in (9, 10, 11))
+    last_login_recorder.record(buffered, first)
+    last_login_recorder.record(buffered, second)
+
+    def fail(*args, **kwargs):
+        # A login buffered mid-write with an earlier timestamp than the failed batch's
+        last_login_recorder.record(buffered, first)
+        raise RuntimeError('database is locked')
+    monkeypatch.setattr(stats, 'count_daily', fail)
+    with pytest.raises(RuntimeError):
+        last_login_recorder.flush()
+    monkeypatch.undo()
+
+    assert last_login_recorder.flush() == 1
+    db.session.expire_all()
+    assert db.session.get(User, buffered).last_login == second
+    logins = db.session.get(DailyStat, (second.date(), stats.LOGINS))
+    assert logins.value == 3
+
+    last_login_recorder.record(buffered, third)
+    assert last_login_recorder.flush() == 1
+    db.session.expire_all()
+    assert db.session.get(User, buffered).last_login == third
@@ -0,0 +1,35 @@
+"""Login and availability lookups must stay at one query each."""
+
+import pytest
+
+from app import db
+from app.models import User
+
+
+@pytest.fixture
+def users(app):
+    password_hash = User('seed', 'seed@example.com', 'password123', 'Seed', 'User').password_hash
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': password_hash,
+         'first_name': 'Test', 'last_name': f'User{i}', 'is_active': True}
+        for i in range(50)
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize('identifier, username', [
+    ('USER42', 'user42'),
+    ('User42 ', 'user42'),
+    ('user42@example.com', 'user42'),
+    ('USER42@Example.com', 'user42'),
+    ('nobody', None),
+])
+def test_find_login_candidate_is_one_query(users, queries, identifier, username):
+    user = User.find_login_candidate(identifier)
+    assert len(queries) == 1
+    assert (user.username if user else None) == username
+
+
+def test_check_availability_is_one_query(users, queries):
+    assert User.check_availability('USER42', 'new@example.com') == {'username': False, 'email': True}
+    assert len(queries) == 1
@@ -0,0 +1,39 @@
+"""Dashboard and profile queries must not grow with the clubs a user joins."""
+
+import pytest
+
+from app import db
+from app.models import Club, Membership, User
+
+SIZES = (1, 3, 10)
+
+
+@pytest.fixture
+def members(app):
+    clubs = [Club(name=f'Club {n}', category='Academic') for n in range(max(SIZES))]
+    db.session.add_all(clubs)
+    for size in SIZES:
+        user = User.create_user(f'member{size}', f'member{size}@example.com', 'password123',
+                                'Test', 'Member')
+        db.session.add_all(Membership(user_id=user.id, club_id=club.id) for club in clubs[:size])
+    db.session.commit()
+
+
+def page_queries(app, queries, username, path):
+    client = app.test_client()
+    client.post('/login', data={'username_or_email': username, 'password': 'password123'})
+    client.get(path)  # warm the user cache so only the page's own queries remain
+    queries.clear()
+    response = client.get(path)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize('path', ['/dashboard', '/profile'])
+def test_page_query_count_is_independent_of_memberships(app, members, queries, path):
+    counts = {size: page_queries(app, queries, f'member{size}', path) for size in SIZES}
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_member_counts_follow_memberships(app, members):
+    assert [club.member_count for club in Club.query.order_by(Club.id)] == [3, 2, 2, 1, 1, 1, 1, 1, 1, 1]
@@ -0,0 +1,52 @@
+"""`flask db upgrade` must build the same schema as the models."""
+
+from pathlib import Path
+
+import flask_migrate
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+
+from app import db
+
+MIGRATIONS = str(Path(__file__).resolve().parent.parent / 'migrations')
+
+# SQLite can't reflect the lower() indexes, so sqlite_objects() checks them by name
+pytestmark = pytest.mark.filterwarnings('ignore:.*expression-based index')
+
+
+def schema_differences():
+    # The FTS5 index and its shadow tables aren't in the models
+    def include_name(name, type_, parent_names):
+        return not (type_ == 'table' and name.startswith('club_search'))
+    with db.engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={'include_name': include_name})
+        return compare_metadata(context, db.metadata)
+
+
+def sqlite_objects():
+    rows = db.session.execute(db.text(
+        "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL"
+    ))
+    return {name for name, in rows}
+
+
+def test_upgrade_from_empty_matches_models(empty_app):
+    flask_migrate.upgrade(directory=MIGRATIONS)
+    assert schema_differences() == []
+    migrated = sqlite_objects()
+    db.drop_all()
+    db.create_all()
+    assert migrated == sqlite_objects()
+    assert {'ix_users_username_lower', 'clubs_search_update'} <= migrated
+
+
+def test_upgrade_adopts_a_create_all_database(app):
+    flask_migrate.upgrade(directory=MIGRATIONS)
+    assert schema_differences() == []
+
+
+def test_downgrade_to_base_removes_everything(empty_app):
+    flask_migrate.upgrade(directory=MIGRATIONS)
+    flask_migrate.downgrade(directory=MIGRATIONS, revision='base')
+    assert db.inspect(db.engine).get_table_names() == ['alembic_version']
@@ -0,0 +1,33 @@
+"""Registration stores the user and the welcome email job together."""
+
+from app import db
+from app.models import Job, User
+
+FORM = {
+    'username': 'newuser',
+    'email': 'new@example.com',
+    'first_name': 'New',
+    'last_name': 'User',
+    'password': 'password123',
+    'password_confirm': 'password123',
+}
+
+
+def test_register_commits_user_and_welcome_job(client):
+    response = client.post('/register', data=FORM)
+    assert response.status_code == 302
+    user = User.get_by_username('newuser')
+    job = db.session.scalars(db.select(Job)).one()
+    assert job.task == 'send_welcome_email'
+    assert f'"user_id":{user.id}' in job.payload
+
+
+def test_register_keeps_no_user_when_enqueue_fails(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('queue unavailable')
+    monkeypatch.setattr('app.routes.job_queue.enqueue', fail)
+    response = client.post('/register', data=FORM)
+    assert response.status_code == 200
+    assert b'Registration failed' in response.data
+    assert User.get_by_username('newuser') is None
+    assert db.session.scalar(db.select(db.func.count()).select_from(Job)) == 0
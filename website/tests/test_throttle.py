@@ -0,0 +1,55 @@
+"""Login throttling: shared buckets and client addresses behind a proxy."""
+
+import pytest
+
+from app import db
+from app.throttle import LocalBucketStore, SQLiteBucketStore
+
+
+@pytest.fixture(params=['local', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'local':
+        return LocalBucketStore()
+    return SQLiteBucketStore(str(tmp_path / 'throttle.sqlite3'))
+
+
+def test_bucket_allows_burst_then_refills(store):
+    assert [store.consume('ip:a', 3, 1.0, now=100.0) for _ in range(3)] == [0, 0, 0]
+    assert store.consume('ip:a', 3, 1.0, now=100.0) == pytest.approx(1.0)
+    assert store.consume('ip:b', 3, 1.0, now=100.0) == 0
+    assert store.consume('ip:a', 3, 1.0, now=101.5) == 0
+
+
+def test_sqlite_buckets_are_shared_between_stores(tmp_path):
+    path = str(tmp_path / 'throttle.sqlite3')
+    first, second = SQLiteBucketStore(path), SQLiteBucketStore(path)
+    assert first.consume('ip:a', 2, 1.0, now=100.0) == 0
+    assert second.consume('ip:a', 2, 1.0, now=100.0) == 0
+    assert first.consume('ip:a', 2, 1.0, now=100.0) > 0
+
+
+THROTTLED = {'LOGIN_THROTTLE_ENABLED': True, 'LOGIN_THROTTLE_IP_BURST': 2}
+
+
+def attempts(app, forwarded_for):
+    client = app.test_client()
+    return [client.post('/login', data={'username_or_email': 'nobody', 'password': 'wrong-guess'},
+                        headers={'X-Forwarded-For': forwarded_for}).status_code
+            for _ in range(3)]
+
+
+def test_forwarded_for_is_ignored_by_default(make_app):
+    app = make_app(**THROTTLED)
+    with app.app_context():
+        db.create_all()
+    assert attempts(app, '203.0.113.1')[-1] == 429
+    # Every client shares the socket address's bucket
+    assert attempts(app, '203.0.113.2')[0] == 429
+
+
+def test_proxy_fix_gives_each_forwarded_client_a_bucket(make_app):
+    app = make_app(PROXY_FIX_X_FOR=1, **THROTTLED)
+    with app.app_context():
+        db.create_all()
+    assert attempts(app, '203.0.113.1')[-1] == 429
+    assert attempts(app, '203.0.113.2')[0] != 429
@@ -0,0 +1,41 @@
+"""Cached user snapshots are dropped when a change commits, not before."""
+
+import pytest
+
+from app import db, user_cache
+from app.models import User
+
+
+@pytest.fixture
+def cached(app):
+    user = User.create_user('ann', 'ann@example.com', 'password123', 'Ann', 'User')
+    user_cache.load(user.id)
+    return user
+
+
+def is_cached(app, user_id):
+    return user_id in app.extensions['user_cache'].entries
+
+
+def test_flush_keeps_the_snapshot_until_commit(app, cached):
+    cached.first_name = 'Anne'
+    db.session.flush()
+    assert is_cached(app, cached.id)
+    db.session.commit()
+    assert not is_cached(app, cached.id)
+
+
+def test_rollback_keeps_the_snapshot(app, cached):
+    cached.first_name = 'Anne'
+    db.session.flush()
+    db.session.rollback()
+    assert is_cached(app, cached.id)
+    # Nothing left over to drop at the next, unrelated commit
+    db.session.commit()
+    assert is_cached(app, cached.id)
+
+
+def test_delete_drops_the_snapshot_on_commit(app, cached):
+    db.session.delete(cached)
+    db.session.commit()
+    assert not is_cached(app, cached.id)
@@ -0,0 +1,29 @@
+"""The /users Next link carries the clamped page size."""
+
+import re
+
+import pytest
+
+from app import db
+from app.models import User
+
+
+@pytest.fixture
+def client(app):
+    app.config.update(USERS_PER_PAGE=2, USERS_MAX_PER_PAGE=3)
+    password_hash = User('seed', 'seed@example.com', 'password123', 'Seed', 'User').password_hash
+    db.session.execute(User.__table__.insert(), [
+        {'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': password_hash,
+         'first_name': 'Test', 'last_name': f'User{i}', 'is_active': True}
+        for i in range(10)
+    ])
+    db.session.commit()
+    client = app.test_client()
+    client.post('/login', data={'username_or_email': 'user0', 'password': 'password123'})
+    return client
+
+
+@pytest.mark.parametrize('per_page, expected', [('1000', 3), ('0', 1), ('-5', 1), ('2', 2)])
+def test_next_link_uses_the_clamped_page_size(client, per_page, expected):
+    html = client.get(f'/users?per_page={per_page}').get_data(as_text=True)
+    assert re.search(r'/users\?after=\d+&amp;per_page=(-?\d+)', html).group(1) == str(expected)